@@ -1,14 +1,43 @@
+import argparse
 import logging
+import time
 
-import arcade
 
-from .game import NonameDungeonCrawler
-from .settings import config
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='python -m noname_dungeon_crawler')
+    parser.add_argument(
+        '--profile-startup',
+        action='store_true',
+        help="print how long each startup phase took once the first frame is drawn",
+    )
 
+    return parser.parse_args()
 
-logging.basicConfig(**config.constants.LOGGING_CONFIG)  # type: ignore
 
-game = NonameDungeonCrawler()
-game.setup()
+def main() -> None:
+    start = time.perf_counter()
+    args = _parse_args()
 
-arcade.run()
+    # Imported here so that the profile covers loading arcade and pyglet
+    import arcade
+
+    from .game import NonameDungeonCrawler
+    from .settings import config
+    from .util import StartupProfile
+
+    logging.basicConfig(**config.constants.LOGGING_CONFIG)  # type: ignore
+
+    startup_profile = StartupProfile(start) if args.profile_startup else None
+    if startup_profile is not None:
+        startup_profile.mark('imports')
+
+    game = NonameDungeonCrawler(startup_profile=startup_profile)
+    if startup_profile is not None:
+        startup_profile.mark('window')
+
+    game.setup()
+
+    arcade.run()
+
+
+main()
@@ -1,4 +1,5 @@
+from .audio import AudioService, audio_service
 from .repository import asset_repository
 
 
-__all__ = ['asset_repository']
+__all__ = ['AudioService', 'asset_repository', 'audio_service']
@@ -0,0 +1,85 @@
+import logging
+import typing
+
+from noname_dungeon_crawler.settings import config
+
+from .repository import asset_repository
+
+
+if typing.TYPE_CHECKING:
+    import pyglet.media
+
+
+log = logging.getLogger(__name__)
+
+
+class AudioService:
+    """
+    Общий проигрыватель музыки для всех сцен. Треки не декодируются при загрузке ассетов: файл открывается
+    потоковым источником при первом запуске трека и читается с диска по мере проигрывания
+    """
+    _player: typing.Optional['pyglet.media.Player']
+    _sources: typing.Dict[str, 'pyglet.media.Source']  # tracks opened so far, kept for the next time they are played
+    _playlist: typing.Tuple[str, ...]
+
+    def __init__(self) -> None:
+        self._player = None
+        self._sources = {}
+        self._playlist = ()
+
+    @property
+    def playlist(self) -> typing.Tuple[str, ...]:
+        return self._playlist
+
+    def play_music(self, tracks: typing.Sequence[str]) -> None:
+        """
+        Проигрывание треков сцены по кругу; если они уже стоят в проигрывателе, музыка продолжается с места паузы
+        """
+        if config.headless:  # No audio device to play on
+            return
+
+        player = self._get_player()
+
+        if tuple(tracks) != self._playlist:
+            # Dequeued streaming sources are rewound and may be queued again later
+            while player.source is not None:
+                player.next_source()
+
+            self._playlist = tuple(tracks)
+            player.queue([self._get_source(track) for track in tracks])
+
+        player.play()
+
+    def pause_music(self) -> None:
+        if self._player is not None:
+            self._player.pause()
+
+    def shutdown(self) -> None:
+        if self._player is not None:
+            self._player.delete()
+
+        self._player = None
+        self._sources.clear()
+        self._playlist = ()
+
+    def _get_player(self) -> 'pyglet.media.Player':
+        import pyglet.media  # Imported when needed, pyglet has to be set up by arcade first
+
+        if self._player is None:
+            self._player = pyglet.media.Player()
+            self._player.loop = True
+            self._player.volume = config.music_volume
+
+        return self._player
+
+    def _get_source(self, track: str) -> 'pyglet.media.Source':
+        import pyglet.media
+
+        if track not in self._sources:
+            log.info(f"Opening music track {track}")
+            self._sources[track] = pyglet.media.load(str(asset_repository.get_music(track)), streaming=True)
+
+        return self._sources[track]
+
+
+audio_service = AudioService()
@@ -1,6 +1,16 @@
 from .entity_loader import EntityLoader
+from .parallel_loader import AssetLoadReport, AssetPriority, AssetTiming, ParallelAssetLoader
 from .sound_loader import SoundLoader
-from .texture_loader import TextureLoader
+from .texture_loader import PackedTextures, TextureLoader
 
 
-__all__ = ['EntityLoader', 'SoundLoader', 'TextureLoader']
+__all__ = [
+    'AssetLoadReport',
+    'AssetPriority',
+    'AssetTiming',
+    'EntityLoader',
+    'PackedTextures',
+    'ParallelAssetLoader',
+    'SoundLoader',
+    'TextureLoader',
+]
@@ -13,17 +13,17 @@ class EntityLoader:
     def __init__(self) -> None:
         self.entity_configs = [conf for conf in config.constants.ENTITY_DIR.iterdir() if conf.is_file()]
 
-    def load_entities(self) -> typing.Dict[str, Entity]:
+    def read_config(self, entity_config: pathlib.Path) -> dict:
+        with open(entity_config, 'r') as conf_file:
+            return json.load(conf_file)
+
+    def create_entity(self, conf: dict) -> typing.Tuple[str, Entity]:
+        """
+        Образец сущности по конфигу, текстуры к этому моменту должны быть загружены
+        """
         entity_module = import_module('noname_dungeon_crawler.sprites.entities')
 
-        entities: typing.Dict[str, Entity] = {}
+        entity_class: typing.Type[Entity] = getattr(entity_module, conf['class'])
+        entity_name, entity_args = entity_class.args_from_config(conf)
 
-        for entity_config in self.entity_configs:
-            with open(entity_config, 'r') as conf_file:
-                conf = json.load(conf_file)
-
-            entity_class: typing.Type[Entity] = getattr(entity_module, conf['class'])
-            entity_name, entity_args = entity_class.args_from_config(conf)
-            entities[entity_name] = entity_class(**entity_args)
-
-        return entities
+        return entity_name, entity_class(**entity_args)
@@ -0,0 +1,152 @@
+import concurrent.futures
+import enum
+import logging
+import threading
+import time
+import typing
+
+import attr
+
+
+log = logging.getLogger(__name__)
+
+
+class AssetPriority(enum.IntEnum):
+    MAIN_MENU = 0  # needed before the first frame
+    GAMEPLAY = 1
+
+
+@attr.s(kw_only=True, auto_attribs=True)
+class AssetTiming:
+    name: str
+    priority: AssetPriority
+    thread: str
+    start_time: float  # seconds since loading started
+    load_time: float  # seconds
+
+
+@attr.s(kw_only=True, auto_attribs=True)
+class AssetLoadReport:
+    timings: typing.List[AssetTiming] = attr.Factory(list)
+    ready_times: typing.Dict[AssetPriority, float] = attr.Factory(dict)  # seconds until every asset of it was loaded
+    total_time: float = 0.0
+
+    def log(self) -> None:
+        for timing in sorted(self.timings, key=lambda timing: timing.start_time):
+            log.info(
+                f"{timing.name:<40} {timing.priority.name:<9} {timing.thread:<16} "
+                f"start {timing.start_time * 1000:7.1f} ms, took {timing.load_time * 1000:7.1f} ms"
+            )
+
+        for priority, ready_time in sorted(self.ready_times.items()):
+            log.info(f"{priority.name} assets ready after {ready_time * 1000:.1f} ms")
+
+        log.info(f"All assets loaded in {self.total_time * 1000:.1f} ms")
+
+
+@attr.s(kw_only=True, auto_attribs=True)
+class _AssetTask:
+    name: str
+    priority: AssetPriority
+    load: typing.Callable[..., typing.Any]
+    after: typing.Tuple[str, ...]  # tasks whose results are passed to load, in this order
+    main_thread: bool
+
+
+class ParallelAssetLoader:
+    """
+    Загрузка ассетов на пуле потоков: независимые задачи (декодирование изображений и звуков, чтение конфигов)
+    идут в пул в порядке приоритета, а зависимые шаги и всё, что трогает GL, выполняются в главном потоке,
+    как только готовы их зависимости. Для каждой задачи записывается, когда она началась и сколько шла
+    """
+    max_workers: int
+
+    _tasks: typing.Dict[str, _AssetTask]
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._tasks = {}
+
+    def add(
+        self,
+        name: str,
+        priority: AssetPriority,
+        load: typing.Callable[..., typing.Any],
+        after: typing.Sequence[str] = (),
+        main_thread: bool = False,
+    ) -> None:
+        if name in self._tasks:
+            raise ValueError(f"Asset task {name} is added twice")
+        if after and not main_thread:
+            raise ValueError(f"Asset task {name} has dependencies, so it has to run on the main thread")
+
+        self._tasks[name] = _AssetTask(
+            name=name, priority=priority, load=load, after=tuple(after), main_thread=main_thread
+        )
+
+    def run(self) -> typing.Tuple[typing.Dict[str, typing.Any], AssetLoadReport]:
+        """
+        Выполнение всех задач, возвращает их результаты по именам и отчёт
+        """
+        for task in self._tasks.values():
+            missing = [name for name in task.after if name not in self._tasks]
+            if missing:
+                raise ValueError(f"Asset task {task.name} depends on unknown tasks: {missing}")
+
+        report = AssetLoadReport()
+        report_lock = threading.Lock()
+        start = time.perf_counter()
+
+        def timed(task: _AssetTask, *args: typing.Any) -> typing.Any:
+            task_start = time.perf_counter()
+            result = task.load(*args)
+            task_end = time.perf_counter()
+
+            with report_lock:
+                report.timings.append(
+                    AssetTiming(
+                        name=task.name,
+                        priority=task.priority,
+                        thread=threading.current_thread().name,
+                        start_time=task_start - start,
+                        load_time=task_end - task_start,
+                    )
+                )
+                report.ready_times[task.priority] = max(report.ready_times.get(task.priority, 0.0), task_end - start)
+
+            return result
+
+        tasks = sorted(self._tasks.values(), key=lambda task: task.priority)  # Stable, so ties keep their order
+
+        futures: typing.Dict[str, concurrent.futures.Future] = {}
+        with concurrent.futures.ThreadPoolExecutor(self.max_workers, thread_name_prefix='asset-loader') as executor:
+            # The pool takes tasks in submission order, so higher priority decoding starts first
+            for task in tasks:
+                if not task.main_thread:
+                    futures[task.name] = executor.submit(timed, task)
+
+            results: typing.Dict[str, typing.Any] = {}
+            for task in tasks:
+                if task.main_thread:
+                    args = [self._get_result(dependency, futures, results) for dependency in task.after]
+                    results[task.name] = timed(task, *args)
+
+            for name, future in futures.items():
+                results[name] = future.result()
+
+        report.total_time = time.perf_counter() - start
+        return results, report
+
+    def _get_result(
+        self,
+        name: str,
+        futures: typing.Dict[str, concurrent.futures.Future],
+        results: typing.Dict[str, typing.Any],
+    ) -> typing.Any:
+        if name in results:
+            return results[name]
+
+        if name not in futures:  # A main thread task that has not run yet
+            raise ValueError(f"Asset task {name} has to be added before the tasks that depend on it")
+
+        return futures[name].result()
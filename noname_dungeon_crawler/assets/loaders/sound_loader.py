@@ -1,5 +1,9 @@
+import os
 import pathlib
+import tempfile
+import threading
 import typing
+import wave
 
 import arcade
 
@@ -10,16 +14,52 @@ class SoundLoader:
     effects_path: pathlib.Path
     music_path: pathlib.Path
 
+    _stand_in: typing.Optional[arcade.Sound]
+    _stand_in_lock: threading.Lock  # effects may be loaded from several threads
+
     def __init__(self) -> None:
         self.effects_path = config.constants.SOUND_DIR / 'effects'
         self.music_path = config.constants.SOUND_DIR / 'music'
 
-    def load_effects(self) -> typing.Dict[str, arcade.Sound]:
-        return self._load_sounds(self.effects_path, streaming=False)
+        self._stand_in = None
+        self._stand_in_lock = threading.Lock()
+
+    def find_effects(self) -> typing.List[pathlib.Path]:
+        return [effect_file for effect_file in self.effects_path.iterdir() if effect_file.is_file()]
+
+    def load_effect(self, effect_file: pathlib.Path) -> arcade.Sound:
+        """
+        Звуковой эффект, полностью декодированный в память: они короткие и играются часто
+        """
+        if config.headless:  # Decoders and audio devices may be missing, every sound is replaced with silence
+            return self._get_stand_in()
+
+        return arcade.load_sound(effect_file, streaming=False)  # type: ignore
+
+    def find_music(self) -> typing.Dict[str, pathlib.Path]:
+        """
+        Только пути к трекам: музыка не декодируется заранее, её потоково проигрывает AudioService
+        """
+        return {music_file.stem: music_file for music_file in self.music_path.iterdir() if music_file.is_file()}
+
+    def _get_stand_in(self) -> arcade.Sound:
+        """
+        Короткий беззвучный WAV, которым заменяются все звуки при запуске без окна
+        (беззвучный аудиодрайвер выбирают точки входа без окна)
+        """
+        with self._stand_in_lock:
+            if self._stand_in is None:
+                with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as stand_in_file:
+                    with wave.open(stand_in_file, 'wb') as stand_in_wave:
+                        stand_in_wave.setnchannels(1)
+                        stand_in_wave.setsampwidth(2)
+                        stand_in_wave.setframerate(22050)
+                        stand_in_wave.writeframes(bytes(2 * 2205))
 
-    def load_music(self) -> typing.Dict[str, arcade.Sound]:
-        return self._load_sounds(self.music_path, streaming=False)
+                try:
+                    # Not streamed, so the file is fully decoded and no longer needed
+                    self._stand_in = arcade.load_sound(stand_in_file.name, streaming=False)
+                finally:
+                    os.unlink(stand_in_file.name)
 
-    def _load_sounds(self, path: pathlib.Path, streaming: bool) -> typing.Dict[str, arcade.Sound]:
-        sound_files = [f for f in path.iterdir() if f.is_file()]
-        return {sound_file.stem: arcade.load_sound(sound_file, streaming=streaming) for sound_file in sound_files}  # type: ignore
+        return self._stand_in  # type: ignore
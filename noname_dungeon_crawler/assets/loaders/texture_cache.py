@@ -0,0 +1,180 @@
+import hashlib
+import json
+import logging
+import pathlib
+import typing
+
+import arcade
+import attr
+from arcade.texture_atlas import Allocator
+from PIL import Image
+
+
+log = logging.getLogger(__name__)
+
+
+TEXTURE_CACHE_VERSION = 2
+
+Region = typing.Tuple[int, int, int, int]  # x, y, width, height in the packed image, without the border
+
+_BORDER = 1  # same as arcade.TextureAtlas, every texture is padded with a copy of its edge pixels
+
+
+@attr.s(kw_only=True, auto_attribs=True)
+class TexturePack:
+    """
+    Все текстуры игры, упакованные в одно изображение так же, как их разложил бы arcade.TextureAtlas:
+    атлас заполняется одной записью изображения, а текстуры вырезаются из него по индексу областей
+    """
+    image: Image.Image
+    regions: typing.Dict[str, Region]  # texture name -> region, in allocation order
+    static: typing.List[str]
+    animated: typing.Dict[str, typing.List[str]]  # animation name -> frame texture names
+
+    @classmethod
+    def pack(
+        cls,
+        static: typing.Dict[str, arcade.Texture],
+        animated: typing.Dict[str, typing.List[arcade.Texture]],
+    ) -> 'TexturePack':
+        textures = {texture.name: texture for texture in static.values()}
+        textures.update((texture.name, texture) for frames in animated.values() for texture in frames)
+
+        # Same order and allocator as TextureAtlas.create_from_texture_sequence, so the atlas places them alike
+        ordered = sorted(textures.values(), key=lambda texture: texture.image.size[1])
+        size = arcade.TextureAtlas.calculate_minimum_size(ordered, border=_BORDER)
+
+        allocator = Allocator(*size)
+        image = Image.new('RGBA', size)
+        regions: typing.Dict[str, Region] = {}
+
+        for texture in ordered:
+            width, height = texture.image.size
+            x, y = allocator.alloc(width + _BORDER * 2, height + _BORDER * 2)
+            image.paste(_pad(texture.image), (x, y))
+            regions[texture.name] = (x + _BORDER, y + _BORDER, width, height)
+
+        return cls(
+            image=image,
+            regions=regions,
+            static=[texture.name for texture in static.values()],
+            animated={name: [texture.name for texture in frames] for name, frames in animated.items()},
+        )
+
+    def get_textures(self) -> typing.Dict[str, arcade.Texture]:
+        return {
+            name: arcade.Texture(name=name, image=self.image.crop((x, y, x + width, y + height)))
+            for name, (x, y, width, height) in self.regions.items()
+        }
+
+    def create_atlas(self, textures: typing.Dict[str, arcade.Texture]) -> arcade.TextureAtlas:
+        """
+        Атлас с текстурами пакета: области и текстурные координаты регистрируются без записи,
+        пиксели загружаются на видеокарту одним изображением
+        """
+        atlas = arcade.TextureAtlas(self.image.size)
+
+        for name, (x, y, _, _) in self.regions.items():
+            allocated_x, allocated_y, _, _ = atlas.allocate(textures[name])
+            if (allocated_x + _BORDER, allocated_y + _BORDER) != (x, y):
+                # Another arcade version packs differently, the textures are written one by one then
+                log.warning("Texture atlas layout differs from the texture pack, writing textures separately")
+                atlas.clear()
+                for texture in textures.values():
+                    atlas.add(texture)
+                return atlas
+
+        atlas.texture.write(self.image.tobytes())
+        return atlas
+
+
+class TextureCache:
+    """
+    Дисковый кэш упакованных текстур: изображение пакета и индекс областей, ключ - хеш содержимого исходников.
+    Хранится одна версия, при смене исходников старые файлы удаляются
+    """
+    directory: pathlib.Path
+
+    def __init__(self, directory: pathlib.Path) -> None:
+        self.directory = directory
+
+    @staticmethod
+    def content_key(sources: typing.Iterable[pathlib.Path]) -> str:
+        digest = hashlib.sha256(str(TEXTURE_CACHE_VERSION).encode())
+
+        for source in sorted(sources):
+            digest.update(source.name.encode())
+            digest.update(source.read_bytes())
+
+        return digest.hexdigest()[:32]
+
+    def load(self, key: str) -> typing.Optional[TexturePack]:
+        image_path, index_path = self._paths(key)
+        if not image_path.is_file() or not index_path.is_file():
+            return None
+
+        try:
+            with open(index_path, 'r') as index_file:
+                index = json.load(index_file)
+
+            if index['version'] != TEXTURE_CACHE_VERSION or index['key'] != key:
+                return None
+
+            with Image.open(image_path) as image:
+                image.load()
+                packed_image = image.convert('RGBA')
+
+            return TexturePack(
+                image=packed_image,
+                regions={name: tuple(region) for name, region in index['regions']},  # type: ignore
+                static=index['static'],
+                animated=index['animated'],
+            )
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            log.warning(f"Texture cache is unreadable, textures will be packed again: {e}")
+            return None
+
+    def save(self, key: str, pack: TexturePack) -> None:
+        image_path, index_path = self._paths(key)
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+            for stale_path in self.directory.glob('textures-*'):
+                stale_path.unlink()
+
+            pack.image.save(image_path, compress_level=1)
+
+            # The index is written last, a cache entry without one is ignored
+            with open(index_path, 'w') as index_file:
+                json.dump(
+                    {
+                        'version': TEXTURE_CACHE_VERSION,
+                        'key': key,
+                        'regions': list(pack.regions.items()),
+                        'static': pack.static,
+                        'animated': pack.animated,
+                    },
+                    index_file,
+                )
+        except OSError as e:
+            log.warning(f"Could not write texture cache: {e}")
+
+    def _paths(self, key: str) -> typing.Tuple[pathlib.Path, pathlib.Path]:
+        return self.directory / f'textures-{key}.png', self.directory / f'textures-{key}.json'
+
+
+def _pad(image: Image.Image) -> Image.Image:
+    """
+    Текстура с рамкой из повторённых крайних пикселей, как её записывает TextureAtlas.write_image
+    """
+    width, height = image.size
+
+    padded = Image.new('RGBA', (width + 2, height + 2))
+    padded.paste(image, (1, 1))
+    padded.paste(padded.crop((1, 1, width + 1, 2)), (1, 0))
+    padded.paste(padded.crop((1, height, width + 1, height + 1)), (1, height + 1))
+    padded.paste(padded.crop((1, 0, 2, height + 2)), (0, 0))
+    padded.paste(padded.crop((width, 0, width + 1, height + 2)), (width + 1, 0))
+
+    return padded
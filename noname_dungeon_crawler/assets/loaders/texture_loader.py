@@ -8,32 +8,90 @@ from PIL import Image
 
 from noname_dungeon_crawler.settings import config
 
+from .texture_cache import TextureCache, TexturePack
+
 
 log = logging.getLogger(__name__)
 
+_MAX_PACKED_IMAGE_SIZE = 512  # px, larger images (backgrounds) are not drawn by sprite lists and stay out of the pack
+
 
 @attr.s(kw_only=True, auto_attribs=True)
-class _TextureContainer:
-    atlas: arcade.TextureAtlas
-    static: typing.Dict[str, arcade.Texture]
-    animated: typing.Dict[str, typing.List[arcade.Texture]]
+class PackedTextures:
+    pack: TexturePack
+    textures: typing.Dict[str, arcade.Texture]  # by texture name
+    from_cache: bool
+
+    @property
+    def static(self) -> typing.Dict[str, arcade.Texture]:
+        return {name: self.textures[name] for name in self.pack.static}
+
+    @property
+    def animated(self) -> typing.Dict[str, typing.List[arcade.Texture]]:
+        return {name: [self.textures[frame] for frame in frames] for name, frames in self.pack.animated.items()}
 
 
 class TextureLoader:
+    """
+    Текстуры из листа и отдельных изображений. Нарезанные текстуры и небольшие изображения упаковываются в одно
+    изображение, которое вместе с индексом областей кэшируется на диске: при следующем запуске с теми же
+    исходниками читается только оно, а атлас заполняется одной записью.
+    Пакет и крупные изображения можно загружать в фоновых потоках, атлас создаётся в главном
+    """
     texture_path: pathlib.Path
     texture_meta_path: pathlib.Path
+    cache: TextureCache
+
+    image_paths: typing.List[pathlib.Path]
+    packed_image_paths: typing.List[pathlib.Path]
+    standalone_image_paths: typing.List[pathlib.Path]
 
     def __init__(self) -> None:
         self.image_path = config.constants.IMAGE_DIR
         self.texture_path = config.constants.TEXTURE_DIR / 'textures.png'
         self.texture_meta_path = config.constants.TEXTURE_DIR / 'textures_meta.txt'
+        self.cache = TextureCache(config.constants.TEXTURE_CACHE_DIR)
+
+        self.image_paths = [image_path for image_path in self.image_path.iterdir() if image_path.is_file()]
+        self.packed_image_paths, self.standalone_image_paths = self._split_images(self.image_paths)
 
         logging.getLogger('arcade.texture_atlas').setLevel(logging.WARNING)  # Getting rid of spammy messages
 
-    def load_textures(self) -> _TextureContainer:
+    def load_pack(self) -> PackedTextures:
+        key = self.cache.content_key([self.texture_path, self.texture_meta_path, *self.image_paths])
+        pack = self.cache.load(key)
+
+        from_cache = pack is not None
+        if pack is None:
+            pack = TexturePack.pack(*self._cut_textures(self.packed_image_paths))
+            self.cache.save(key, pack)
+
+        # Textures are cut from the pack either way, so a cold and a warm start give the same images
+        textures = pack.get_textures()
+        log.info(f"Loaded {len(textures)} packed textures {'from cache' if from_cache else 'from sources'}")
+
+        return PackedTextures(pack=pack, textures=textures, from_cache=from_cache)
+
+    def load_image(self, image_path: pathlib.Path) -> arcade.Texture:
+        """
+        Крупное изображение не из пакета, декодируется сразу, а не при первой отрисовке
+        """
+        image = Image.open(image_path)
+        image.load()
+
+        return arcade.Texture(image_path.stem, image)
+
+    def create_atlas(self, packed: PackedTextures) -> typing.Optional[arcade.TextureAtlas]:
+        """
+        Атлас пакета, только в главном потоке (нужен контекст GL); None при запуске без окна
+        """
+        return None if config.headless else packed.pack.create_atlas(packed.textures)
+
+    def _cut_textures(
+        self, image_paths: typing.List[pathlib.Path]
+    ) -> typing.Tuple[typing.Dict[str, arcade.Texture], typing.Dict[str, typing.List[arcade.Texture]]]:
         static_textures: typing.Dict[str, arcade.Texture] = {}
         animated_textures: typing.Dict[str, typing.List[arcade.Texture]] = {}
-        all_textures: typing.List[arcade.Texture] = []
 
         texture_file = Image.open(self.texture_path)
         meta_file = open(self.texture_meta_path, 'r')
@@ -48,7 +106,6 @@ class TextureLoader:
                     name, x, y, w, h = meta_chunks
                     texture = self._load_texture(name, (int(x), int(y), int(w), int(h)), texture_file)
                     static_textures[name] = texture
-                    all_textures.append(texture)
 
                 case 6:
                     name, x, y, w, h, frames = meta_chunks
@@ -56,49 +113,52 @@ class TextureLoader:
                     textures = [self._load_texture(f'{name}_{i}', bbox, texture_file) for i, bbox in enumerate(bboxes)]
                     animated_textures[name] = textures
 
-                    # Also load flipped texture variants for moving objects
-                    flipped_textures = [
-                        self._load_texture(f'{name}_{i}_flipped', bbox, texture_file, flip=True)
-                        for i, bbox in enumerate(bboxes)
-                    ]
-                    animated_textures[f'{name}_flipped'] = flipped_textures
-
-                    all_textures.extend(textures)
-
                 case _:
                     log.error(f"Encountered malformed texture meta: {texture_meta}!")
                     continue
 
-        for image_path in self.image_path.iterdir():
-            if not image_path.is_file():
-                continue
-
+        for image_path in image_paths:
             image = Image.open(image_path)
 
             texture = arcade.Texture(image_path.stem, image)
             static_textures[image_path.stem] = texture
-            all_textures.append(texture)
-
-        atlas = arcade.TextureAtlas.create_from_texture_sequence(all_textures)
 
         texture_file.close()
         meta_file.close()
 
-        return _TextureContainer(
-            atlas=atlas,
-            static=static_textures,
-            animated=animated_textures,
-        )
-
-    def _load_texture(
-        self, name: str, bbox: typing.Tuple[int, int, int, int], atlas_img: Image, flip: bool = False
-    ) -> arcade.Texture:
+        return static_textures, animated_textures
+
+    @staticmethod
+    def _split_images(
+        image_paths: typing.List[pathlib.Path],
+    ) -> typing.Tuple[typing.List[pathlib.Path], typing.List[pathlib.Path]]:
+        """
+        Изображения, которые попадут в пакет, и крупные, которые загружаются отдельно
+        """
+        packed: typing.List[pathlib.Path] = []
+        standalone: typing.List[pathlib.Path] = []
+
+        for image_path in image_paths:
+            with Image.open(image_path) as image:  # Only the header is read
+                is_small = max(image.size) <= _MAX_PACKED_IMAGE_SIZE
+            (packed if is_small else standalone).append(image_path)
+
+        return packed, standalone
+
+    @staticmethod
+    def flip_textures(textures: typing.List[arcade.Texture]) -> typing.List[arcade.Texture]:
+        """
+        Отражённые по горизонтали кадры анимации, для мобов и игрока, смотрящих влево
+        """
+        return [
+            arcade.Texture(name=f'{texture.name}_flipped', image=texture.image.transpose(Image.FLIP_LEFT_RIGHT))
+            for texture in textures
+        ]
+
+    def _load_texture(self, name: str, bbox: typing.Tuple[int, int, int, int], atlas_img: Image) -> arcade.Texture:
         x, y, w, h = bbox
         texture_crop: Image = atlas_img.crop((x, y, x + w, y + h))
 
-        if flip:
-            texture_crop = texture_crop.transpose(Image.FLIP_LEFT_RIGHT)
-
         return arcade.Texture(name=name, image=texture_crop)
 
     def _make_bboxes(
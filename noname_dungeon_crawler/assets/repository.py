@@ -1,28 +1,44 @@
+import functools
 import logging
+import pathlib
 import typing
 
 import arcade
 
+from noname_dungeon_crawler.settings import config
 from noname_dungeon_crawler.sprites import Entity
 
-from .loaders import EntityLoader, SoundLoader, TextureLoader
+from .loaders import (
+    AssetLoadReport,
+    AssetPriority,
+    EntityLoader,
+    PackedTextures,
+    ParallelAssetLoader,
+    SoundLoader,
+    TextureLoader,
+)
 
 
 log = logging.getLogger(__name__)
 
+_FLIPPED_SUFFIX = '_flipped'
+
 
 class AssetRepository:
+    loaded: bool = False
+    load_report: typing.Optional[AssetLoadReport] = None  # per-asset startup timings of the last load
+
     # Textures
-    texture_atlas: arcade.TextureAtlas
+    texture_atlas: typing.Optional[arcade.TextureAtlas]
     _textures_static: typing.Dict[str, arcade.Texture]
-    _textures_animated: typing.Dict[str, typing.List[arcade.Texture]]
+    _textures_animated: typing.Dict[str, typing.List[arcade.Texture]]  # mirrored strips are added on first request
 
     # Sample entity index
     _entities: typing.Dict[str, Entity]
 
     # Sounds
     _sound_effects: typing.Dict[str, arcade.Sound]
-    _music: typing.Dict[str, arcade.Sound]
+    _music: typing.Dict[str, pathlib.Path]  # streamed by the audio service, never loaded up front
 
     def get_static_texture(self, name: str) -> arcade.Texture:
         if name not in self._textures_static:
@@ -31,6 +47,21 @@ class AssetRepository:
         return self._textures_static[name]
 
     def get_animated_texture(self, name: str) -> typing.List[arcade.Texture]:
+        """
+        Кадры анимации; отражённый вариант (<name>_flipped) создаётся при первом запросе и запоминается
+        """
+        if name not in self._textures_animated and name.endswith(_FLIPPED_SUFFIX):
+            original_name = name[:-len(_FLIPPED_SUFFIX)]
+            if original_name in self._textures_animated:
+                flipped = TextureLoader.flip_textures(self._textures_animated[original_name])
+                # GameplayScene draws entities from this atlas. Entities ask for flipped frames while assets load,
+                # so writing them here keeps atlas resizes at startup
+                if self.texture_atlas is not None:
+                    for texture in flipped:
+                        self.texture_atlas.add(texture)
+
+                self._textures_animated[name] = flipped
+
         if name not in self._textures_animated:
             raise ValueError(f"No such animation: {name}")
 
@@ -48,38 +79,102 @@ class AssetRepository:
 
         return self._sound_effects[name]
 
-    def get_music(self, name: str) -> arcade.Sound:
+    def get_music(self, name: str) -> pathlib.Path:
         if name not in self._music:
             raise ValueError(f"No such music track: {name}")
 
         return self._music[name]
 
     def load_assets(self) -> None:
+        """
+        Загрузка всех ассетов: декодирование на пуле потоков, сначала то, что нужно главному меню
+        """
         log.info("Loading assets...")
 
-        log.info("Loading textures...")
-
         texture_loader = TextureLoader()
-        texture_container = texture_loader.load_textures()
-
-        self._textures_static = texture_container.static
-        self._textures_animated = texture_container.animated
-        self.texture_atlas = texture_container.atlas
-
-        log.info("Finished loading textures!")
-        log.info("Loading sounds...")
-
         sound_loader = SoundLoader()
-        self._sound_effects = sound_loader.load_effects()
-        self._music = sound_loader.load_music()
-
-        log.info("Finished loading sounds!")
-        log.info("Loading entities...")
-
         entity_loader = EntityLoader()
-        self._entities = entity_loader.load_entities()
 
-        log.info("Finished loading entities!")
+        effect_files = sound_loader.find_effects()
+        image_paths = texture_loader.standalone_image_paths
+
+        self._textures_static = {}
+        self._textures_animated = {}
+        self._entities = {}
+
+        loader = ParallelAssetLoader(max_workers=config.constants.ASSET_LOADER_WORKERS)
+
+        # Decoding on the pool, the main menu needs only its background (its music is streamed when it starts)
+        for image_path in image_paths:
+            loader.add(
+                f'image:{image_path.stem}',
+                AssetPriority.MAIN_MENU,
+                functools.partial(texture_loader.load_image, image_path),
+            )
+
+        loader.add('texture_pack', AssetPriority.GAMEPLAY, texture_loader.load_pack)
+        for effect_file in effect_files:
+            loader.add(
+                f'sound:{effect_file.stem}',
+                AssetPriority.GAMEPLAY,
+                functools.partial(sound_loader.load_effect, effect_file),
+            )
+        for entity_config in entity_loader.entity_configs:
+            loader.add(
+                f'entity_config:{entity_config.stem}',
+                AssetPriority.GAMEPLAY,
+                functools.partial(entity_loader.read_config, entity_config),
+            )
+
+        # Installing into the repository on the main thread: the atlas upload needs the GL context,
+        # entities take their textures and sounds from the repository
+        def install_images(*textures: arcade.Texture) -> None:
+            self._textures_static.update(zip((image_path.stem for image_path in image_paths), textures))
+
+        def install_music() -> None:
+            self._music = sound_loader.find_music()
+
+        def install_textures(packed: PackedTextures) -> None:
+            self._textures_static.update(packed.static)
+            self._textures_animated = packed.animated
+            self.texture_atlas = texture_loader.create_atlas(packed)
+
+        def install_sounds(*sounds: arcade.Sound) -> None:
+            self._sound_effects = dict(zip((effect_file.stem for effect_file in effect_files), sounds))
+
+        def install_entity(conf: dict, *_: None) -> None:
+            entity_name, entity = entity_loader.create_entity(conf)
+            self._entities[entity_name] = entity
+
+        loader.add(
+            'images',
+            AssetPriority.MAIN_MENU,
+            install_images,
+            after=[f'image:{image_path.stem}' for image_path in image_paths],
+            main_thread=True,
+        )
+        loader.add('music', AssetPriority.MAIN_MENU, install_music, main_thread=True)
+        loader.add('textures', AssetPriority.GAMEPLAY, install_textures, after=['texture_pack'], main_thread=True)
+        loader.add(
+            'sounds',
+            AssetPriority.GAMEPLAY,
+            install_sounds,
+            after=[f'sound:{effect_file.stem}' for effect_file in effect_files],
+            main_thread=True,
+        )
+        for entity_config in entity_loader.entity_configs:
+            loader.add(
+                f'entity:{entity_config.stem}',
+                AssetPriority.GAMEPLAY,
+                install_entity,
+                after=[f'entity_config:{entity_config.stem}', 'textures', 'sounds'],
+                main_thread=True,
+            )
+
+        _, self.load_report = loader.run()
+        self.load_report.log()
+
+        self.loaded = True
         log.info("Finished loading assets!")
 
 
@@ -0,0 +1,4 @@
+from .level_benchmark import BenchmarkCase, LevelBenchmark
+
+
+__all__ = ['BenchmarkCase', 'LevelBenchmark']
@@ -0,0 +1,58 @@
+import argparse
+import json
+import logging
+import platform
+import sys
+
+from noname_dungeon_crawler.settings import config
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='python -m noname_dungeon_crawler.benchmarks',
+        description="Headless level generation and initialisation benchmark, results are printed as JSON",
+    )
+    parser.add_argument('--seeds', type=int, default=20, help="number of seeds per case")
+    parser.add_argument('--levels', type=int, nargs='+', default=[1])
+    parser.add_argument('--grid-size', type=int, nargs='+', default=[config.constants.GENERATOR_GRID_SIZE])
+    parser.add_argument('--room-size', type=int, nargs='+', default=[config.constants.GENERATOR_ROOM_SIZE])
+    parser.add_argument('--decay', type=float, nargs='+', default=[config.constants.GENERATOR_PROBABILITY_DECAY])
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc pass")
+    parser.add_argument('--output', help="write JSON to this file instead of stdout")
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+
+    logging.basicConfig(**{**config.constants.LOGGING_CONFIG, 'stream': sys.stderr})  # type: ignore
+    config.headless = True
+
+    import pyglet
+
+    pyglet.options['audio'] = ('silent',)  # The driver is picked when the first sound plays, before that
+
+    from noname_dungeon_crawler.assets import asset_repository
+
+    from .level_benchmark import LevelBenchmark
+
+    asset_repository.load_assets()
+
+    benchmark = LevelBenchmark(seeds=range(args.seeds), trace_memory=not args.no_memory)
+    report = benchmark.run(LevelBenchmark.sweep(args.levels, args.grid_size, args.room_size, args.decay))
+    report['environment'] = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'layout_mode': config.constants.GENERATOR_LAYOUT_MODE,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+
+main()
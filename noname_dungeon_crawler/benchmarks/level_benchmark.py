@@ -0,0 +1,205 @@
+import contextlib
+import gc
+import itertools
+import logging
+import time
+import tracemalloc
+import typing
+
+import arcade
+import attr
+
+from noname_dungeon_crawler.physics import PhysicsWorld
+from noname_dungeon_crawler.settings import config
+
+
+log = logging.getLogger(__name__)
+
+
+STAGES = ('generation', 'composition', 'population', 'physics')
+PERCENTILES = (50, 90, 99)
+
+
+@attr.s(kw_only=True, auto_attribs=True, frozen=True)
+class BenchmarkCase:
+    level: int
+    grid_size: int
+    room_size: int
+    decay: float
+
+
+@attr.s(kw_only=True, auto_attribs=True)
+class _SeedRun:
+    stage_times: typing.Dict[str, float]
+    rooms: int
+    sprites: int
+
+
+class LevelBenchmark:
+    """
+    Замер генерации и инициализации уровня без окна: генерация плана, склейка статичных слоёв,
+    создание списков спрайтов и физических движков. Результат - словарь, готовый к выгрузке в JSON
+    """
+    seeds: typing.Sequence[int]
+    trace_memory: bool
+
+    def __init__(self, seeds: typing.Sequence[int], trace_memory: bool = True) -> None:
+        self.seeds = seeds
+        self.trace_memory = trace_memory
+
+    @staticmethod
+    def sweep(
+        levels: typing.Iterable[int],
+        grid_sizes: typing.Iterable[int],
+        room_sizes: typing.Iterable[int],
+        decays: typing.Iterable[float],
+    ) -> typing.List[BenchmarkCase]:
+        return [
+            BenchmarkCase(level=level, grid_size=grid_size, room_size=room_size, decay=decay)
+            for level, grid_size, room_size, decay in itertools.product(levels, grid_sizes, room_sizes, decays)
+        ]
+
+    def run(self, cases: typing.Iterable[BenchmarkCase]) -> typing.Dict[str, typing.Any]:
+        results = []
+        for case in cases:
+            log.info(f"Benchmarking {case}...")
+            results.append(self.run_case(case))
+
+        return {
+            'seeds': len(self.seeds),
+            'cases': results,
+        }
+
+    def run_case(self, case: BenchmarkCase) -> typing.Dict[str, typing.Any]:
+        runs: typing.List[_SeedRun] = []
+        failures = 0
+
+        with _generator_settings(case):
+            for seed in self.seeds:
+                try:
+                    runs.append(self._run_seed(case.level, seed))
+                except RuntimeError as e:  # Degenerate layouts (e.g. a single room) cannot place doors
+                    log.warning(f"Seed {seed} failed for {case}: {e}")
+                    failures += 1
+
+            # Memory is measured in a separate pass, tracing would distort the timings above
+            peak_memory = self._measure_peak_memory(case.level) if self.trace_memory and runs else None
+
+        result: typing.Dict[str, typing.Any] = {
+            'params': attr.asdict(case),
+            'runs': len(runs),
+            'failures': failures,
+        }
+        if not runs:
+            return result
+
+        total_times = [sum(run.stage_times.values()) for run in runs]
+        generation_time = sum(run.stage_times['generation'] for run in runs)
+
+        result['stages'] = {stage: _summarize([run.stage_times[stage] for run in runs]) for stage in STAGES}
+        result['stages']['total'] = _summarize(total_times)
+        result['rooms'] = _summarize([run.rooms for run in runs])
+        result['rooms_per_second'] = sum(run.rooms for run in runs) / generation_time if generation_time else None
+        result['sprites_created'] = _summarize([run.sprites for run in runs])
+        result['peak_memory_bytes'] = peak_memory
+
+        return result
+
+    def _run_seed(self, level: int, seed: int) -> _SeedRun:
+        from noname_dungeon_crawler.level_generator import LevelBuilder, LevelGenerator
+
+        gc.collect()
+        stage_times: typing.Dict[str, float] = {}
+
+        start = time.perf_counter()
+        generator = LevelGenerator(level=level, seed=seed)
+        blueprint = generator.generate_blueprint()
+        stage_times['generation'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        blueprint.compose_static_layers()
+        stage_times['composition'] = time.perf_counter() - start
+
+        # Mirrors GameplayScene._init_level
+        start = time.perf_counter()
+        level_dump = LevelBuilder().build(blueprint)
+        impassable = arcade.SpriteList(use_spatial_hash=True)
+        impassable.extend(level_dump.chests)
+        impassable.extend(level_dump.mobs)
+        impassable.extend(level_dump.doors)
+        stage_times['population'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        player = self._get_player()
+        player.position = level_dump.starting_coords
+        physics = PhysicsWorld(impassable, level_dump.collision_grid)
+        physics.add_body(player)
+        for mob in level_dump.mobs:
+            physics.add_body(mob)
+        stage_times['physics'] = time.perf_counter() - start
+
+        sprites = sum(
+            len(sprite_list)
+            for sprite_list in (
+                level_dump.floor,
+                level_dump.walls,
+                level_dump.mobs,
+                level_dump.chests,
+                level_dump.doors,
+            )
+        )
+
+        return _SeedRun(stage_times=stage_times, rooms=len(generator.rooms), sprites=sprites + 1)  # + player
+
+    def _measure_peak_memory(self, level: int) -> int:
+        gc.collect()
+
+        tracemalloc.start()
+        try:
+            self._run_seed(level, self.seeds[0])
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return peak
+
+    def _get_player(self) -> arcade.Sprite:
+        from noname_dungeon_crawler.assets import asset_repository
+
+        return asset_repository.get_entity('player')
+
+
+@contextlib.contextmanager
+def _generator_settings(case: BenchmarkCase) -> typing.Iterator[None]:
+    overrides = {
+        'GENERATOR_GRID_SIZE': case.grid_size,
+        'GENERATOR_ROOM_SIZE': case.room_size,
+        'GENERATOR_PROBABILITY_DECAY': case.decay,
+    }
+    previous = {name: getattr(config.constants, name) for name in overrides}
+
+    for name, value in overrides.items():
+        setattr(config.constants, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(config.constants, name, value)
+
+
+def _summarize(values: typing.Sequence[float]) -> typing.Dict[str, float]:
+    ordered = sorted(values)
+
+    summary = {'min': ordered[0], 'max': ordered[-1], 'mean': sum(ordered) / len(ordered)}
+    summary.update({f'p{percentile}': _percentile(ordered, percentile) for percentile in PERCENTILES})
+
+    return summary
+
+
+def _percentile(ordered: typing.Sequence[float], percentile: float) -> float:
+    # Linear interpolation between the closest ranks
+    position = (len(ordered) - 1) * percentile / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
@@ -1,12 +1,15 @@
 import collections
 import logging
+import sys
 import typing
 
 import arcade
 
 from .assets import asset_repository
+from .level_generator import LevelPregenerator
 from .scenes import GameplayScene, InteractableScene, MainMenuScene, PauseScene, SceneType
 from .settings import config
+from .util import FixedTimestep, StartupProfile
 
 
 log = logging.getLogger(__name__)
@@ -17,59 +20,93 @@ WINDOW_TITLE = "NoName Dungeon Crawler"
 
 class NonameDungeonCrawler(arcade.Window):
     """
-    Инициализация сцен и эвентов управления.
+    Инициализация сцен и эвентов управления. Сцены создаются при первой активации: пока показано главное меню,
+    первый уровень генерируется в фоне, а сцена игры собирается по нажатию Start
     """
-    scenes: typing.Dict[SceneType, InteractableScene]
+    scenes: typing.Dict[SceneType, InteractableScene]  # scenes created so far
     active_scenes: typing.Deque[InteractableScene]
+    timestep: FixedTimestep
+    startup_profile: typing.Optional[StartupProfile]  # printed and dropped once the first frame is drawn
+
+    _level_pregenerator: typing.Optional[LevelPregenerator]  # generating level 1 for the next gameplay scene
 
     _instance: 'NonameDungeonCrawler'
 
-    def __init__(self) -> None:
+    def __init__(self, startup_profile: typing.Optional[StartupProfile] = None) -> None:
         super().__init__(*config.resolution, WINDOW_TITLE)
 
         arcade.set_background_color(arcade.csscolor.BLACK)
 
+        self.timestep = FixedTimestep(config.tick_rate, config.constants.MAX_TICKS_PER_FRAME)
+        self.startup_profile = startup_profile
+
+        self._level_pregenerator = None
+
         self.__class__._instance = self
 
     def setup(self) -> None:
         log.info("Starting game...")
 
         asset_repository.load_assets()
+        self._mark_startup('assets')
 
         self.scenes = collections.OrderedDict()
-        self.scenes[SceneType.MAIN_MENU] = MainMenuScene()
-        self.scenes[SceneType.GAMEPLAY] = GameplayScene()
-        self.scenes[SceneType.PAUSE] = PauseScene()
-
         self.active_scenes = collections.deque()
         self.activate_scene(SceneType.MAIN_MENU)
+        self._mark_startup('scenes')
 
     def activate_scene(self, scene_type: SceneType, clear: bool = False) -> None:
         if clear:
             for _ in range(len(self.active_scenes)):
                 self.deactivate_scene()
 
-        scene = self.scenes[scene_type]
+        scene = self.get_scene(scene_type)
         self.active_scenes.append(scene)
         scene.on_activate()
 
+        if scene_type == SceneType.MAIN_MENU and not self._has_scene(SceneType.GAMEPLAY):
+            self._pregenerate_first_level()
+
     def deactivate_scene(self) -> None:
         scene = self.active_scenes.pop()
         scene.on_deactivate()
 
+    def get_scene(self, scene_type: SceneType) -> InteractableScene:
+        """
+        Сцена для активации; создаётся, если её ещё нет или прежняя больше не используется
+        """
+        if not self._has_scene(scene_type):
+            self.scenes[scene_type] = self._create_scene(scene_type)
+
+        return self.scenes[scene_type]
+
     def get_gameplay_scene(self) -> GameplayScene:
+        # Never creates the scene: entities of a finished game may still ask for it until its tick ends
         return self.scenes[SceneType.GAMEPLAY]  # type: ignore
 
     def on_draw(self) -> None:
         self.clear()
 
         for scene in self.active_scenes:
+            # Only the top scene is simulated, the ones below it are drawn as they were left
+            scene.set_interpolation(self.timestep.alpha if scene is self.active_scenes[-1] else 1.0)
             scene.draw(pixelated=True)
 
+        if self.startup_profile is not None:
+            self._mark_startup('first frame')
+            sys.stdout.write(self.startup_profile.format() + '\n')
+            self.startup_profile = None
+
     def on_update(self, delta_time: float) -> None:
-        scene = self.active_scenes[-1]
-        scene.on_update(delta_time)
-        scene.update_animation(delta_time)
+        # The simulation always advances by whole ticks, whatever the frame time is
+        for _ in range(self.timestep.advance(delta_time)):
+            scene = self.active_scenes[-1]  # A tick may switch scenes (pause, death)
+            scene.on_update(self.timestep.tick)
+            scene.update_animation(self.timestep.tick)
+
+        # Scenes deactivated for good are dropped once nothing of their tick is left running
+        for scene_type in [scene_type for scene_type, scene in self.scenes.items() if scene.disposed]:
+            del self.scenes[scene_type]
 
     def on_key_press(self, symbol: int, modifiers: int) -> None:
         scene = self.active_scenes[-1]
@@ -91,6 +128,36 @@ class NonameDungeonCrawler(arcade.Window):
         scene = self.active_scenes[-1]
         scene.on_mouse_motion(x, y, dx, dy)
 
+    def _create_scene(self, scene_type: SceneType) -> InteractableScene:
+        log.info(f"Creating {scene_type.value} scene")
+
+        match scene_type:
+            case SceneType.MAIN_MENU:
+                return MainMenuScene()
+
+            case SceneType.GAMEPLAY:
+                # Level 1 has been generating in the background since the main menu was shown
+                pregenerator, self._level_pregenerator = self._level_pregenerator, None
+                return GameplayScene(pregenerator=pregenerator)
+
+            case SceneType.PAUSE:
+                return PauseScene()
+
+            case _:
+                raise ValueError(f"Unknown scene type: {scene_type}")
+
+    def _has_scene(self, scene_type: SceneType) -> bool:
+        return scene_type in self.scenes and not self.scenes[scene_type].disposed
+
+    def _pregenerate_first_level(self) -> None:
+        if self._level_pregenerator is None:
+            self._level_pregenerator = LevelPregenerator()
+            self._level_pregenerator.request(1)
+
+    def _mark_startup(self, phase: str) -> None:
+        if self.startup_profile is not None:
+            self.startup_profile.mark(phase)
+
     @classmethod
     def get_instance(cls) -> 'NonameDungeonCrawler':
         return cls._instance
@@ -1,4 +1,25 @@
+from .blueprint import LevelBlueprint
+from .builder import LevelBuilder
 from .generator import LevelGenerator
+from .layout import LayoutMode, LevelLayout
+from .pregenerator import LevelPregenerator, PregenerationMetrics
+from .room_graph import RoomGraph
+from .snapshot import SnapshotError, load_snapshot, save_snapshot
+from .streaming import MobActivity, RoomChunkManager
 
 
-__all__ = ['LevelGenerator']
+__all__ = [
+    'LayoutMode',
+    'LevelBlueprint',
+    'LevelBuilder',
+    'LevelGenerator',
+    'LevelLayout',
+    'LevelPregenerator',
+    'MobActivity',
+    'PregenerationMetrics',
+    'RoomChunkManager',
+    'RoomGraph',
+    'SnapshotError',
+    'load_snapshot',
+    'save_snapshot',
+]
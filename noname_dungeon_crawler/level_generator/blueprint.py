@@ -0,0 +1,73 @@
+import math
+import typing
+
+import arcade
+import attr
+
+from noname_dungeon_crawler.physics import CollisionGrid, FlowField
+
+from .tile_layer import StaticTileLayer
+
+
+if typing.TYPE_CHECKING:
+    from .room_graph import Cell, RoomGraph
+
+
+@attr.s(kw_only=True, auto_attribs=True)
+class MobSpawn:
+    name: str
+    position: arcade.Point
+    level: int
+
+
+@attr.s(kw_only=True, auto_attribs=True)
+class ChestSpawn:
+    position: arcade.Point
+    level: int
+
+
+@attr.s(kw_only=True, auto_attribs=True)
+class DoorSpawn:
+    is_exit: bool
+    position: arcade.Point
+    level: int
+    cell: 'Cell'  # room that placed the door, the door stands above its floor
+
+
+@attr.s(kw_only=True, auto_attribs=True)
+class LevelBlueprint:
+    """
+    Содержимое уровня в виде простых данных, без спрайтов (можно генерировать вне игрового потока)
+    """
+    level: int
+    tile_size: float
+    room_size: int  # in tiles
+
+    floor: StaticTileLayer
+    walls: StaticTileLayer
+    collision_grid: CollisionGrid  # walls as solid tiles
+    flow_field: FlowField  # mob paths over the floor
+    mobs: typing.List[MobSpawn]
+    chests: typing.List[ChestSpawn]
+    doors: typing.List[DoorSpawn]
+
+    room_graph: 'RoomGraph'
+    starting_coords: arcade.Point
+
+    def compose_static_layers(self) -> None:
+        """
+        Подготовка изображений чанков статичных слоёв заранее (например, в фоновом потоке)
+        """
+        self.floor.compose_chunks()
+        self.walls.compose_chunks()
+
+    def cell_at(self, x: float, y: float) -> 'Cell':
+        """
+        Ячейка сетки комнат, в которую попадает точка уровня (в пикселях). Стены и двери над комнатой попадают
+        в ячейку выше, они относятся к комнате по полю cell
+        """
+        # Inverse of the room origins used by the generator: (cell * size - size // 2, cell * size - size // 2 - 1)
+        center_idx = self.room_size // 2
+        column, row = math.floor(x / self.tile_size + 0.5), math.floor(y / self.tile_size + 0.5)
+
+        return (column + center_idx) // self.room_size, (row + center_idx + 1) // self.room_size
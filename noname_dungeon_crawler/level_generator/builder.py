@@ -0,0 +1,82 @@
+import functools
+import typing
+
+import arcade
+import attr
+
+from noname_dungeon_crawler.physics import CollisionGrid
+from noname_dungeon_crawler.settings import config
+from noname_dungeon_crawler.sprites import Chest, Door, HostileMob, sprite_pools
+from noname_dungeon_crawler.util import get_scale
+
+from .blueprint import LevelBlueprint
+from .room_graph import RoomGraph
+
+
+@attr.s(kw_only=True, auto_attribs=True)
+class _LevelDump:
+    """
+    Класс для хранения данных после преобразования в спрайты
+    """
+    floor: arcade.SpriteList  # baked static layer
+    walls: arcade.SpriteList  # baked static layer
+    collision_grid: CollisionGrid  # walls collide by tiles, not by sprites
+    # Plain lists: the sprites are handed over to the room pager and must not stay in a hashed SpriteList
+    mobs: typing.List[HostileMob]
+    chests: typing.List[Chest]
+    doors: typing.List[Door]
+
+    room_graph: RoomGraph
+    starting_coords: arcade.Point
+
+
+class LevelBuilder:
+    """
+    Превращение плана уровня в спрайты (только в игровом потоке). Спрайты берутся из пулов,
+    чтобы при смене уровня не создавать тысячи новых объектов
+    """
+
+    def build(self, blueprint: LevelBlueprint) -> _LevelDump:
+        from noname_dungeon_crawler.assets import asset_repository
+
+        mobs: typing.List[HostileMob] = []
+        chests: typing.List[Chest] = []
+        doors: typing.List[Door] = []
+
+        floor = blueprint.floor.bake()
+        walls = blueprint.walls.bake()
+
+        for mob_spawn in blueprint.mobs:
+            mob = typing.cast(
+                HostileMob,
+                sprite_pools.acquire(
+                    f'entity_{mob_spawn.name}', functools.partial(asset_repository.get_entity, mob_spawn.name)
+                ),
+            )
+            mob.reset(mob_spawn.level)
+            mob.position = mob_spawn.position
+            mobs.append(mob)
+
+        for chest_spawn in blueprint.chests:
+            chest = sprite_pools.acquire('chest', functools.partial(Chest, level=chest_spawn.level))
+            chest.reset(chest_spawn.level)
+            chest.position = chest_spawn.position
+            chests.append(chest)
+
+        for door_spawn in blueprint.doors:
+            door = sprite_pools.acquire('door', functools.partial(Door, is_exit=False, scale=1, level=1))
+            door.reset(door_spawn.level, is_exit=door_spawn.is_exit)
+            door.scale = get_scale(door.texture, config.constants.TILE_SCALE)
+            door.position = door_spawn.position
+            doors.append(door)
+
+        return _LevelDump(
+            floor=floor,
+            walls=walls,
+            collision_grid=blueprint.collision_grid,
+            mobs=mobs,
+            chests=chests,
+            doors=doors,
+            room_graph=blueprint.room_graph,
+            starting_coords=blueprint.starting_coords,
+        )
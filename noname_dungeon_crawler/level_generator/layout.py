@@ -0,0 +1,129 @@
+import collections
+import enum
+import random
+import typing
+
+
+# Expansion order of the original recursive generator: left, right, bottom, top
+_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+class LayoutMode(enum.Enum):
+    DEPTH_FIRST = 'depth_first'  # Reproduces the legacy recursive generator for a given seed
+    BREADTH_FIRST = 'breadth_first'
+
+
+class LevelLayout:
+    """
+    Компактная сетка занятых клеток: битовая маска в bytearray и список занятых клеток
+    """
+    grid_size: int
+
+    occupancy: bytearray
+    cells: typing.List[typing.Tuple[int, int]]
+
+    def __init__(self, grid_size: int) -> None:
+        self.grid_size = grid_size
+
+        self.occupancy = bytearray(grid_size * grid_size)
+        self.cells = []
+
+    def is_occupied(self, x: int, y: int) -> bool:
+        return self.occupancy[x * self.grid_size + y] != 0
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.grid_size and 0 <= y < self.grid_size
+
+    def occupy(self, x: int, y: int) -> None:
+        idx = x * self.grid_size + y
+        if self.occupancy[idx]:
+            return
+
+        self.occupancy[idx] = 1
+        self.cells.append((x, y))
+
+    def sorted_cells(self) -> typing.List[typing.Tuple[int, int]]:
+        """
+        Клетки в порядке обхода исходной матрицы (по x, затем по y)
+        """
+        return sorted(self.cells)
+
+    @property
+    def center(self) -> typing.Tuple[int, int]:
+        center_idx = self.grid_size // 2
+        return center_idx, center_idx
+
+
+class LayoutGenerator:
+    """
+    Итеративная генерация раскладки комнат с очередью/стеком вместо рекурсии
+    """
+    mode: LayoutMode
+    decay: float
+    rng: random.Random
+
+    def __init__(self, mode: LayoutMode, decay: float, rng: typing.Optional[random.Random] = None) -> None:
+        self.mode = mode
+        self.decay = decay
+        self.rng = rng or random.Random()
+
+    def generate(self, grid_size: int) -> LevelLayout:
+        layout = LevelLayout(grid_size)
+
+        center_x, center_y = layout.center
+        layout.occupy(center_x, center_y)
+
+        seeds = [(center_x + dx, center_y + dy) for dx, dy in _DIRECTIONS]
+        seeds = [seed for seed in seeds if layout.in_bounds(*seed)]
+
+        match self.mode:
+            case LayoutMode.DEPTH_FIRST:
+                self._generate_depth_first(layout, seeds)
+            case LayoutMode.BREADTH_FIRST:
+                self._generate_breadth_first(layout, seeds)
+
+        return layout
+
+    def _generate_depth_first(self, layout: LevelLayout, seeds: typing.List[typing.Tuple[int, int]]) -> None:
+        # Each frame is [x, y, chance, next direction index]; the order of random rolls matches the recursion
+        stack: typing.List[typing.List[typing.Any]] = []
+
+        def _try_enter(x: int, y: int, chance: float) -> None:
+            if self.rng.uniform(0, 1) > chance:
+                return
+
+            layout.occupy(x, y)
+            stack.append([x, y, chance, 0])
+
+        for seed_x, seed_y in seeds:
+            # Seed rooms are not checked for occupancy, exactly like the original top-level calls
+            _try_enter(seed_x, seed_y, 1.0)
+
+            while stack:
+                frame = stack[-1]
+                if frame[3] == len(_DIRECTIONS):
+                    stack.pop()
+                    continue
+
+                dx, dy = _DIRECTIONS[frame[3]]
+                frame[3] += 1
+
+                next_x, next_y = frame[0] + dx, frame[1] + dy
+                if layout.in_bounds(next_x, next_y) and not layout.is_occupied(next_x, next_y):
+                    _try_enter(next_x, next_y, frame[2] * self.decay)
+
+    def _generate_breadth_first(self, layout: LevelLayout, seeds: typing.List[typing.Tuple[int, int]]) -> None:
+        queue: typing.Deque[typing.Tuple[int, int, float]] = collections.deque((x, y, 1.0) for x, y in seeds)
+
+        while queue:
+            x, y, chance = queue.popleft()
+
+            if layout.is_occupied(x, y) or self.rng.uniform(0, 1) > chance:
+                continue
+
+            layout.occupy(x, y)
+
+            for dx, dy in _DIRECTIONS:
+                next_x, next_y = x + dx, y + dy
+                if layout.in_bounds(next_x, next_y) and not layout.is_occupied(next_x, next_y):
+                    queue.append((next_x, next_y, chance * self.decay))
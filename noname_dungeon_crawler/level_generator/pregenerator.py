@@ -0,0 +1,112 @@
+import concurrent.futures
+import logging
+import pathlib
+import time
+import typing
+
+import attr
+
+from noname_dungeon_crawler.settings import config
+
+from .blueprint import LevelBlueprint
+from .generator import LevelGenerator
+from .snapshot import SNAPSHOT_EXTENSION, SnapshotError, load_snapshot
+
+
+log = logging.getLogger(__name__)
+
+
+@attr.s(kw_only=True, auto_attribs=True)
+class PregenerationMetrics:
+    generation_time: float = 0.0  # seconds spent generating the last level (worker thread)
+    wait_time: float = 0.0  # seconds the game thread waited for an unfinished level
+    handoff_time: float = 0.0  # seconds the game thread spent switching to the last level
+
+    ready_hits: int = 0  # level was already generated when requested
+    ready_misses: int = 0  # game thread had to wait for (or run) the generation
+
+
+class LevelPregenerator:
+    """
+    Генерация плана следующего уровня в фоновом потоке, пока игрок проходит текущий
+    """
+    metrics: PregenerationMetrics
+    seed: typing.Optional[int]  # levels are reproducible when set
+
+    _executor: concurrent.futures.ThreadPoolExecutor
+    _pending: typing.Dict[int, 'concurrent.futures.Future[typing.Tuple[LevelBlueprint, float]]']
+
+    def __init__(self, seed: typing.Optional[int] = None) -> None:
+        self.metrics = PregenerationMetrics()
+        self.seed = seed
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='level-pregen')
+        self._pending = {}
+
+    def request(self, level: int) -> None:
+        if level in self._pending:
+            return
+
+        self._pending[level] = self._executor.submit(self._generate, level)
+
+    def take(self, level: int) -> LevelBlueprint:
+        """
+        Забрать план уровня; если он ещё не готов, игровой поток дождётся генерации
+        """
+        future = self._pending.pop(level, None)
+
+        if future is None:
+            self.metrics.ready_misses += 1
+            blueprint, self.metrics.generation_time = self._generate(level)
+            self.metrics.wait_time = self.metrics.generation_time
+            return blueprint
+
+        if future.done():
+            self.metrics.ready_hits += 1
+        else:
+            self.metrics.ready_misses += 1
+
+        wait_start = time.perf_counter()
+        blueprint, self.metrics.generation_time = future.result()
+        self.metrics.wait_time = time.perf_counter() - wait_start
+
+        return blueprint
+
+    def record_handoff(self, handoff_time: float) -> None:
+        self.metrics.handoff_time = handoff_time
+
+        log.info(
+            f"Level handoff took {handoff_time * 1000:.1f} ms "
+            f"(generation: {self.metrics.generation_time * 1000:.1f} ms, wait: {self.metrics.wait_time * 1000:.1f} ms)"
+        )
+
+    def shutdown(self) -> None:
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
+        self._executor.shutdown(wait=False)
+
+    def _generate(self, level: int) -> typing.Tuple[LevelBlueprint, float]:
+        start = time.perf_counter()
+
+        # Pre-built levels shipped as snapshots are loaded instead of being generated
+        snapshot_path = config.constants.LEVEL_SNAPSHOT_DIR / f'level_{level}.{SNAPSHOT_EXTENSION}'
+        blueprint = self._load_snapshot(snapshot_path) if snapshot_path.is_file() else None
+        if blueprint is None:
+            level_seed = None if self.seed is None else self.seed * 1_000_003 + level
+            blueprint = LevelGenerator(level=level, seed=level_seed).generate_blueprint()
+        blueprint.compose_static_layers()
+
+        return blueprint, time.perf_counter() - start
+
+    @staticmethod
+    def _load_snapshot(path: pathlib.Path) -> typing.Optional[LevelBlueprint]:
+        """
+        План из снимка или None, если снимок не читается (например, записан старой версией) - тогда уровень генерируется
+        """
+        try:
+            return load_snapshot(path)
+        except (OSError, SnapshotError) as e:
+            log.warning(f"Could not load level snapshot {path}, generating the level instead: {e}")
+            return None
@@ -6,9 +6,11 @@ import typing
 import arcade
 
 from noname_dungeon_crawler.settings import config
-from noname_dungeon_crawler.sprites import Chest, Door, HostileMob
 from noname_dungeon_crawler.util import get_scale
 
+from .blueprint import ChestSpawn, DoorSpawn, MobSpawn
+from .tile_layer import TileRecord
+
 
 _FLOOR_TEXTURES = ('floor_1', 'floor_2', 'floor_3', 'floor_4', 'floor_5', 'floor_6', 'floor_7', 'floor_8')
 _SPECIAL_WALL_TEXTURES = (
@@ -31,7 +33,7 @@ class RoomConnection(enum.Enum):
 
 class Room:
     """
-    Генерация комнаты и наполнения комнаты
+    Генерация комнаты и наполнения комнаты (в виде простых данных, без спрайтов)
     """
     level: int
 
@@ -39,17 +41,21 @@ class Room:
     passage_size: int
     connections: typing.Set[RoomConnection]
     spawn_mobs: bool
+    rng: random.Random
+
+    origin: typing.Tuple[int, int]  # world tile column and row of the bottom left floor tile
+    cell: typing.Tuple[int, int]  # room grid cell, the level is paged in by the cells of its rooms
 
-    _floor_tiles: typing.List[typing.List[arcade.Sprite]]
-    _additional_floor_tiles: typing.List[arcade.Sprite]
+    _floor_tiles: typing.List[typing.List[TileRecord]]
+    _additional_floor_tiles: typing.List[TileRecord]
 
-    _back_wall_tiles: typing.List[arcade.Sprite]
-    _side_wall_tiles: typing.List[arcade.Sprite]
+    _back_wall_tiles: typing.List[TileRecord]
+    _side_wall_tiles: typing.List[TileRecord]
 
-    chests: typing.List[Chest]
-    mobs: typing.List[HostileMob]
+    chests: typing.List[ChestSpawn]
+    mobs: typing.List[MobSpawn]
 
-    _scale: float
+    tile_size: float
 
     def __init__(
         self,
@@ -58,50 +64,36 @@ class Room:
         size: int = 9,
         passage_size: int = 3,
         spawn_mobs: bool = True,
+        rng: typing.Optional[random.Random] = None,
+        origin: typing.Tuple[int, int] = (0, 0),
+        cell: typing.Tuple[int, int] = (0, 0),
     ) -> None:
         self.level = level
         self.size = size
         self.passage_size = passage_size
         self.connections = connections
         self.spawn_mobs = spawn_mobs
+        self.rng = rng or random.Random()
+        self.origin = origin
+        self.cell = cell
 
     def build(self) -> None:
         self._generate_floor()
         self._generate_walls()
 
-    def shift(self, delta_x: float, delta_y: float) -> None:
-        for tile_row in self._floor_tiles:
-            for tile in tile_row:
-                tile.center_x += delta_x
-                tile.center_y += delta_y
-
-        for tile in self._additional_floor_tiles:
-            tile.center_x += delta_x
-            tile.center_y += delta_y
-
-        for tile in self._back_wall_tiles:
-            tile.center_x += delta_x
-            tile.center_y += delta_y
-
-        for tile in self._side_wall_tiles:
-            tile.center_x += delta_x
-            tile.center_y += delta_y
-
-    def make_entry(self) -> Door:
+    def make_entry(self) -> DoorSpawn:
         self.spawn_mobs = False
         return self._generate_door(False)
 
-    def make_exit(self) -> Door:
+    def make_exit(self) -> DoorSpawn:
         return self._generate_door(True)
 
     def populate(self, hostile_mob_names: typing.List[str], max_mobs: int, max_chests: int) -> None:
-        from noname_dungeon_crawler.assets import asset_repository
-
         self.chests = []
         self.mobs = []
 
-        mob_type = random.choice(hostile_mob_names)
-        spawn_chests = random.uniform(0, 1) <= config.constants.ROOM_CHEST_CHANCE
+        mob_type = self.rng.choice(hostile_mob_names)
+        spawn_chests = self.rng.uniform(0, 1) <= config.constants.ROOM_CHEST_CHANCE
 
         populate_size = len(self._floor_tiles) - 2
         populate_cells = [(x + 1, y + 1) for x in range(populate_size) for y in range(populate_size)]
@@ -114,46 +106,48 @@ class Room:
             max_mobs = 0
 
         for cell in populate_cells:
-            if spawn_chests and chests_spawned < max_chests and random.uniform(0, 1) <= max_chests / num_populate:
-                chest = Chest(level=self.level)
-                chest.position = self._floor_tiles[cell[0]][cell[1]].position
-                self.chests.append(chest)
+            if spawn_chests and chests_spawned < max_chests and self.rng.uniform(0, 1) <= max_chests / num_populate:
+                self.chests.append(ChestSpawn(position=self._tile_position(*cell), level=self.level))
                 chests_spawned += 1
                 continue
 
-            if mobs_spawned < max_mobs and random.uniform(0, 1) <= max_mobs / num_populate:
-                mob = typing.cast(HostileMob, asset_repository.get_entity(mob_type))
-                mob.set_level(self.level)
-                mob.position = self._floor_tiles[cell[0]][cell[1]].position
-                self.mobs.append(mob)
+            if mobs_spawned < max_mobs and self.rng.uniform(0, 1) <= max_mobs / num_populate:
+                self.mobs.append(MobSpawn(name=mob_type, position=self._tile_position(*cell), level=self.level))
                 mobs_spawned += 1
 
     @property
-    def floor_sprites(self) -> typing.List[arcade.Sprite]:
-        flattened_tiles = [sprite for ax in self._floor_tiles for sprite in ax]
+    def floor_tiles(self) -> typing.List[TileRecord]:
+        flattened_tiles = [tile for ax in self._floor_tiles for tile in ax]
         flattened_tiles.extend(self._additional_floor_tiles)
 
         return flattened_tiles
 
     @property
-    def wall_sprites(self) -> typing.List[arcade.Sprite]:
+    def wall_tiles(self) -> typing.List[TileRecord]:
         return self._back_wall_tiles + self._side_wall_tiles
 
     @property
     def dim_px(self) -> float:
-        return self.size * self._floor_tiles[0][0].width
+        return self.size * self.tile_size
 
     @property
     def center(self) -> arcade.Point:
         center_idx = math.floor(len(self._floor_tiles) / 2)
-        return self._floor_tiles[center_idx][center_idx + 1].position
+        return self._tile_position(center_idx, center_idx + 1)
+
+    def _tile_position(self, x: int, y: int) -> arcade.Point:
+        return (self.origin[0] + x) * self.tile_size, (self.origin[1] + y) * self.tile_size
+
+    def _generate_door(self, is_exit: bool) -> DoorSpawn:
+        from noname_dungeon_crawler.assets import asset_repository
 
-    def _generate_door(self, is_exit: bool) -> Door:
-        door = Door(is_exit=is_exit, scale=1, level=self.level)  # type: ignore
-        door.scale = get_scale(door.texture, config.constants.TILE_SCALE)
+        door_texture = asset_repository.get_static_texture('doors_leaf_closed')
+        door_height = door_texture.height * get_scale(door_texture, config.constants.TILE_SCALE)
 
-        target_tile = self._floor_tiles[self.size // 2][self.size - 1]
-        door.position = (target_tile.center_x, target_tile.center_y + door.height)
+        target_x, target_y = self._tile_position(self.size // 2, self.size - 1)
+        door = DoorSpawn(
+            is_exit=is_exit, position=(target_x, target_y + door_height), level=self.level, cell=self.cell
+        )
 
         central_wall = self._back_wall_tiles[self.size + 3]  # A small hack for doors
         self._back_wall_tiles.remove(central_wall)
@@ -165,38 +159,36 @@ class Room:
 
         self._additional_floor_tiles = []
 
-        tiles: typing.List[typing.List[typing.Optional[arcade.Sprite]]] = [
-            [None for _y in range(self.size)] for _x in range(self.size)
-        ]
-
-        floor_textures = [asset_repository.get_static_texture(texture_name) for texture_name in _FLOOR_TEXTURES]
-        self.scale = get_scale(floor_textures[0], config.constants.TILE_SCALE)
-
-        for x in range(len(tiles)):
-            for y in range(len(tiles[x])):
-                texture_idx = random.randint(0, len(floor_textures) - 1)
-                tiles[x][y] = arcade.Sprite(texture=floor_textures[texture_idx], scale=self.scale)
-
-        tiles = typing.cast(typing.List[typing.List[arcade.Sprite]], tiles)
-
-        tile_size = tiles[0][0].width
+        floor_texture = asset_repository.get_static_texture(_FLOOR_TEXTURES[0])
+        self.tile_size = floor_texture.width * get_scale(floor_texture, config.constants.TILE_SCALE)
 
-        for x in range(len(tiles)):
-            for y in range(len(tiles[x])):
-                tiles[x][y].center_x = x * tile_size
-                tiles[x][y].center_y = y * tile_size
+        origin_column, origin_row = self.origin
 
-        self._floor_tiles = tiles
+        # Tiles are created directly at their world positions, no shifting is needed afterwards
+        self._floor_tiles = [
+            [
+                TileRecord(
+                    texture=_FLOOR_TEXTURES[self.rng.randint(0, len(_FLOOR_TEXTURES) - 1)],
+                    column=origin_column + x,
+                    row=origin_row + y,
+                    cell=self.cell,
+                )
+                for y in range(self.size)
+            ]
+            for x in range(self.size)
+        ]
 
         if RoomConnection.TOP in self.connections:
             for tile_idx in range(*self._passage_idx_range):
-                texture_idx = random.randint(0, len(floor_textures) - 1)
-                tile = arcade.Sprite(texture=floor_textures[texture_idx], scale=self.scale)
-                tile.set_position(
-                    center_x=self._floor_tiles[tile_idx - 1][self.size - 1].center_x + tile_size,
-                    center_y=self._floor_tiles[tile_idx - 1][self.size - 1].center_y + tile_size,
+                texture_idx = self.rng.randint(0, len(_FLOOR_TEXTURES) - 1)
+                self._additional_floor_tiles.append(
+                    TileRecord(
+                        texture=_FLOOR_TEXTURES[texture_idx],
+                        column=self._floor_tiles[tile_idx - 1][self.size - 1].column + 1,
+                        row=self._floor_tiles[tile_idx - 1][self.size - 1].row + 1,
+                        cell=self.cell,
+                    )
                 )
-                self._additional_floor_tiles.append(tile)
 
     def _generate_walls(self) -> None:
         self._back_wall_tiles = []
@@ -206,42 +198,39 @@ class Room:
         self._generate_side_walls()
 
     def _generate_back_wall(self) -> None:
-        from noname_dungeon_crawler.assets import asset_repository
-
         max_tile_idx = self.size - 1
-        tile_size = self._floor_tiles[0][0].width
 
-        back_walls: typing.List[arcade.Sprite] = []
+        back_walls: typing.List[TileRecord] = []
 
-        back_wall_texture_left = (
-            asset_repository.get_static_texture('wall_mid')
-            if RoomConnection.LEFT in self.connections
-            else asset_repository.get_static_texture('wall_corner_left')
-        )
-        back_wall_texture_mid = asset_repository.get_static_texture('wall_mid')
-        back_wall_texture_right = asset_repository.get_static_texture('wall_corner_right')
+        back_wall_texture_left = 'wall_mid' if RoomConnection.LEFT in self.connections else 'wall_corner_left'
+        back_wall_texture_mid = 'wall_mid'
+        back_wall_texture_right = 'wall_corner_right'
 
-        back_wall_left = arcade.Sprite(texture=back_wall_texture_left, scale=self.scale)
-        back_wall_left.set_position(
-            self._floor_tiles[0][max_tile_idx].center_x, self._floor_tiles[0][max_tile_idx].center_y + tile_size
+        back_wall_left = TileRecord(
+            texture=back_wall_texture_left,
+            column=self._floor_tiles[0][max_tile_idx].column,
+            row=self._floor_tiles[0][max_tile_idx].row + 1,
+            cell=self.cell,
         )
-        top_left_corner = arcade.Sprite(
-            texture=asset_repository.get_static_texture('wall_corner_top_left'), scale=self.scale
+        top_left_corner = TileRecord(
+            texture='wall_corner_top_left',
+            column=back_wall_left.column,
+            row=back_wall_left.row + 1,
+            cell=self.cell,
         )
-        top_left_corner.set_position(back_wall_left.center_x, back_wall_left.center_y + tile_size)
         back_walls.extend((back_wall_left, top_left_corner))
 
-        back_wall_right = arcade.Sprite(texture=back_wall_texture_right, scale=self.scale)
-        back_wall_right.set_position(
-            self._floor_tiles[max_tile_idx][max_tile_idx].center_x,
-            self._floor_tiles[max_tile_idx][max_tile_idx].center_y + tile_size,
-        )
-        top_right_corner = arcade.Sprite(
-            texture=asset_repository.get_static_texture('wall_corner_top_right'), scale=self.scale
+        back_wall_right = TileRecord(
+            texture=back_wall_texture_right,
+            column=self._floor_tiles[max_tile_idx][max_tile_idx].column,
+            row=self._floor_tiles[max_tile_idx][max_tile_idx].row + 1,
+            cell=self.cell,
         )
-        top_right_corner.set_position(
-            back_wall_right.center_x,
-            back_wall_right.center_y + tile_size,
+        top_right_corner = TileRecord(
+            texture='wall_corner_top_right',
+            column=back_wall_right.column,
+            row=back_wall_right.row + 1,
+            cell=self.cell,
         )
         back_walls.extend((back_wall_right, top_right_corner))
 
@@ -250,65 +239,61 @@ class Room:
                 continue
 
             texture = (
-                asset_repository.get_static_texture(random.choice(_SPECIAL_WALL_TEXTURES))
-                if random.uniform(0, 1) <= 0.35
-                else back_wall_texture_mid
+                self.rng.choice(_SPECIAL_WALL_TEXTURES) if self.rng.uniform(0, 1) <= 0.35 else back_wall_texture_mid
             )
 
-            back_wall_mid = arcade.Sprite(texture=texture, scale=self.scale)
-            back_wall_mid.set_position(
-                self._floor_tiles[wall_idx][max_tile_idx].center_x,
-                self._floor_tiles[wall_idx][max_tile_idx].center_y + tile_size,
+            back_wall_mid = TileRecord(
+                texture=texture,
+                column=self._floor_tiles[wall_idx][max_tile_idx].column,
+                row=self._floor_tiles[wall_idx][max_tile_idx].row + 1,
+                cell=self.cell,
             )
             back_walls.append(back_wall_mid)
-            top_mid_wall = arcade.Sprite(texture=asset_repository.get_static_texture('wall_top_mid'), scale=self.scale)
-            top_mid_wall.set_position(
-                back_wall_mid.center_x,
-                back_wall_mid.center_y + tile_size,
+            top_mid_wall = TileRecord(
+                texture='wall_top_mid', column=back_wall_mid.column, row=back_wall_mid.row + 1, cell=self.cell
             )
             back_walls.append(top_mid_wall)
 
         self._back_wall_tiles.extend(back_walls)
 
     def _generate_side_walls(self) -> None:
-        from noname_dungeon_crawler.assets import asset_repository
-
         max_tile_idx = self.size - 1
 
         # Bottom wall
         if RoomConnection.BOTTOM not in self.connections:
             max_tile_idx = self.size - 1
 
-            bottom_walls: typing.List[arcade.Sprite] = []
+            bottom_walls: typing.List[TileRecord] = []
             for wall_idx in range(0, max_tile_idx + 1):
-                wall = arcade.Sprite(texture=asset_repository.get_static_texture('wall_top_mid'), scale=self.scale)
-                wall.set_position(self._floor_tiles[wall_idx][0].center_x, self._floor_tiles[wall_idx][0].center_y)
-                bottom_walls.append(wall)
+                floor_tile = self._floor_tiles[wall_idx][0]
+                bottom_walls.append(
+                    TileRecord(texture='wall_top_mid', column=floor_tile.column, row=floor_tile.row, cell=self.cell)
+                )
 
             self._side_wall_tiles.extend(bottom_walls)
 
         # Right wall
-        right_walls: typing.List[arcade.Sprite] = []
+        right_walls: typing.List[TileRecord] = []
         for wall_idx in range(0, max_tile_idx + 1):
             if RoomConnection.RIGHT in self.connections and wall_idx in range(*self._passage_idx_range):
                 continue
 
-            wall = arcade.Sprite(texture=asset_repository.get_static_texture('wall_side_mid_left'), scale=self.scale)
-            wall.set_position(
-                self._floor_tiles[max_tile_idx][wall_idx].center_x, self._floor_tiles[max_tile_idx][wall_idx].center_y
+            floor_tile = self._floor_tiles[max_tile_idx][wall_idx]
+            right_walls.append(
+                TileRecord(texture='wall_side_mid_left', column=floor_tile.column, row=floor_tile.row, cell=self.cell)
             )
-            right_walls.append(wall)
         self._side_wall_tiles.extend(right_walls)
 
         # Left wall
         if RoomConnection.LEFT not in self.connections:
-            left_walls: typing.List[arcade.Sprite] = []
+            left_walls: typing.List[TileRecord] = []
             for wall_idx in range(0, max_tile_idx + 1):
-                wall = arcade.Sprite(
-                    texture=asset_repository.get_static_texture('wall_side_mid_right'), scale=self.scale
+                floor_tile = self._floor_tiles[0][wall_idx]
+                left_walls.append(
+                    TileRecord(
+                        texture='wall_side_mid_right', column=floor_tile.column, row=floor_tile.row, cell=self.cell
+                    )
                 )
-                wall.set_position(self._floor_tiles[0][wall_idx].center_x, self._floor_tiles[0][wall_idx].center_y)
-                left_walls.append(wall)
             self._side_wall_tiles.extend(left_walls)
 
     @property
@@ -0,0 +1,117 @@
+import collections
+import typing
+
+from .room import Room, RoomConnection
+
+
+Cell = typing.Tuple[int, int]
+
+_CONNECTION_OFFSETS = {
+    RoomConnection.TOP: (0, 1),
+    RoomConnection.RIGHT: (1, 0),
+    RoomConnection.BOTTOM: (0, -1),
+    RoomConnection.LEFT: (-1, 0),
+}
+
+
+class RoomGraph:
+    """
+    Граф смежности комнат (по проходам между ними), расстояния считаются в переходах между комнатами
+    """
+    adjacency: typing.Dict[Cell, typing.List[Cell]]
+
+    def __init__(self, adjacency: typing.Dict[Cell, typing.List[Cell]]) -> None:
+        self.adjacency = adjacency
+
+    @classmethod
+    def from_rooms(cls, rooms: typing.Dict[Cell, Room]) -> 'RoomGraph':
+        return cls.from_connections({cell: room.connections for cell, room in rooms.items()})
+
+    @classmethod
+    def from_connections(cls, connections: typing.Dict[Cell, typing.Set[RoomConnection]]) -> 'RoomGraph':
+        adjacency: typing.Dict[Cell, typing.List[Cell]] = {}
+
+        for (x, y), room_connections in connections.items():
+            neighbors = []
+            for connection in RoomConnection:  # Stable order, independent of set iteration
+                if connection not in room_connections:
+                    continue
+
+                dx, dy = _CONNECTION_OFFSETS[connection]
+                if (x + dx, y + dy) in connections:
+                    neighbors.append((x + dx, y + dy))
+
+            adjacency[(x, y)] = neighbors
+
+        return cls(adjacency)
+
+    @classmethod
+    def from_connection_masks(cls, masks: typing.Dict[Cell, int]) -> 'RoomGraph':
+        return cls.from_connections(
+            {
+                cell: {connection for connection in RoomConnection if mask & (1 << connection.value)}
+                for cell, mask in masks.items()
+            }
+        )
+
+    def connection_mask(self, cell: Cell) -> int:
+        """
+        Битовая маска проходов комнаты (бит = RoomConnection.value)
+        """
+        mask = 0
+        for connection, (dx, dy) in _CONNECTION_OFFSETS.items():
+            if (cell[0] + dx, cell[1] + dy) in self.adjacency[cell]:
+                mask |= 1 << connection.value
+
+        return mask
+
+    def __len__(self) -> int:
+        return len(self.adjacency)
+
+    def __contains__(self, cell: object) -> bool:
+        return cell in self.adjacency
+
+    def neighbors(self, cell: Cell) -> typing.List[Cell]:
+        return self.adjacency.get(cell, [])
+
+    def distances_from(self, source: Cell) -> typing.Dict[Cell, int]:
+        """
+        BFS: количество переходов между комнатами от исходной комнаты до всех достижимых
+        """
+        distances = {source: 0}
+        queue = collections.deque([source])
+
+        while queue:
+            cell = queue.popleft()
+            distance = distances[cell] + 1
+
+            for neighbor in self.adjacency[cell]:
+                if neighbor not in distances:
+                    distances[neighbor] = distance
+                    queue.append(neighbor)
+
+        return distances
+
+    def farthest_pair(self, candidates: typing.Sequence[Cell]) -> typing.Tuple[Cell, Cell, int]:
+        """
+        Двойной проход BFS: самая дальняя от произвольной кандидатки комната, затем самая дальняя от неё.
+        Линейное время, расстояние считается по реальному пути через проходы
+        """
+        if not candidates:
+            raise ValueError("No candidate rooms to choose from")
+
+        first = self._farthest(candidates[0], candidates)[0]
+        second, distance = self._farthest(first, candidates)
+
+        return first, second, distance
+
+    def _farthest(self, source: Cell, candidates: typing.Sequence[Cell]) -> typing.Tuple[Cell, int]:
+        distances = self.distances_from(source)
+
+        farthest, max_distance = source, 0
+        for candidate in candidates:
+            distance = distances.get(candidate, -1)
+            if distance > max_distance:
+                farthest, max_distance = candidate, distance
+
+        return farthest, max_distance
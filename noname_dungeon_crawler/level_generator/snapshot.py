@@ -0,0 +1,250 @@
+import array
+import mmap
+import pathlib
+import struct
+import sys
+import typing
+
+from noname_dungeon_crawler.physics import CollisionGrid
+
+from .blueprint import ChestSpawn, DoorSpawn, LevelBlueprint, MobSpawn
+from .room_graph import RoomGraph
+from .tile_layer import StaticTileLayer
+
+
+SNAPSHOT_MAGIC = b'NDCL'
+SNAPSHOT_VERSION = 4
+SNAPSHOT_EXTENSION = 'ndcl'
+
+# Layout (little-endian): header, section table, then every section as a dense array aligned to 8 bytes,
+# so the whole file can be memory-mapped and each section read with a single copy
+# magic, version, level, tile size, start x, start y, section count, room size
+_HEADER = struct.Struct('<4sHxxIdddHH4x')
+_SECTION = struct.Struct('<4scxxxIQ')  # tag, typecode, element count, offset
+_ALIGNMENT = 8
+
+
+class SnapshotError(Exception):
+    pass
+
+
+class _StringTable:
+    strings: typing.List[str]
+    _index: typing.Dict[str, int]
+
+    def __init__(self) -> None:
+        self.strings = []
+        self._index = {}
+
+    def get_id(self, string: str) -> int:
+        if string not in self._index:
+            self._index[string] = len(self.strings)
+            self.strings.append(string)
+
+        return self._index[string]
+
+    def encode(self) -> array.array:
+        return array.array('B', '\0'.join(self.strings).encode('utf-8'))
+
+
+def save_snapshot(blueprint: LevelBlueprint, path: pathlib.Path) -> None:
+    """
+    Запись плана уровня в компактный бинарный снимок
+    """
+    strings = _StringTable()
+    sections: typing.Dict[bytes, array.array] = {}
+
+    for tag, layer in ((b'F', blueprint.floor), (b'W', blueprint.walls)):
+        sections[tag + b'NAM'] = array.array('H', [strings.get_id(name) for name in layer.texture_names])
+        sections[tag + b'TEX'] = array.array('H', layer.texture_ids)
+        sections[tag + b'COL'] = array.array('i', layer.columns)
+        sections[tag + b'ROW'] = array.array('i', layer.rows)
+        sections[tag + b'CCL'] = array.array('i', layer.cell_columns)
+        sections[tag + b'CRW'] = array.array('i', layer.cell_rows)
+
+    grid = blueprint.collision_grid
+    sections[b'GDIM'] = array.array('i', [*grid.origin, grid.width, grid.height])
+    sections[b'GCEL'] = array.array('H', grid.cells)
+    sections[b'GSHP'] = array.array('H', [len(shape) for shape in grid.shapes])
+    sections[b'GBOX'] = array.array('d', [coord for shape in grid.shapes for box in shape for coord in box])
+
+    cells = list(blueprint.room_graph.adjacency)
+    sections[b'RCEL'] = array.array('i', [coord for cell in cells for coord in cell])
+    sections[b'RMSK'] = array.array('B', [blueprint.room_graph.connection_mask(cell) for cell in cells])
+
+    sections[b'MNAM'] = array.array('H', [strings.get_id(mob.name) for mob in blueprint.mobs])
+    sections[b'MPOS'] = array.array('d', [coord for mob in blueprint.mobs for coord in mob.position])
+    sections[b'MLVL'] = array.array('H', [mob.level for mob in blueprint.mobs])
+
+    sections[b'CPOS'] = array.array('d', [coord for chest in blueprint.chests for coord in chest.position])
+    sections[b'CLVL'] = array.array('H', [chest.level for chest in blueprint.chests])
+
+    sections[b'DEXT'] = array.array('B', [door.is_exit for door in blueprint.doors])
+    sections[b'DPOS'] = array.array('d', [coord for door in blueprint.doors for coord in door.position])
+    sections[b'DLVL'] = array.array('H', [door.level for door in blueprint.doors])
+    sections[b'DCEL'] = array.array('i', [coord for door in blueprint.doors for coord in door.cell])
+
+    sections[b'STRS'] = strings.encode()
+
+    offset = _align(_HEADER.size + _SECTION.size * len(sections))
+    section_table = bytearray()
+    payload = bytearray()
+
+    for tag, data in sections.items():
+        section_table += _SECTION.pack(tag, data.typecode.encode('ascii'), len(data), offset + len(payload))
+
+        if sys.byteorder != 'little':
+            data = array.array(data.typecode, data)
+            data.byteswap()
+
+        payload += data.tobytes()
+        payload += bytes(_align(len(payload)) - len(payload))
+
+    header = _HEADER.pack(
+        SNAPSHOT_MAGIC,
+        SNAPSHOT_VERSION,
+        blueprint.level,
+        blueprint.tile_size,
+        blueprint.starting_coords[0],
+        blueprint.starting_coords[1],
+        len(sections),
+        blueprint.room_size,
+    )
+
+    with open(path, 'wb') as snapshot_file:
+        snapshot_file.write(header)
+        snapshot_file.write(section_table)
+        snapshot_file.write(bytes(offset - len(header) - len(section_table)))
+        snapshot_file.write(payload)
+
+
+def load_snapshot(path: pathlib.Path) -> LevelBlueprint:
+    """
+    Загрузка плана уровня из снимка (без повторной генерации)
+    """
+    with open(path, 'rb') as snapshot_file:
+        try:
+            snapshot = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:  # An empty file cannot be mapped
+            raise SnapshotError("Snapshot is empty") from e
+
+        with snapshot:
+            try:
+                return _read_snapshot(snapshot)
+            except KeyError as e:
+                raise SnapshotError(f"Snapshot has no section {e.args[0]!r}") from e
+            except (IndexError, ValueError, struct.error) as e:
+                raise SnapshotError(f"Snapshot is malformed: {e}") from e
+
+
+def _read_snapshot(snapshot: mmap.mmap) -> LevelBlueprint:
+    if len(snapshot) < _HEADER.size:
+        raise SnapshotError("Snapshot is truncated")
+
+    magic, version, level, tile_size, start_x, start_y, section_count, room_size = _HEADER.unpack_from(snapshot, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError("Not a level snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version: {version}")
+
+    sections: typing.Dict[bytes, array.array] = {}
+    for section_idx in range(section_count):
+        tag, typecode, count, offset = _SECTION.unpack_from(snapshot, _HEADER.size + _SECTION.size * section_idx)
+
+        data = array.array(typecode.decode('ascii'))
+        end = offset + count * data.itemsize
+        if end > len(snapshot):
+            raise SnapshotError(f"Section {tag!r} is out of bounds")
+
+        with memoryview(snapshot) as view:
+            data.frombytes(view[offset:end])
+        if sys.byteorder != 'little':
+            data.byteswap()
+
+        sections[tag] = data
+
+    strings = sections[b'STRS'].tobytes().decode('utf-8').split('\0')
+
+    floor, walls = (
+        StaticTileLayer.from_arrays(
+            name,
+            tile_size,
+            [strings[string_id] for string_id in sections[tag + b'NAM']],
+            sections[tag + b'TEX'],
+            sections[tag + b'COL'],
+            sections[tag + b'ROW'],
+            sections[tag + b'CCL'],
+            sections[tag + b'CRW'],
+        )
+        for name, tag in (('floor', b'F'), ('walls', b'W'))
+    )
+
+    collision_grid = _read_collision_grid(tile_size, sections)
+
+    cell_coords = sections[b'RCEL']
+    room_graph = RoomGraph.from_connection_masks(
+        {
+            (cell_coords[idx * 2], cell_coords[idx * 2 + 1]): mask
+            for idx, mask in enumerate(sections[b'RMSK'])
+        }
+    )
+
+    mob_positions = sections[b'MPOS']
+    mobs = [
+        MobSpawn(name=strings[name_id], position=(mob_positions[idx * 2], mob_positions[idx * 2 + 1]), level=mob_level)
+        for idx, (name_id, mob_level) in enumerate(zip(sections[b'MNAM'], sections[b'MLVL']))
+    ]
+
+    chest_positions = sections[b'CPOS']
+    chests = [
+        ChestSpawn(position=(chest_positions[idx * 2], chest_positions[idx * 2 + 1]), level=chest_level)
+        for idx, chest_level in enumerate(sections[b'CLVL'])
+    ]
+
+    door_positions = sections[b'DPOS']
+    door_cells = sections[b'DCEL']
+    doors = [
+        DoorSpawn(
+            is_exit=bool(is_exit),
+            position=(door_positions[idx * 2], door_positions[idx * 2 + 1]),
+            level=door_level,
+            cell=(door_cells[idx * 2], door_cells[idx * 2 + 1]),
+        )
+        for idx, (is_exit, door_level) in enumerate(zip(sections[b'DEXT'], sections[b'DLVL']))
+    ]
+
+    return LevelBlueprint(
+        level=level,
+        tile_size=tile_size,
+        room_size=room_size,
+        floor=floor,
+        walls=walls,
+        collision_grid=collision_grid,
+        flow_field=floor.build_flow_field(collision_grid),
+        mobs=mobs,
+        chests=chests,
+        doors=doors,
+        room_graph=room_graph,
+        starting_coords=(start_x, start_y),
+    )
+
+
+def _read_collision_grid(tile_size: float, sections: typing.Dict[bytes, array.array]) -> CollisionGrid:
+    origin_column, origin_row, width, height = sections[b'GDIM']
+    if len(sections[b'GCEL']) != width * height:
+        raise SnapshotError("Collision grid size does not match its dimensions")
+
+    boxes = sections[b'GBOX']
+    shapes = []
+    box_idx = 0
+    for box_count in sections[b'GSHP']:
+        shapes.append(tuple(tuple(boxes[idx * 4:idx * 4 + 4]) for idx in range(box_idx, box_idx + box_count)))
+        box_idx += box_count
+
+    return CollisionGrid(
+        tile_size, (origin_column, origin_row), width, height, cells=sections[b'GCEL'], shapes=shapes  # type: ignore
+    )
+
+
+def _align(size: int) -> int:
+    return (size + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
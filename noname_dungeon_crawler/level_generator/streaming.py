@@ -0,0 +1,261 @@
+import typing
+
+import arcade
+import attr
+
+from noname_dungeon_crawler.settings import config
+from noname_dungeon_crawler.sprites import EntityState, HostileMob, sprite_pools
+from noname_dungeon_crawler.util import pts_to_px
+
+from .blueprint import LevelBlueprint
+from .builder import _LevelDump
+from .room_graph import Cell
+from .tile_layer import StaticTileLayer
+
+
+if typing.TYPE_CHECKING:
+    from noname_dungeon_crawler.scenes import GameplayScene
+    from noname_dungeon_crawler.sprites import Entity
+
+
+_DYNAMIC_LISTS = ('mobs', 'chests', 'doors')  # scene lists paged per room, all of them are also impassable
+_STATIC_LISTS = ('floor', 'walls')  # baked layers, chunk sprites are paged by the rooms their tiles belong to
+
+# Pending timers still refer to entities in these states, such entities are not reused
+_TRANSIENT_STATES = (EntityState.ATTACKING, EntityState.ATTACKED, EntityState.DYING, EntityState.OPENING)
+
+
+@attr.s(kw_only=True, auto_attribs=True)
+class MobActivity:
+    awake: int  # updated, animated and physics-stepped
+    sleeping: int  # in an active room, drawn and blocking, but not updated
+    paged_out: int  # in rooms outside of the streaming radius
+
+
+class _RoomChunk:
+    """
+    Содержимое одной ячейки сетки комнат. Списки только хранят спрайты и никогда не рисуются:
+    спрайт, удалённый из всех списков (например, убитый моб), пропадает и отсюда
+    """
+    sprite_lists: typing.Dict[str, arcade.SpriteList]
+
+    def __init__(self) -> None:
+        self.sprite_lists = {name: arcade.SpriteList(use_spatial_hash=False, lazy=True) for name in _DYNAMIC_LISTS}
+
+
+class RoomChunkManager:
+    """
+    Подгрузка содержимого уровня по ячейкам сетки комнат: в активных списках сцены (отрисовка, обновление,
+    коллизии) находятся только комнаты в заданном радиусе от игрока, состояние выгруженных комнат сохраняется.
+    Мобы активных комнат вдали от игрока спят: не обновляются, не анимируются и не участвуют в физике
+    """
+    scene: 'GameplayScene'
+    blueprint: LevelBlueprint
+    radius: int  # in rooms, Chebyshev distance
+
+    active_cells: typing.Set[Cell]
+
+    _chunks: typing.Dict[Cell, _RoomChunk]
+    _mob_cells: typing.Dict[arcade.Sprite, Cell]
+    _static_sprites: typing.Dict[str, typing.List[typing.Tuple[arcade.Sprite, Cell, Cell]]]  # sprite, min/max cell
+    _center: typing.Optional[Cell]
+    _since_activity_check: float
+
+    def __init__(
+        self,
+        scene: 'GameplayScene',
+        blueprint: LevelBlueprint,
+        level: _LevelDump,
+        radius: typing.Optional[int] = None,
+    ) -> None:
+        self.scene = scene
+        self.blueprint = blueprint
+        self.radius = config.constants.STREAMING_RADIUS if radius is None else radius
+
+        self.active_cells = set()
+
+        self._chunks = {}
+        self._mob_cells = {}
+        self._static_sprites = {}
+        self._center = None
+        self._since_activity_check = 0.0
+
+        for mob in level.mobs:
+            self._mob_cells[mob] = self._store('mobs', mob)
+        for chest in level.chests:
+            self._store('chests', chest)
+
+        # Doors stand on the back wall, above their room's cell, so they go by the room that placed them.
+        # The builder creates door sprites in the order of the blueprint
+        for door, door_spawn in zip(level.doors, blueprint.doors):
+            self._store('doors', door, door_spawn.cell)
+
+        for name in _STATIC_LISTS:
+            # Baked sprites come in the order of the layer's chunks
+            sprite_list: arcade.SpriteList = getattr(level, name)
+            layer: StaticTileLayer = getattr(blueprint, name)
+            self._static_sprites[name] = [
+                (sprite, chunk.min_cell, chunk.max_cell) for sprite, chunk in zip(sprite_list, layer.compose_chunks())
+            ]
+            sprite_list.clear()
+
+    def update(self, position: arcade.Point, delta_time: float = 0.0) -> None:
+        """
+        Вызывается каждый кадр: переносит ушедших мобов между комнатами, если игрок сменил ячейку,
+        подгружает и выгружает комнаты, и периодически усыпляет и будит мобов
+        """
+        self._rehome_mobs()
+        self._since_activity_check += delta_time
+
+        center = self.blueprint.cell_at(*position)
+        if center != self._center:
+            self._center = center
+            self._update_active_cells()
+        elif self._since_activity_check < config.constants.MOB_ACTIVITY_CHECK_INTERVAL:
+            return
+
+        self._update_activity(position)
+
+    @property
+    def mob_activity(self) -> MobActivity:
+        mobs = typing.cast(typing.List[HostileMob], list(self.scene.get_sprite_list('mobs')))
+        sleeping = sum(mob.asleep for mob in mobs)
+
+        return MobActivity(
+            awake=len(mobs) - sleeping,
+            sleeping=sleeping,
+            paged_out=sum(
+                len(chunk.sprite_lists['mobs']) for cell, chunk in self._chunks.items() if cell not in self.active_cells
+            ),
+        )
+
+    def release_sprites(self) -> None:
+        """
+        Возврат спрайтов всех комнат в пулы при смене уровня
+        """
+        for chunk in self._chunks.values():
+            for name, sprite_list in chunk.sprite_lists.items():
+                for sprite in list(sprite_list):
+                    if getattr(sprite, 'state', None) in _TRANSIENT_STATES:
+                        continue
+
+                    sprite_pools.release(sprite)
+
+        self._chunks.clear()
+        self._mob_cells.clear()
+        self.active_cells = set()
+
+    def _store(self, name: str, sprite: arcade.Sprite, cell: typing.Optional[Cell] = None) -> Cell:
+        if cell is None:
+            cell = self.blueprint.cell_at(*sprite.position)
+        if cell not in self._chunks:
+            self._chunks[cell] = _RoomChunk()
+
+        self._chunks[cell].sprite_lists[name].append(sprite)
+        return cell
+
+    def _update_active_cells(self) -> None:
+        cx, cy = typing.cast(Cell, self._center)
+        active_cells = {
+            (x, y)
+            for x in range(cx - self.radius, cx + self.radius + 1)
+            for y in range(cy - self.radius, cy + self.radius + 1)
+            if (x, y) in self._chunks
+        }
+
+        for cell in self.active_cells - active_cells:
+            self._page_out(self._chunks[cell])
+        for cell in active_cells - self.active_cells:
+            self._page_in(self._chunks[cell])
+
+        self.active_cells = active_cells
+        self._update_static_layers()
+
+    def _update_activity(self, position: arcade.Point) -> None:
+        """
+        Пробуждение мобов в комнате игрока и рядом с ним, усыпление дальних (только среди подгруженных комнат)
+        """
+        self._since_activity_check = 0.0
+
+        x, y = position
+        wake_range = pts_to_px(config.constants.MOB_WAKE_RANGE)
+        sleep_range = pts_to_px(config.constants.MOB_SLEEP_RANGE)
+
+        for mob in typing.cast(typing.List[HostileMob], self.scene.get_sprite_list('mobs')):
+            distance = max(abs(mob.center_x - x), abs(mob.center_y - y))
+            in_player_room = self._mob_cells.get(mob) == self._center
+
+            if mob.asleep:
+                if in_player_room or distance <= wake_range:
+                    self._wake(mob)
+            elif not in_player_room and distance > sleep_range and mob.can_sleep():
+                self._sleep(mob)
+
+    def _wake(self, mob: HostileMob) -> None:
+        mob.asleep = False
+        self.scene.add_physics_engine(mob)
+
+    def _sleep(self, mob: HostileMob) -> None:
+        mob.asleep = True
+        mob.movement_vector = [0, 0]
+        mob.change_x = 0
+        mob.change_y = 0
+        self.scene.remove_physics_engine(mob)
+
+    def _rehome_mobs(self) -> None:
+        # Only awake mobs move, so only they can wander into another room
+        for mob in list(typing.cast(typing.List[HostileMob], self.scene.get_sprite_list('mobs'))):
+            if mob.asleep:
+                continue
+
+            cell = self.blueprint.cell_at(*mob.position)
+            if cell == self._mob_cells.get(mob):
+                continue
+
+            self._chunks[self._mob_cells[mob]].sprite_lists['mobs'].remove(mob)
+            self._mob_cells[mob] = self._store('mobs', mob)
+
+            if cell not in self.active_cells:  # Dragged outside of the active area, it is paged in with its room
+                self._page_out_sprite('mobs', mob)
+
+    def _page_in(self, chunk: _RoomChunk) -> None:
+        impassable = self.scene.get_sprite_list('impassable')
+
+        for name in _DYNAMIC_LISTS:
+            for sprite in chunk.sprite_lists[name]:
+                self.scene.get_sprite_list(name).append(sprite)
+                impassable.append(sprite)
+
+        # Mobs come in asleep, the activity pass wakes them once all obstacles around them are in place
+        for mob in typing.cast(typing.List[HostileMob], chunk.sprite_lists['mobs']):
+            mob.asleep = True
+
+    def _page_out(self, chunk: _RoomChunk) -> None:
+        for name in _DYNAMIC_LISTS:
+            for sprite in chunk.sprite_lists[name]:
+                self._page_out_sprite(name, sprite)
+
+    def _page_out_sprite(self, name: str, sprite: arcade.Sprite) -> None:
+        for sprite_list in (self.scene.get_sprite_list(name), self.scene.get_sprite_list('impassable')):
+            if sprite_list in sprite.sprite_lists:
+                sprite_list.remove(sprite)
+
+        if name == 'mobs':
+            self.scene.remove_physics_engine(typing.cast('Entity', sprite))
+
+    def _update_static_layers(self) -> None:
+        cx, cy = typing.cast(Cell, self._center)
+
+        for name, sprites in self._static_sprites.items():
+            sprite_list = self.scene.get_sprite_list(name)
+
+            for sprite, (min_x, min_y), (max_x, max_y) in sprites:
+                is_active = min_x - self.radius <= cx <= max_x + self.radius and (
+                    min_y - self.radius <= cy <= max_y + self.radius
+                )
+                is_listed = sprite_list in sprite.sprite_lists
+
+                if is_active and not is_listed:
+                    sprite_list.append(sprite)
+                elif is_listed and not is_active:
+                    sprite_list.remove(sprite)
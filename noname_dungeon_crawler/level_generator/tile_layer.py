@@ -0,0 +1,237 @@
+import array
+import typing
+
+import arcade
+import attr
+from PIL import Image
+
+from noname_dungeon_crawler.physics import CollisionGrid, FlowField
+from noname_dungeon_crawler.physics.collision_grid import Bounds
+from noname_dungeon_crawler.settings import config
+
+
+@attr.s(kw_only=True, auto_attribs=True, slots=True)
+class TileRecord:
+    texture: str
+    column: int
+    row: int
+    cell: typing.Tuple[int, int]  # room grid cell of the room the tile belongs to
+
+
+@attr.s(kw_only=True, auto_attribs=True)
+class _TileChunk:
+    name: str
+    image: Image.Image
+    tile_px: int
+
+    center_x: float
+    center_y: float
+
+    # Room cells of the chunk's tiles, the chunk is shown while any of these rooms is
+    min_cell: typing.Tuple[int, int]
+    max_cell: typing.Tuple[int, int]
+
+
+class StaticTileLayer:
+    """
+    Статичный слой тайлов: текстуры и позиции хранятся в компактных массивах,
+    а отрисовываются заранее собранными изображениями чанков (по одному спрайту на чанк)
+    """
+    name: str
+    tile_size: float
+    chunk_size: int  # in tiles
+
+    texture_names: typing.List[str]  # texture id -> texture name
+    texture_ids: array.array
+    columns: array.array
+    rows: array.array
+    cell_columns: array.array  # room grid cell of every tile
+    cell_rows: array.array
+
+    _texture_index: typing.Dict[str, int]
+    _chunks: typing.Optional[typing.List[_TileChunk]]
+
+    def __init__(self, name: str, tile_size: float, chunk_size: typing.Optional[int] = None) -> None:
+        self.name = name
+        self.tile_size = tile_size
+        self.chunk_size = chunk_size or config.constants.TILE_LAYER_CHUNK_SIZE
+
+        self.texture_names = []
+        self.texture_ids = array.array('H')
+        self.columns = array.array('i')
+        self.rows = array.array('i')
+        self.cell_columns = array.array('i')
+        self.cell_rows = array.array('i')
+
+        self._texture_index = {}
+        self._chunks = None
+
+    @classmethod
+    def from_arrays(
+        cls,
+        name: str,
+        tile_size: float,
+        texture_names: typing.List[str],
+        texture_ids: array.array,
+        columns: array.array,
+        rows: array.array,
+        cell_columns: array.array,
+        cell_rows: array.array,
+    ) -> 'StaticTileLayer':
+        layer = cls(name, tile_size)
+
+        layer.texture_names = list(texture_names)
+        layer.texture_ids = texture_ids
+        layer.columns = columns
+        layer.rows = rows
+        layer.cell_columns = cell_columns
+        layer.cell_rows = cell_rows
+        layer._texture_index = {texture_name: idx for idx, texture_name in enumerate(texture_names)}
+
+        return layer
+
+    def __len__(self) -> int:
+        return len(self.texture_ids)
+
+    def add(self, texture_name: str, column: int, row: int, cell: typing.Tuple[int, int]) -> None:
+        texture_id = self._texture_index.get(texture_name)
+        if texture_id is None:
+            texture_id = self._texture_index[texture_name] = len(self.texture_names)
+            self.texture_names.append(texture_name)
+
+        self.texture_ids.append(texture_id)
+        self.columns.append(column)
+        self.rows.append(row)
+        self.cell_columns.append(cell[0])
+        self.cell_rows.append(cell[1])
+
+        self._chunks = None
+
+    def extend(self, tiles: typing.Iterable[TileRecord]) -> None:
+        for tile in tiles:
+            self.add(tile.texture, tile.column, tile.row, tile.cell)
+
+    def positions(self) -> typing.Iterator[typing.Tuple[str, float, float]]:
+        for texture_name, column, row in self.cells():
+            yield texture_name, column * self.tile_size, row * self.tile_size
+
+    def cells(self) -> typing.Iterator[typing.Tuple[str, int, int]]:
+        for texture_id, column, row in zip(self.texture_ids, self.columns, self.rows):
+            yield self.texture_names[texture_id], column, row
+
+    def build_collision_grid(self) -> CollisionGrid:
+        """
+        Карта столкновений слоя по хит-боксам текстур тайлов (только CPU, можно вызывать из фонового потока)
+        """
+        return CollisionGrid.from_tiles(self.tile_size, self.cells(), _get_hit_box_bounds)
+
+    def build_flow_field(self, collision_grid: CollisionGrid) -> FlowField:
+        """
+        Поле путей мобов по тайлам слоя (пола) в обход стен (только CPU, можно вызывать из фонового потока)
+        """
+        return FlowField.from_tiles(
+            ((column, row) for _, column, row in self.cells()),
+            collision_grid,
+            config.constants.FLOW_FIELD_RADIUS,
+            config.constants.FLOW_FIELD_CLEARANCE,
+        )
+
+    def compose_chunks(self) -> typing.List[_TileChunk]:
+        """
+        Склейка тайлов в изображения чанков (только CPU, можно вызывать из фонового потока)
+        """
+        from noname_dungeon_crawler.assets import asset_repository
+
+        if self._chunks is not None:
+            return self._chunks
+
+        chunk_tiles: typing.Dict[typing.Tuple[int, int], typing.List[int]] = {}
+        for tile_idx, (column, row) in enumerate(zip(self.columns, self.rows)):
+            chunk_tiles.setdefault((column // self.chunk_size, row // self.chunk_size), []).append(tile_idx)
+
+        tile_images = [
+            asset_repository.get_static_texture(texture_name).image.convert('RGBA')
+            for texture_name in self.texture_names
+        ]
+        tile_px = tile_images[0].width if tile_images else 1
+
+        chunks: typing.List[_TileChunk] = []
+        for (chunk_x, chunk_y), tile_indices in chunk_tiles.items():
+            min_column = min(self.columns[idx] for idx in tile_indices)
+            max_column = max(self.columns[idx] for idx in tile_indices)
+            min_row = min(self.rows[idx] for idx in tile_indices)
+            max_row = max(self.rows[idx] for idx in tile_indices)
+
+            image = Image.new('RGBA', ((max_column - min_column + 1) * tile_px, (max_row - min_row + 1) * tile_px))
+
+            # Tiles are pasted in insertion order, so overlapping tiles keep the original draw order
+            for idx in tile_indices:
+                image.alpha_composite(
+                    tile_images[self.texture_ids[idx]],
+                    ((self.columns[idx] - min_column) * tile_px, (max_row - self.rows[idx]) * tile_px),
+                )
+
+            chunks.append(
+                _TileChunk(
+                    name=f'{self.name}_chunk_{chunk_x}_{chunk_y}',
+                    image=image,
+                    tile_px=tile_px,
+                    center_x=(min_column + max_column) / 2 * self.tile_size,
+                    center_y=(min_row + max_row) / 2 * self.tile_size,
+                    min_cell=(
+                        min(self.cell_columns[idx] for idx in tile_indices),
+                        min(self.cell_rows[idx] for idx in tile_indices),
+                    ),
+                    max_cell=(
+                        max(self.cell_columns[idx] for idx in tile_indices),
+                        max(self.cell_rows[idx] for idx in tile_indices),
+                    ),
+                )
+            )
+
+        self._chunks = chunks
+        return chunks
+
+    def bake(self) -> arcade.SpriteList:
+        """
+        Сборка слоя в список спрайтов с отдельным атласом (по одному спрайту на чанк)
+        """
+        chunks = self.compose_chunks()
+        if not chunks:
+            return arcade.SpriteList()
+
+        textures = [arcade.Texture(chunk.name, image=chunk.image, hit_box_algorithm='None') for chunk in chunks]
+
+        # A private atlas per layer: it is dropped together with the level and chunk names never collide
+        atlas = None if config.headless else arcade.TextureAtlas.create_from_texture_sequence(textures)
+        sprite_list = arcade.SpriteList(atlas=atlas)
+
+        for chunk, texture in zip(chunks, textures):
+            sprite_list.append(
+                arcade.Sprite(
+                    texture=texture,
+                    scale=self.tile_size / chunk.tile_px,
+                    center_x=chunk.center_x,
+                    center_y=chunk.center_y,
+                )
+            )
+
+        return sprite_list
+
+
+def _get_hit_box_bounds(texture_name: str) -> typing.Optional[Bounds]:
+    """
+    Описанный прямоугольник хит-бокса текстуры в долях ширины тайла, от центра тайла
+    """
+    from noname_dungeon_crawler.assets import asset_repository
+
+    texture = asset_repository.get_static_texture(texture_name)
+    points = texture.hit_box_points
+    if not points:
+        return None
+
+    # Tile sprites are scaled so the texture width matches the tile size
+    xs = [x / texture.width for x, _ in points]
+    ys = [y / texture.width for _, y in points]
+
+    return min(xs), min(ys), max(xs), max(ys)
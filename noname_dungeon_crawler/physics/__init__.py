@@ -0,0 +1,17 @@
+from .collision_grid import CollisionGrid
+from .contacts import ContactListener, ContactTracker
+from .flow_field import FlowField, FlowFieldMetrics
+from .queries import query_box, sweep
+from .world import PhysicsWorld
+
+
+__all__ = [
+    'CollisionGrid',
+    'ContactListener',
+    'ContactTracker',
+    'FlowField',
+    'FlowFieldMetrics',
+    'PhysicsWorld',
+    'query_box',
+    'sweep',
+]
@@ -0,0 +1,124 @@
+import array
+import math
+import typing
+
+
+Bounds = typing.Tuple[float, float, float, float]  # left, bottom, right, top
+
+
+class CollisionGrid:
+    """
+    Карта столкновений со статичными стенами по сетке тайлов уровня. В ячейке хранится номер формы -
+    набора прямоугольников внутри тайла (в долях размера тайла от его центра), 0 - проходимая ячейка
+    """
+    tile_size: float
+    origin: typing.Tuple[int, int]  # column and row of the first cell
+    width: int
+    height: int
+
+    cells: array.array  # shape id per cell, indexed column-major: (column - origin column) * height + row offset
+    shapes: typing.List[typing.Tuple[Bounds, ...]]
+
+    _shape_index: typing.Dict[typing.Tuple[Bounds, ...], int]
+
+    def __init__(
+        self,
+        tile_size: float,
+        origin: typing.Tuple[int, int],
+        width: int,
+        height: int,
+        cells: typing.Optional[array.array] = None,
+        shapes: typing.Optional[typing.List[typing.Tuple[Bounds, ...]]] = None,
+    ) -> None:
+        self.tile_size = tile_size
+        self.origin = origin
+        self.width = width
+        self.height = height
+
+        self.cells = cells if cells is not None else array.array('H', bytes(2 * width * height))
+        self.shapes = shapes if shapes is not None else [()]
+
+        self._shape_index = {shape: shape_id for shape_id, shape in enumerate(self.shapes)}
+
+    @classmethod
+    def from_tiles(
+        cls,
+        tile_size: float,
+        tiles: typing.Iterable[typing.Tuple[str, int, int]],
+        hit_box: typing.Callable[[str], typing.Optional[Bounds]],
+    ) -> 'CollisionGrid':
+        """
+        Сборка карты по тайлам (текстура, колонка, ряд); hit_box возвращает прямоугольник текстуры в долях тайла
+        """
+        tile_boxes: typing.Dict[typing.Tuple[int, int], typing.List[Bounds]] = {}
+        texture_boxes: typing.Dict[str, typing.Optional[Bounds]] = {}
+
+        for texture_name, column, row in tiles:
+            if texture_name not in texture_boxes:
+                texture_boxes[texture_name] = hit_box(texture_name)
+
+            box = texture_boxes[texture_name]
+            if box is not None:
+                tile_boxes.setdefault((column, row), []).append(box)
+
+        if not tile_boxes:
+            return cls(tile_size, (0, 0), 0, 0)
+
+        min_column = min(column for column, _ in tile_boxes)
+        min_row = min(row for _, row in tile_boxes)
+        width = max(column for column, _ in tile_boxes) - min_column + 1
+        height = max(row for _, row in tile_boxes) - min_row + 1
+
+        grid = cls(tile_size, (min_column, min_row), width, height)
+        for (column, row), boxes in tile_boxes.items():
+            grid.cells[(column - min_column) * height + row - min_row] = grid._get_shape_id(tuple(sorted(set(boxes))))
+
+        return grid
+
+    def shape_at(self, column: int, row: int) -> typing.Tuple[Bounds, ...]:
+        column -= self.origin[0]
+        row -= self.origin[1]
+
+        if not (0 <= column < self.width and 0 <= row < self.height):
+            return ()
+
+        return self.shapes[self.cells[column * self.height + row]]
+
+    def is_solid(self, column: int, row: int) -> bool:
+        return bool(self.shape_at(column, row))
+
+    def cell_at(self, x: float, y: float) -> typing.Tuple[int, int]:
+        # Tile centers are placed at column * tile_size, so a tile spans half a tile around it
+        return math.floor(x / self.tile_size + 0.5), math.floor(y / self.tile_size + 0.5)
+
+    def is_point_blocked(self, x: float, y: float) -> bool:
+        return any(
+            left <= x <= right and bottom <= y <= top for left, bottom, right, top in self.boxes_in((x, y, x, y))
+        )
+
+    def boxes_in(self, bounds: Bounds) -> typing.Iterator[Bounds]:
+        """
+        Прямоугольники стен (в координатах уровня) в ячейках, которые задевает область
+        """
+        left, bottom, right, top = bounds
+        min_column, min_row = self.cell_at(left, bottom)
+        max_column, max_row = self.cell_at(right, top)
+
+        for column in range(max(min_column, self.origin[0]), min(max_column, self.origin[0] + self.width - 1) + 1):
+            for row in range(max(min_row, self.origin[1]), min(max_row, self.origin[1] + self.height - 1) + 1):
+                shape = self.shapes[self.cells[(column - self.origin[0]) * self.height + row - self.origin[1]]]
+
+                for box_left, box_bottom, box_right, box_top in shape:
+                    yield (
+                        (column + box_left) * self.tile_size,
+                        (row + box_bottom) * self.tile_size,
+                        (column + box_right) * self.tile_size,
+                        (row + box_top) * self.tile_size,
+                    )
+
+    def _get_shape_id(self, shape: typing.Tuple[Bounds, ...]) -> int:
+        if shape not in self._shape_index:
+            self._shape_index[shape] = len(self.shapes)
+            self.shapes.append(shape)
+
+        return self._shape_index[shape]
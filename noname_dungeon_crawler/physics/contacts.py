@@ -0,0 +1,92 @@
+import typing
+
+import arcade
+
+from .queries import query_box
+from .world import _overlap
+
+
+class ContactListener(typing.Protocol):
+    contact_cooldown: float  # seconds, handled contacts of the same pair are not reported again during it
+
+    def on_contact_enter(self, other: arcade.Sprite) -> bool:
+        ...
+
+    def on_contact_stay(self, other: arcade.Sprite) -> bool:
+        ...
+
+    def on_contact_exit(self, other: arcade.Sprite) -> None:
+        ...
+
+
+class ContactTracker:
+    """
+    Контакты одного спрайта (игрока) с сущностями: раз в кадр один запрос к пространственным хешам списков
+    вокруг него, сущностям отправляются события входа, удержания и выхода из контакта.
+    Обработчики входа и удержания возвращают True, если контакт обработан - тогда для пары начинается перерыв
+    """
+    sources: typing.List[arcade.SpriteList]  # all of them must use a spatial hash
+    margin: float  # px, physics keeps bodies apart, so bodies closer than this are in contact
+
+    _contacts: typing.Set[arcade.Sprite]
+    _cooldowns: typing.Dict[arcade.Sprite, float]  # seconds left per pair
+
+    def __init__(self, sources: typing.List[arcade.SpriteList], margin: float) -> None:
+        for source in sources:
+            if source.spatial_hash is None:
+                raise ValueError("Contact sources have to use a spatial hash")
+
+        self.sources = sources
+        self.margin = margin
+
+        self._contacts = set()
+        self._cooldowns = {}
+
+    @property
+    def contacts(self) -> typing.Set[arcade.Sprite]:
+        return set(self._contacts)
+
+    def clear(self) -> None:
+        """
+        Сброс без событий выхода (например, при смене уровня)
+        """
+        self._contacts.clear()
+        self._cooldowns.clear()
+
+    def update(self, subject: arcade.Sprite, delta_time: float) -> None:
+        for other in list(self._cooldowns):
+            self._cooldowns[other] -= delta_time
+            if self._cooldowns[other] <= 0:
+                del self._cooldowns[other]
+
+        bounds = (
+            subject.left - self.margin,
+            subject.bottom - self.margin,
+            subject.right + self.margin,
+            subject.top + self.margin,
+        )
+        contacts = {
+            other
+            for source in self.sources
+            for other in query_box(source, bounds)
+            if other is not subject and _overlap(bounds, (other.left, other.bottom, other.right, other.top))
+        }
+
+        for other in self._contacts - contacts:
+            typing.cast(ContactListener, other).on_contact_exit(subject)
+
+        previous = self._contacts
+        self._contacts = contacts
+
+        for other in contacts:
+            if other in self._cooldowns:
+                continue
+
+            listener = typing.cast(ContactListener, other)
+            if other in previous:
+                handled = listener.on_contact_stay(subject)
+            else:
+                handled = listener.on_contact_enter(subject)
+
+            if handled and listener.contact_cooldown > 0:
+                self._cooldowns[other] = listener.contact_cooldown
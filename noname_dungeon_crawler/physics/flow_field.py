@@ -0,0 +1,261 @@
+import array
+import heapq
+import math
+import time
+import typing
+
+import attr
+
+from .collision_grid import Bounds, CollisionGrid
+
+
+Cell = typing.Tuple[int, int]  # column, row
+Edge = typing.Tuple[int, int]  # neighbour cell index, step cost
+
+_UNREACHED = -1
+
+_STRAIGHT_STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+_DIAGONAL_STEPS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+_STRAIGHT_COST = 10
+_DIAGONAL_COST = 14  # about sqrt(2) straight steps
+# Mobs are nearly a tile wide and catch on wall corners when following paths along walls, such steps cost more
+_TIGHT_STEP_COST = 4
+
+
+@attr.s(kw_only=True, auto_attribs=True)
+class FlowFieldMetrics:
+    rebuilds: int = 0
+    last_rebuild_time: float = 0.0  # seconds
+    max_rebuild_time: float = 0.0
+    total_rebuild_time: float = 0.0
+    reached_cells: int = 0  # cells with a path to the target after the last rebuild
+
+
+class FlowField:
+    """
+    Общее для всех мобов поле направлений к игроку по сетке проходимых тайлов. Стоимости путей до тайла игрока
+    считаются алгоритмом Дейкстры в пределах radius тайлов и пересчитываются, только когда игрок переходит
+    на другой тайл; каждый тайл хранит следующий тайл пути, так что моб узнаёт направление за O(1)
+    """
+    tile_size: float
+    origin: Cell
+    width: int
+    height: int
+    radius: int  # in tiles, cells farther from the target (by either axis) are not searched
+    metrics: FlowFieldMetrics
+
+    edges: typing.List[typing.Tuple[Edge, ...]]  # open steps per cell, indexed like CollisionGrid.cells
+    distances: array.array  # path cost to the target cell, valid for cells stamped with the current generation
+    next_cells: array.array  # index of the next cell on the way to the target
+
+    _stamps: array.array  # generation of the rebuild that reached the cell, saves clearing the arrays
+    _generation: int  # 0 until the first rebuild
+    _target_cell: typing.Optional[Cell]
+
+    def __init__(
+        self,
+        tile_size: float,
+        origin: Cell,
+        width: int,
+        height: int,
+        edges: typing.List[typing.Tuple[Edge, ...]],
+        radius: int,
+    ) -> None:
+        self.tile_size = tile_size
+        self.origin = origin
+        self.width = width
+        self.height = height
+        self.radius = radius
+        self.metrics = FlowFieldMetrics()
+
+        self.edges = edges
+        self.distances = array.array('i', [_UNREACHED]) * (width * height)
+        self.next_cells = array.array('i', [_UNREACHED]) * (width * height)
+
+        self._stamps = array.array('I', bytes(4 * width * height))
+        self._generation = 0
+        self._target_cell = None
+
+    @classmethod
+    def from_tiles(
+        cls,
+        floor: typing.Iterable[Cell],
+        collision_grid: CollisionGrid,
+        radius: int,
+        clearance: float = 0.0,
+    ) -> 'FlowField':
+        """
+        Поле по тайлам пола: тайл проходим, если его центр не закрыт стеной, а шаг к соседу - если отрезок
+        между их центрами не задевает стену. Шаги, рядом с которыми (ближе clearance тайлов) стоит стена, дороже
+        """
+        tile_size = collision_grid.tile_size
+        cells = {
+            (column, row)
+            for column, row in floor
+            if not collision_grid.is_point_blocked(column * tile_size, row * tile_size)
+        }
+        if not cells:
+            return cls(tile_size, (0, 0), 0, 0, [], radius)
+
+        min_column = min(column for column, _ in cells)
+        min_row = min(row for _, row in cells)
+        width = max(column for column, _ in cells) - min_column + 1
+        height = max(row for _, row in cells) - min_row + 1
+
+        # Straight steps between neighbouring cells, a wall may stand between two walkable cells.
+        # Each pair is tested once, from its left (bottom) cell
+        step_costs: typing.Dict[typing.Tuple[Cell, Cell], int] = {}
+        margin = clearance * tile_size
+        for column, row in cells:
+            for step_column, step_row in ((1, 0), (0, 1)):
+                if (column + step_column, row + step_row) not in cells:
+                    continue
+
+                step = (
+                    column * tile_size,
+                    row * tile_size,
+                    (column + step_column) * tile_size,
+                    (row + step_row) * tile_size,
+                )
+                roomy_step = (step[0] - margin, step[1] - margin, step[2] + margin, step[3] + margin)
+
+                walls = [wall for wall in collision_grid.boxes_in(roomy_step) if _touches(roomy_step, wall)]
+                if any(_touches(step, wall) for wall in walls):
+                    continue
+
+                step_cost = _TIGHT_STEP_COST if walls else 1
+                step_costs[(column, row), (step_column, step_row)] = step_cost
+                step_costs[(column + step_column, row + step_row), (-step_column, -step_row)] = step_cost
+
+        edges: typing.List[typing.Tuple[Edge, ...]] = [()] * (width * height)
+        for column, row in cells:
+            cell_edges = []
+
+            for step_column, step_row in _STRAIGHT_STEPS:
+                step_cost = step_costs.get(((column, row), (step_column, step_row)))
+                if step_cost is not None:
+                    cell_edges.append((
+                        (column + step_column - min_column) * height + row + step_row - min_row,
+                        _STRAIGHT_COST * step_cost,
+                    ))
+
+            for step_column, step_row in _DIAGONAL_STEPS:
+                # Diagonal steps must not cut wall corners: both ways around the corner have to be open
+                around_costs = [
+                    step_costs.get(((column, row), (step_column, 0))),
+                    step_costs.get(((column, row), (0, step_row))),
+                    step_costs.get(((column + step_column, row), (0, step_row))),
+                    step_costs.get(((column, row + step_row), (step_column, 0))),
+                ]
+                if None not in around_costs:
+                    cell_edges.append((
+                        (column + step_column - min_column) * height + row + step_row - min_row,
+                        _DIAGONAL_COST * max(typing.cast(typing.List[int], around_costs)),
+                    ))
+
+            edges[(column - min_column) * height + row - min_row] = tuple(cell_edges)
+
+        return cls(tile_size, (min_column, min_row), width, height, edges, radius)
+
+    def cell_at(self, x: float, y: float) -> Cell:
+        return math.floor(x / self.tile_size + 0.5), math.floor(y / self.tile_size + 0.5)
+
+    def update(self, target: typing.Tuple[float, float]) -> bool:
+        """
+        Пересчёт поля, если цель перешла на другой тайл; возвращает True, если поле пересчитано
+        """
+        target_cell = self.cell_at(*target)
+        if target_cell == self._target_cell:
+            return False
+
+        self._target_cell = target_cell
+
+        start = time.perf_counter()
+        reached = self._rebuild(target_cell)
+        rebuild_time = time.perf_counter() - start
+
+        self.metrics.rebuilds += 1
+        self.metrics.last_rebuild_time = rebuild_time
+        self.metrics.max_rebuild_time = max(self.metrics.max_rebuild_time, rebuild_time)
+        self.metrics.total_rebuild_time += rebuild_time
+        self.metrics.reached_cells = reached
+
+        return True
+
+    def next_point(self, x: float, y: float) -> typing.Optional[typing.Tuple[float, float]]:
+        """
+        Центр следующего тайла пути к цели или None, если точка рядом с тайлом цели или вне поля
+        (тогда к цели идут напрямую)
+        """
+        column, row = self.cell_at(x, y)
+        column -= self.origin[0]
+        row -= self.origin[1]
+
+        if not (0 <= column < self.width and 0 <= row < self.height):
+            return None
+
+        idx = column * self.height + row
+        if not self._generation or self._stamps[idx] != self._generation:
+            return None
+
+        next_idx = self.next_cells[idx]
+        if next_idx == _UNREACHED or self.next_cells[next_idx] == _UNREACHED:
+            return None
+
+        column, row = divmod(next_idx, self.height)
+        return (column + self.origin[0]) * self.tile_size, (row + self.origin[1]) * self.tile_size
+
+    def _rebuild(self, target_cell: Cell) -> int:
+        self._generation += 1
+        generation = self._generation
+
+        height, edges, distances, next_cells, stamps = (
+            self.height,
+            self.edges,
+            self.distances,
+            self.next_cells,
+            self._stamps,
+        )
+
+        column, row = target_cell[0] - self.origin[0], target_cell[1] - self.origin[1]
+        if not (0 <= column < self.width and 0 <= row < self.height):
+            return 0
+
+        min_column, max_column = column - self.radius, column + self.radius
+        min_row, max_row = row - self.radius, row + self.radius
+
+        target_idx = column * height + row
+        stamps[target_idx] = generation
+        distances[target_idx] = 0
+        next_cells[target_idx] = _UNREACHED
+
+        reached = 1
+        queue = [(0, target_idx)]
+        while queue:
+            distance, idx = heapq.heappop(queue)
+            if distance > distances[idx]:  # Stale entry, the cell was reached cheaper since
+                continue
+
+            for other_idx, step_cost in edges[idx]:
+                other_distance = distance + step_cost
+
+                if stamps[other_idx] == generation:
+                    if other_distance >= distances[other_idx]:
+                        continue
+                else:
+                    other_column, other_row = divmod(other_idx, height)
+                    if not (min_column <= other_column <= max_column and min_row <= other_row <= max_row):
+                        continue
+
+                    stamps[other_idx] = generation
+                    reached += 1
+
+                distances[other_idx] = other_distance
+                next_cells[other_idx] = idx
+                heapq.heappush(queue, (other_distance, other_idx))
+
+        return reached
+
+
+def _touches(first: Bounds, second: Bounds) -> bool:
+    return first[0] <= second[2] and second[0] <= first[2] and first[1] <= second[3] and second[1] <= first[3]
@@ -0,0 +1,96 @@
+import typing
+
+import arcade
+
+from .collision_grid import Bounds
+
+
+_PARALLEL_EPSILON = 1e-9
+
+
+def query_box(sprite_list: arcade.SpriteList, bounds: Bounds) -> typing.Set[arcade.Sprite]:
+    """
+    Спрайты из ячеек пространственного хеша списка, которые задевает прямоугольник (без точной проверки)
+    """
+    spatial_hash = sprite_list.spatial_hash
+    if spatial_hash is None:
+        raise ValueError("Sprite list has to use a spatial hash")
+
+    # arcade's public get_objects_for_box only takes a sprite, so the cells are read from the internals of
+    # arcade 2.6's _SpatialHash (arcade is pinned in requirements.txt). Without them every sprite is a candidate
+    hash_point = getattr(spatial_hash, '_hash', None)
+    contents = getattr(spatial_hash, 'contents', None)
+    if hash_point is None or contents is None:
+        return set(sprite_list)
+
+    # Same cell hashing as arcade uses when inserting sprites
+    min_x, min_y = hash_point((int(bounds[0]), int(bounds[1])))
+    max_x, max_y = hash_point((int(bounds[2]), int(bounds[3])))
+
+    candidates: typing.Set[arcade.Sprite] = set()
+    for x in range(min_x, max_x + 1):
+        for y in range(min_y, max_y + 1):
+            candidates.update(contents.get((x, y), ()))
+
+    return candidates
+
+
+def sweep(
+    sprite_list: arcade.SpriteList,
+    start: arcade.Point,
+    end: arcade.Point,
+    radius: float,
+    kinds: typing.Optional[typing.Tuple[type, ...]] = None,
+) -> typing.List[arcade.Sprite]:
+    """
+    Спрайты, которые задевает отрезок start-end толщиной 2 * radius (например, взмах оружия за кадр),
+    в порядке касания вдоль отрезка. kinds - отбор по типам сущностей
+    """
+    bounds = (
+        min(start[0], end[0]) - radius,
+        min(start[1], end[1]) - radius,
+        max(start[0], end[0]) + radius,
+        max(start[1], end[1]) + radius,
+    )
+
+    hits: typing.List[typing.Tuple[float, arcade.Sprite]] = []
+    for sprite in query_box(sprite_list, bounds):
+        if kinds is not None and not isinstance(sprite, kinds):
+            continue
+
+        # The thickness is moved onto the box, so the segment itself is tested against the grown box
+        entry = _segment_entry(
+            start, end, (sprite.left - radius, sprite.bottom - radius, sprite.right + radius, sprite.top + radius)
+        )
+        if entry is not None:
+            hits.append((entry, sprite))
+
+    hits.sort(key=lambda hit: hit[0])
+    return [sprite for _, sprite in hits]
+
+
+def _segment_entry(start: arcade.Point, end: arcade.Point, box: Bounds) -> typing.Optional[float]:
+    """
+    Доля отрезка, на которой он входит в прямоугольник, или None, если не пересекает (метод слэбов)
+    """
+    t_min, t_max = 0.0, 1.0
+
+    for axis in (0, 1):
+        origin = start[axis]
+        delta = end[axis] - origin
+        low, high = box[axis], box[axis + 2]
+
+        if abs(delta) < _PARALLEL_EPSILON:
+            if not low <= origin <= high:
+                return None
+            continue
+
+        t_low, t_high = (low - origin) / delta, (high - origin) / delta
+        if t_low > t_high:
+            t_low, t_high = t_high, t_low
+
+        t_min, t_max = max(t_min, t_low), min(t_max, t_high)
+        if t_min > t_max:
+            return None
+
+    return t_min
@@ -0,0 +1,192 @@
+import typing
+
+import arcade
+
+from .collision_grid import Bounds, CollisionGrid
+
+
+_EPSILON = 0.01  # px, bodies are separated by this gap so resolved contacts do not count as overlaps next step
+_AXES = ('y', 'x')  # same order as arcade.PhysicsEngineSimple: vertical movement is resolved first
+_AXIS_INDEX = {'x': 0, 'y': 1}  # position of the axis minimum in Bounds, the maximum is 2 further
+_DEPENETRATION_ITERATIONS = 4
+
+
+def _bounds(sprite: arcade.Sprite) -> Bounds:
+    return sprite.left, sprite.bottom, sprite.right, sprite.top
+
+
+def _overlap(first: Bounds, second: Bounds) -> bool:
+    return first[0] < second[2] and second[0] < first[2] and first[1] < second[3] and second[1] < first[3]
+
+
+def _penetration(body: Bounds, other: Bounds, axis: str) -> float:
+    """
+    Сдвиг тела по оси, выталкивающий его из другого прямоугольника (в сторону от центра другого прямоугольника)
+    """
+    low = _AXIS_INDEX[axis]
+    high = low + 2
+
+    if body[low] + body[high] < other[low] + other[high]:
+        return other[low] - body[high] - _EPSILON
+    return other[high] - body[low] + _EPSILON
+
+
+def _contact_push(body: Bounds, other: Bounds, axis: str, motion: float) -> typing.Tuple[str, float]:
+    """
+    Ось и величина выталкивания тела из контакта после движения по оси на motion
+    """
+    push = _penetration(body, other, axis)
+    if abs(push) <= motion + _EPSILON:
+        return axis, push
+
+    # The overlap was not caused by this move (spawned inside, hit box has grown), the shortest way out is used
+    other_axis = 'x' if axis == 'y' else 'y'
+    other_push = _penetration(body, other, other_axis)
+
+    return (axis, push) if abs(push) <= abs(other_push) else (other_axis, other_push)
+
+
+def _shift(sprite: arcade.Sprite, axis: str, distance: float) -> None:
+    setattr(sprite, f'center_{axis}', getattr(sprite, f'center_{axis}') + distance)
+
+
+def _shift_bounds(bounds: Bounds, axis: str, distance: float) -> Bounds:
+    if axis == 'x':
+        return bounds[0] + distance, bounds[1], bounds[2] + distance, bounds[3]
+    return bounds[0], bounds[1] + distance, bounds[2], bounds[3] + distance
+
+
+class PhysicsWorld:
+    """
+    Физика всего уровня за один проход: все тела двигаются по change_x/change_y, соседи ищутся в одном общем
+    пространственном хеше препятствий, контакт двух тел разрешается один раз на пару.
+    Статичные стены проверяются по карте тайлов, а не по спрайтам
+    """
+    obstacles: arcade.SpriteList  # must use a spatial hash, bodies listed here also block other bodies
+    collision_grid: typing.Optional[CollisionGrid]
+
+    _bodies: typing.Dict[arcade.Sprite, None]  # insertion ordered set
+
+    def __init__(self, obstacles: arcade.SpriteList, collision_grid: typing.Optional[CollisionGrid] = None) -> None:
+        if obstacles.spatial_hash is None:
+            raise ValueError("Obstacle list has to use a spatial hash")
+
+        self.obstacles = obstacles
+        self.collision_grid = collision_grid
+        self._bodies = {}
+
+    def set_collision_grid(self, collision_grid: typing.Optional[CollisionGrid]) -> None:
+        self.collision_grid = collision_grid
+
+    def add_body(self, body: arcade.Sprite) -> None:
+        self._bodies[body] = None
+        self._depenetrate(body)
+
+    def remove_body(self, body: arcade.Sprite) -> None:
+        self._bodies.pop(body, None)
+
+    def has_body(self, body: arcade.Sprite) -> bool:
+        return body in self._bodies
+
+    def clear(self) -> None:
+        self._bodies.clear()
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+    def step(self) -> None:
+        moving = [body for body in self._bodies if body.change_x or body.change_y]
+
+        for axis in _AXES:
+            axis_moving = [body for body in moving if getattr(body, f'change_{axis}')]
+            if not axis_moving:
+                continue
+
+            for body in axis_moving:
+                _shift(body, axis, getattr(body, f'change_{axis}'))
+
+            self._resolve(axis_moving, axis)
+
+    def _resolve(self, bodies: typing.List[arcade.Sprite], axis: str) -> None:
+        spatial_hash = self.obstacles.spatial_hash
+        candidates = {body: spatial_hash.get_objects_for_box(body) for body in bodies}  # type: ignore
+
+        # Body against body: every pair once, the push is split by how far each body moved along the axis
+        resolved_pairs: typing.Set[typing.Tuple[int, int]] = set()
+        for body in bodies:
+            for other in candidates[body]:
+                if other is body or other not in self._bodies or not _overlap(_bounds(body), _bounds(other)):
+                    continue
+
+                pair = (id(body), id(other)) if id(body) < id(other) else (id(other), id(body))
+                if pair in resolved_pairs:
+                    continue
+                resolved_pairs.add(pair)
+
+                self._separate(body, other, axis)
+
+        # Then against static obstacles, they never move: sprites (chests, doors) and the wall grid
+        for body in bodies:
+            motion = abs(getattr(body, f'change_{axis}'))
+            body_bounds = _bounds(body)
+
+            for other in candidates[body]:
+                if other is not body and other not in self._bodies:
+                    body_bounds = self._push_out(body, body_bounds, _bounds(other), axis, motion)
+
+            if self.collision_grid is not None:
+                for wall in self.collision_grid.boxes_in(body_bounds):
+                    body_bounds = self._push_out(body, body_bounds, wall, axis, motion)
+
+    @staticmethod
+    def _push_out(body: arcade.Sprite, body_bounds: Bounds, other: Bounds, axis: str, motion: float) -> Bounds:
+        """
+        Выталкивание тела из статичного прямоугольника, возвращает новые границы тела
+        """
+        if not _overlap(body_bounds, other):  # Earlier pushes may have resolved this contact already
+            return body_bounds
+
+        push_axis, push = _contact_push(body_bounds, other, axis, motion)
+        _shift(body, push_axis, push)
+        setattr(body, f'change_{push_axis}', 0)
+
+        return _shift_bounds(body_bounds, push_axis, push)
+
+    def _separate(self, body: arcade.Sprite, other: arcade.Sprite, axis: str) -> None:
+        body_motion = abs(getattr(body, f'change_{axis}'))
+        other_motion = abs(getattr(other, f'change_{axis}'))
+
+        axis, push = _contact_push(_bounds(body), _bounds(other), axis, body_motion + other_motion)
+
+        # A body that is not an obstacle itself (the player) does not push obstacles away, it is stopped by them
+        if self.obstacles not in body.sprite_lists or not body_motion + other_motion:
+            body_share = 1.0
+        else:
+            body_share = body_motion / (body_motion + other_motion)
+
+        _shift(body, axis, push * body_share)
+        _shift(other, axis, -push * (1.0 - body_share))
+
+    def _depenetrate(self, body: arcade.Sprite) -> None:
+        """
+        Выталкивание тела из статичных препятствий кратчайшим путём (например, крупный моб появился в стене)
+        """
+        for _ in range(_DEPENETRATION_ITERATIONS):
+            overlapping = [
+                _bounds(other)
+                for other in self.obstacles.spatial_hash.get_objects_for_box(body)  # type: ignore
+                if other is not body and other not in self._bodies
+            ]
+            if self.collision_grid is not None:
+                overlapping.extend(self.collision_grid.boxes_in(_bounds(body)))
+
+            overlapping = [other for other in overlapping if _overlap(_bounds(body), other)]
+            if not overlapping:
+                return
+
+            body_bounds = _bounds(body)
+            for other in overlapping:
+                if _overlap(body_bounds, other):
+                    push_axis, push = _contact_push(body_bounds, other, 'x', 0.0)
+                    _shift(body, push_axis, push)
+                    body_bounds = _shift_bounds(body_bounds, push_axis, push)
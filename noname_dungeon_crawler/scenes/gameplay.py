@@ -1,13 +1,24 @@
-        import typing
+import itertools
+import pathlib
+import time
+import typing
 
 import arcade
 
 from noname_dungeon_crawler.assets import asset_repository
 from noname_dungeon_crawler.gui import draw_player_gui
-from noname_dungeon_crawler.level_generator import LevelGenerator
+from noname_dungeon_crawler.level_generator import (
+    LevelBlueprint,
+    LevelBuilder,
+    LevelPregenerator,
+    RoomChunkManager,
+    RoomGraph,
+    load_snapshot,
+)
+from noname_dungeon_crawler.physics import ContactTracker, FlowField, PhysicsWorld
 from noname_dungeon_crawler.settings import config
-from noname_dungeon_crawler.sprites import Entity, Player
-from noname_dungeon_crawler.util import Timer, get_game
+from noname_dungeon_crawler.sprites import Entity, HostileMob, MobPopulation, Player, sprite_pools, update_animations
+from noname_dungeon_crawler.util import Timer, TimerScheduler, get_game, pts_to_px
 
 from .interactable_scene import InteractableScene
 from .scene_type import SceneType
@@ -17,64 +28,113 @@ import logging
 
 log = logging.getLogger(__name__)
 
+# Entities are also listed in 'impassable' and the baked layers are not animated, so only these lists are walked
+_ANIMATED_LISTS = ('player', 'mobs', 'chests', 'doors', 'trinkets')
+# Same for updates, in drawing order
+_UPDATED_LISTS = ('chests', 'mobs', 'doors', 'player', 'trinkets', 'weapon')
+
+# Drawing positions are written past the Sprite.position setter, into the fields arcade 2.6 keeps them in
+# (arcade is pinned in requirements.txt). Other versions go through the setter, which also rehashes the sprites
+_DRAW_ONLY_POSITIONS = arcade.version.VERSION.startswith('2.6.')
+
 
 class GameplayScene(InteractableScene):
-    timers: typing.List[Timer]
-    physics_engines: typing.Dict[Entity, arcade.PhysicsEngineSimple]
+    timers: TimerScheduler
+    physics: PhysicsWorld
+    mob_population: MobPopulation
+    flow_field: FlowField
+    contacts: ContactTracker
 
     level: int
 
-    camera: arcade.Camera
-    gui_camera: arcade.Camera
+    camera: typing.Optional[arcade.Camera]  # None when running headless
+    gui_camera: typing.Optional[arcade.Camera]
 
     player_entity: Player
 
+    pregenerator: LevelPregenerator
+    room_graph: RoomGraph
+    chunk_manager: RoomChunkManager
+
     _mouse_pressed: bool
     _mouse_coords: typing.Tuple[int, int]
 
-    def __init__(self) -> None:
+    _previous_positions: typing.Dict[arcade.Sprite, arcade.Point]  # moving sprites at the start of the last tick
+    _interpolation: float
+
+    def __init__(
+        self,
+        seed: typing.Optional[int] = None,
+        pregenerator: typing.Optional[LevelPregenerator] = None,  # may already be generating level 1
+    ) -> None:
         super().__init__(scene_type=SceneType.GAMEPLAY, music_tracks=['gameplay'])
 
-        self.timers = []
-        self.physics_engines = {}
+        self.timers = TimerScheduler()
 
         self._mouse_pressed = False
         self._mouse_coords = (0, 0)
 
+        self._previous_positions = {}
+        self._interpolation = 1.0
+
         self.level = 1
+        self.pregenerator = pregenerator or LevelPregenerator(seed=seed)
 
         self.add_sprite_list('floor')
         self.add_sprite_list('walls')
-        self.add_sprite_list('chests')
-        self.add_sprite_list('mobs')
-        self.add_sprite_list('doors')
+        self._add_entity_list('chests')
+        self._add_entity_list('mobs')
+        self._add_entity_list('doors')
 
-        self.add_sprite_list('impassable', use_spatial_hash=True)
+        self._add_entity_list('impassable', use_spatial_hash=True)
+        self.physics = PhysicsWorld(self.get_sprite_list('impassable'))
+        self.mob_population = MobPopulation()
 
         self.player_entity = typing.cast(Player, asset_repository.get_entity('player'))
+        self._add_entity_list('player')
         self.add_sprite('player', self.player_entity)
 
-        self.camera = arcade.Camera(*config.resolution)
-        self.gui_camera = arcade.Camera(*config.resolution)
+        self._add_entity_list('trinkets', use_spatial_hash=True)
+        self._add_entity_list('weapon')
+        self.contacts = ContactTracker(
+            [self.get_sprite_list('impassable'), self.get_sprite_list('trinkets')],
+            margin=pts_to_px(config.constants.CONTACT_MARGIN),
+        )
+
+        self.camera = None if config.headless else arcade.Camera(*config.resolution)
+        self.gui_camera = None if config.headless else arcade.Camera(*config.resolution)
 
         self._init_level()
 
     def on_update(self, delta_time: float = 1 / 60, names: typing.Optional[typing.List[str]] = None) -> None:
-        super().on_update(delta_time, names)
+        if not config.headless:
+            self._previous_positions = {sprite: sprite.position for sprite in self._get_moving_sprites()}
 
-        for timer in self.timers:
-            timer.update(delta_time)
+        super().on_update(delta_time, names or list(_UPDATED_LISTS))
+        self.flow_field.update(self.player_entity.position)
+        self.mob_population.step(self.player_entity, delta_time, self.flow_field)
 
-        self.timers = [timer for timer in self.timers if not timer.finished]
+        self.timers.update(delta_time)
+        if self.disposed:  # A timer ended the game (the player died), the rest of the tick is skipped
+            return
 
-        self._move_camera_to_player()
+        self.chunk_manager.update(self.player_entity.position, delta_time)
         if self._mouse_pressed:
             self.player_entity.swing_weapon(*self._project_coordinates(*self._mouse_coords))
 
-        for physics_engine in self.physics_engines.values():
-            physics_engine.update()
+        self.physics.step()
+        self.contacts.update(self.player_entity, delta_time)
+
+    def update_animation(self, delta_time: float, names: typing.Optional[typing.List[str]] = None) -> None:
+        sprite_lists = (self.get_sprite_list(name) for name in names or _ANIMATED_LISTS)
+        update_animations(itertools.chain.from_iterable(sprite_lists), delta_time)
 
     def draw(self, names: typing.Optional[typing.List[str]] = None, **kwargs: typing.Any) -> None:
+        if self.camera is None or self.gui_camera is None:  # Nothing to draw on when running headless
+            return
+
+        positions = self._interpolate_positions()
+        self._move_camera_to_player()
         self.camera.use()
 
         super().draw(names, **kwargs)
@@ -82,27 +142,50 @@ class GameplayScene(InteractableScene):
         for enemy in self.get_sprite_list('mobs'):
             enemy.draw_hp_bar()  # type: ignore
 
+        self._place_sprites(positions)
+
         self.gui_camera.use()
         draw_player_gui(self.player_entity)
 
-    def add_timer(self, timer: Timer) -> None:
-        self.timers.append(timer)
+    def set_interpolation(self, alpha: float) -> None:
+        self._interpolation = alpha
+
+    def add_timer(self, timer: Timer) -> Timer:
+        return self.timers.schedule(timer)
 
     def start_next_level(self) -> None:
+        handoff_start = time.perf_counter()
+
         self._clear()
 
         self.level += 1
         self._init_level()
 
-    def add_physics_engine(self, entity: Entity) -> arcade.PhysicsEngineSimple:
-        engine = arcade.PhysicsEngineSimple(entity, self.get_sprite_list('impassable'))
-        self.physics_engines[entity] = engine
+        self.pregenerator.record_handoff(time.perf_counter() - handoff_start)
+
+    def load_level(self, path: pathlib.Path) -> None:
+        """
+        Загрузка уровня из бинарного снимка вместо генерации
+        """
+        blueprint = load_snapshot(path)
 
-        return engine
+        self._clear()
+
+        self.level = blueprint.level
+        self._init_level(blueprint)
+
+    def add_physics_engine(self, entity: Entity) -> None:
+        self.physics.add_body(entity)
+
+        # Mobs with a body are awake, they are steered in one batch
+        if isinstance(entity, HostileMob):
+            self.mob_population.add(entity)
 
     def remove_physics_engine(self, entity: Entity) -> None:
-        if entity in self.physics_engines:
-            del self.physics_engines[entity]
+        self.physics.remove_body(entity)
+
+        if isinstance(entity, HostileMob):
+            self.mob_population.remove(entity)
 
     def _clear(self) -> None:
         self.get_sprite_list('floor').clear()
@@ -112,39 +195,115 @@ class GameplayScene(InteractableScene):
         self.get_sprite_list('doors').clear()
         self.get_sprite_list('impassable').clear()
 
-        self.physics_engines.clear()
+        self.physics.clear()
+        self.mob_population.clear()
+        self.contacts.clear()
+        self._previous_positions.clear()  # The player is moved to the next level, not through it
+
+        # Sprites of the level are reused by the next one, after the clear above they are only left in room lists
+        self.chunk_manager.release_sprites()
+        sprite_pools.log_metrics()
 
-    def _init_level(self) -> None:
-        generator = LevelGenerator(level=self.level)
-        level = generator.generate_level()
+    def _init_level(self, blueprint: typing.Optional[LevelBlueprint] = None) -> None:
+        if blueprint is None:
+            blueprint = self.pregenerator.take(self.level)
 
-        self.get_sprite_list('floor').extend(level.floor)
-        self.get_sprite_list('walls').extend(level.walls)
-        self.get_sprite_list('chests').extend(level.chests)
-        self.get_sprite_list('mobs').extend(level.mobs)
-        self.get_sprite_list('doors').extend(level.doors)
+        level = LevelBuilder().build(blueprint)
 
-        self.get_sprite_list('impassable').extend(self.get_sprite_list('walls'))
-        self.get_sprite_list('impassable').extend(self.get_sprite_list('chests'))
-        self.get_sprite_list('impassable').extend(self.get_sprite_list('mobs'))
-        self.get_sprite_list('impassable').extend(self.get_sprite_list('doors'))
+        self._replace_sprite_list('floor', level.floor)
+        self._replace_sprite_list('walls', level.walls)
 
+        self.room_graph = level.room_graph
         self.player_entity.position = level.starting_coords
+        self.physics.set_collision_grid(level.collision_grid)
         self._init_physics()
 
+        self.flow_field = blueprint.flow_field
+        self.flow_field.update(self.player_entity.position)
+
+        # Rooms (with their mobs, chests and doors) are paged in around the player
+        self.chunk_manager = RoomChunkManager(self, blueprint, level)
+        self.chunk_manager.update(self.player_entity.position)
+
+        # The next level is generated in the background while this one is being played
+        self.pregenerator.request(self.level + 1)
+
+    def _add_entity_list(self, name: str, use_spatial_hash: bool = False) -> None:
+        """
+        Список спрайтов сущностей на общем атласе текстур из пакета (None без окна - атлас по умолчанию)
+        """
+        sprite_list = arcade.SpriteList(atlas=asset_repository.texture_atlas, use_spatial_hash=use_spatial_hash)
+
+        # Not through add_sprite_list: an empty list is falsy there and would be replaced with a new one
+        self.name_mapping[name] = sprite_list
+        self.sprite_lists.append(sprite_list)
+
+    def _replace_sprite_list(self, name: str, sprite_list: arcade.SpriteList) -> None:
+        """
+        Подмена списка спрайтов сцены с сохранением порядка отрисовки (для заранее собранных слоёв)
+        """
+        old_sprite_list = self.get_sprite_list(name)
+
+        self.sprite_lists[self.sprite_lists.index(old_sprite_list)] = sprite_list
+        self.name_mapping[name] = sprite_list
+
     def _init_physics(self) -> None:
         self.add_physics_engine(self.player_entity)
-        for mob in self.get_sprite_list('mobs'):
-            self.add_physics_engine(mob)  # type: ignore
 
     def _get_cam_coordinates(self) -> typing.Tuple[float, float]:
-        cam_center_x = self.player_entity.center_x - (self.camera.viewport_width / 2)
-        cam_center_y = self.player_entity.center_y - (self.camera.viewport_height / 2)
+        # The cameras always cover the whole configured resolution
+        cam_center_x = self.player_entity.center_x - (config.resolution[0] / 2)
+        cam_center_y = self.player_entity.center_y - (config.resolution[1] / 2)
 
         return cam_center_x, cam_center_y
 
+    def _get_moving_sprites(self) -> typing.Iterator[arcade.Sprite]:
+        return itertools.chain(
+            (self.player_entity,),
+            self.get_sprite_list('mobs'),
+            self.get_sprite_list('trinkets'),
+        )
+
+    def _interpolate_positions(self) -> typing.Dict[arcade.Sprite, arcade.Point]:
+        """
+        Перенос движущихся спрайтов на время отрисовки (между двумя последними шагами симуляции),
+        возвращает настоящие позиции перенесённых
+        """
+        alpha = self._interpolation
+        positions = {}
+        interpolated = {}
+
+        for sprite, (previous_x, previous_y) in self._previous_positions.items():
+            x, y = sprite.position
+            if (x != previous_x or y != previous_y) and sprite.sprite_lists:  # Not removed since the last tick
+                positions[sprite] = (x, y)
+                interpolated[sprite] = (previous_x + (x - previous_x) * alpha, previous_y + (y - previous_y) * alpha)
+
+        self._place_sprites(interpolated)
+        return positions
+
+    @staticmethod
+    def _place_sprites(positions: typing.Dict[arcade.Sprite, arcade.Point]) -> None:
+        """
+        Позиции спрайтов только для отрисовки: пространственные хеши (и физика) об этом не узнают
+        """
+        if not _DRAW_ONLY_POSITIONS:
+            for sprite, position in positions.items():
+                sprite.position = position
+            return
+
+        # What the position setter does in arcade 2.6, minus the spatial hash updates.
+        # SpriteList.update_location reads sprite._position into the list's position buffer
+        for sprite, position in positions.items():
+            sprite._position = position  # type: ignore
+            sprite._point_list_cache = None  # type: ignore
+
+            for sprite_list in sprite.sprite_lists:
+                sprite_list.update_location(sprite)
+
     def _move_camera_to_player(self) -> None:
-        self.camera.move_to(self._get_cam_coordinates())
+        if self.camera:
+            self.camera.move_to(self._get_cam_coordinates())
 
     def _project_coordinates(self, x: int, y: int) -> typing.Tuple[int, int]:
         cam_center_x, cam_center_y = self._get_cam_coordinates()
@@ -190,5 +349,5 @@ class GameplayScene(InteractableScene):
 
     def on_deactivate(self) -> None:
         super().on_deactivate()
-        self.music_player.delete()
-        get_game().scenes[self.scene_type] = self.__class__()
+        self.pregenerator.shutdown()
+        self.disposed = True  # A new game gets a new scene, created when it is started
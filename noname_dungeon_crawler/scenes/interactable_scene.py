@@ -2,8 +2,8 @@ import typing
 
 import arcade
 import arcade.gui
-import pyglet.media
 
+from noname_dungeon_crawler.assets import audio_service
 from noname_dungeon_crawler.settings import config
 
 from .scene_type import SceneType
@@ -14,10 +14,10 @@ class InteractableScene(arcade.Scene):
     Базовый класс с утилитарными методами, который наследует оригинальную сцену из arcade
     """
     scene_type: SceneType
-    ui_manager: arcade.gui.UIManager
+    ui_manager: typing.Optional[arcade.gui.UIManager]  # None when running headless
 
-    music_player: pyglet.media.Player
-    music_tracks: typing.List[arcade.Sound]
+    music_tracks: typing.List[str]  # played by the shared audio service while the scene is active
+    disposed: bool  # the scene is not activated again, the game drops it and creates a new one when needed
 
     def __init__(
         self,
@@ -25,30 +25,28 @@ class InteractableScene(arcade.Scene):
         ui_manager: typing.Optional[arcade.gui.UIManager] = None,
         music_tracks: typing.List[str] = [],
     ) -> None:
-        from noname_dungeon_crawler.assets import asset_repository
-
         super().__init__()
 
         self.scene_type = scene_type
 
-        if not ui_manager:
+        if not ui_manager and not config.headless:
             ui_manager = arcade.gui.UIManager()
         self.ui_manager = ui_manager
 
-        self.music_tracks = [asset_repository.get_music(track) for track in music_tracks]
-        self.music_player = pyglet.media.Player()
-        self._reset_player()
-        self.music_player.loop = True
-        self.music_player.volume = config.music_volume
+        self.music_tracks = list(music_tracks)
+        self.disposed = False
 
     def draw(self, names: typing.Optional[typing.List[str]] = None, **kwargs: typing.Any) -> None:
         super().draw(names, **kwargs)
 
-        self.ui_manager.draw()
+        if self.ui_manager:
+            self.ui_manager.draw()
 
-    def _reset_player(self) -> None:
-        for track in self.music_tracks:
-            self.music_player.queue(track.source)
+    def set_interpolation(self, alpha: float) -> None:
+        """
+        Доля следующего шага симуляции, прошедшая к отрисовке кадра (0 - последний шаг, 1 - следующий)
+        """
+        pass
 
     def on_key_press(self, symbol: int, modifiers: int) -> None:
         pass
@@ -66,9 +64,13 @@ class InteractableScene(arcade.Scene):
         pass
 
     def on_activate(self) -> None:
-        self.ui_manager.enable()
-        self.music_player.play()
+        if self.ui_manager:
+            self.ui_manager.enable()
+        if self.music_tracks:
+            audio_service.play_music(self.music_tracks)
 
     def on_deactivate(self) -> None:
-        self.ui_manager.disable()
-        self.music_player.pause()
+        if self.ui_manager:
+            self.ui_manager.disable()
+        if self.music_tracks:
+            audio_service.pause_music()
@@ -1,4 +1,5 @@
 import logging
+import os
 import pathlib
 import typing
 
@@ -14,6 +15,9 @@ class Constants:
     TEXTURE_DIR = ASSETS_BASE_DIR / 'textures'
     IMAGE_DIR = ASSETS_BASE_DIR / 'images'
     SOUND_DIR = ASSETS_BASE_DIR / 'sounds'
+    LEVEL_SNAPSHOT_DIR = ASSETS_BASE_DIR / 'levels'
+    CACHE_BASE_DIR = pathlib.Path(os.environ.get('XDG_CACHE_HOME') or pathlib.Path.home() / '.cache')
+    TEXTURE_CACHE_DIR = CACHE_BASE_DIR / 'noname_dungeon_crawler' / 'textures'
 
     PLAYER_BASE_HEALTH = 20
     PLAYER_BASE_DAMAGE = 5
@@ -26,7 +30,12 @@ class Constants:
 
     SCALE = 2
 
+    ASSET_LOADER_WORKERS = 4  # threads decoding assets at startup, GL uploads stay on the main thread
+
+    MAX_TICKS_PER_FRAME = 5  # simulation catch-up cap, time beyond it is dropped (e.g. after a level transition)
+
     MISC_OBJECT_COLLISION_CHECK_INTERVAL = 0.5
+    CONTACT_MARGIN = 0.01  # pts, physics keeps bodies apart, entities this close to the player touch it
 
     TRINKET_MOVEMENT_SPEED = 5.0
     TRINKET_SCATTER_DELAY_RANGE = (0.1, 0.3)
@@ -39,8 +48,17 @@ class Constants:
     POTION_DAMAGE_INCREASE = 0.3
 
     TILE_SCALE = 0.35
+    TILE_LAYER_CHUNK_SIZE = 32  # static floor/wall layers are baked into chunks of N x N tiles
+    SPRITE_POOL_MAX_SIZE = 2048  # free sprites kept per pool, the rest is left to the garbage collector
+    STREAMING_RADIUS = 1  # rooms around the player's room that are drawn, updated and collided with
+    MOB_WAKE_RANGE = 3.5  # pts, mobs closer to the player (or in the player's room) are updated
+    MOB_SLEEP_RANGE = 4.0  # pts, mobs farther than this fall asleep, the gap keeps them from flickering
+    MOB_ACTIVITY_CHECK_INTERVAL = 0.25  # seconds between sleep/wake passes
+    FLOW_FIELD_RADIUS = 16  # tiles around the player searched for mob paths, rebuilt when the player changes tile
+    FLOW_FIELD_CLEARANCE = 0.4  # tiles, about half a mob width: paths closer to walls than this are avoided
 
     GENERATOR_GRID_SIZE = 25
+    GENERATOR_LAYOUT_MODE = 'depth_first'  # 'depth_first' reproduces the legacy layouts, or 'breadth_first'
     GENERATOR_ROOM_SIZE = 9
     GENERATOR_PASSAGE_SIZE = 3
     GENERATOR_PROBABILITY_DECAY = 0.7
@@ -59,6 +77,8 @@ class Constants:
 class _GameConfig:
     resolution: typing.Tuple[int, int] = (1920, 1080)
     music_volume: float = 0.2
+    tick_rate: int = 60  # simulation steps per second, drawing is interpolated between them
+    headless: bool = False  # no window: no texture atlases or GL resources, silent stand-in sounds
 
     constants: Constants = Constants()
 
@@ -0,0 +1,13 @@
+from .controllers import InputAction, InputEvent, RandomBot, ScriptedInput
+from .runner import Controller, HeadlessSimulation, SimulationReport
+
+
+__all__ = [
+    'Controller',
+    'HeadlessSimulation',
+    'InputAction',
+    'InputEvent',
+    'RandomBot',
+    'ScriptedInput',
+    'SimulationReport',
+]
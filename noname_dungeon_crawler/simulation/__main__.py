@@ -0,0 +1,54 @@
+import argparse
+import json
+import logging
+import pathlib
+import sys
+import typing
+
+import attr
+
+from noname_dungeon_crawler.settings import config
+
+from .controllers import RandomBot, ScriptedInput
+from .runner import Controller, HeadlessSimulation
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='python -m noname_dungeon_crawler.simulation',
+        description="Runs the gameplay without a window at a fixed step, the report is printed as JSON",
+    )
+    parser.add_argument('--steps', type=int, default=60 * 60 * 10)
+    parser.add_argument('--delta', type=float, default=1 / 60, help="fixed step in seconds")
+    parser.add_argument('--seed', type=int)
+
+    input_group = parser.add_mutually_exclusive_group()
+    input_group.add_argument('--bot', choices=['random'], help="built-in bot to play the game")
+    input_group.add_argument('--script', type=pathlib.Path, help="JSON file with scripted input events")
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+
+    logging.basicConfig(**{**config.constants.LOGGING_CONFIG, 'stream': sys.stderr})  # type: ignore
+
+    controller: typing.Optional[Controller] = None
+    if args.bot == 'random':
+        controller = RandomBot(seed=args.seed)
+    elif args.script:
+        controller = ScriptedInput.from_file(args.script)
+
+    simulation = HeadlessSimulation(delta_time=args.delta, controller=controller, seed=args.seed)
+    simulation.setup()
+    try:
+        report = simulation.run(args.steps)
+    finally:
+        simulation.close()
+
+    json.dump(attr.asdict(report), sys.stdout, indent=2)
+    sys.stdout.write('\n')
+
+
+main()
@@ -0,0 +1,114 @@
+import enum
+import json
+import pathlib
+import random
+import typing
+
+import arcade
+import attr
+
+from noname_dungeon_crawler.util import pts_to_px
+
+from .runner import HeadlessSimulation
+
+
+_MOVEMENT_KEYS = (arcade.key.W, arcade.key.A, arcade.key.S, arcade.key.D)
+
+
+class InputAction(enum.Enum):
+    KEY_PRESS = 'key_press'
+    KEY_RELEASE = 'key_release'
+    CLICK = 'click'
+
+
+@attr.s(kw_only=True, auto_attribs=True)
+class InputEvent:
+    step: int
+    action: InputAction
+    key: typing.Optional[int] = None
+    target: typing.Optional[arcade.Point] = None  # level coordinates for clicks
+
+
+class ScriptedInput:
+    """
+    Заранее записанная последовательность ввода, события применяются на своих шагах симуляции
+    """
+    events: typing.List[InputEvent]
+
+    _next_event: int
+
+    def __init__(self, events: typing.Iterable[InputEvent]) -> None:
+        self.events = sorted(events, key=lambda event: event.step)
+        self._next_event = 0
+
+    @classmethod
+    def from_file(cls, path: pathlib.Path) -> 'ScriptedInput':
+        """
+        JSON: [{"step": 0, "action": "key_press", "key": "D"}, {"step": 30, "action": "click", "target": [x, y]}]
+        """
+        with open(path, 'r') as script_file:
+            script = json.load(script_file)
+
+        return cls(
+            InputEvent(
+                step=event['step'],
+                action=InputAction(event['action']),
+                key=getattr(arcade.key, event['key']) if 'key' in event else None,
+                target=tuple(event['target']) if 'target' in event else None,  # type: ignore
+            )
+            for event in script
+        )
+
+    def __call__(self, simulation: HeadlessSimulation) -> None:
+        while self._next_event < len(self.events) and self.events[self._next_event].step <= simulation.step:
+            event = self.events[self._next_event]
+            self._next_event += 1
+
+            match event.action:
+                case InputAction.KEY_PRESS:
+                    simulation.press_key(typing.cast(int, event.key))
+                case InputAction.KEY_RELEASE:
+                    simulation.release_key(typing.cast(int, event.key))
+                case InputAction.CLICK:
+                    simulation.click(*typing.cast(arcade.Point, event.target))
+
+
+class RandomBot:
+    """
+    Простой бот для нагрузочных прогонов: бродит в случайных направлениях и бьёт ближайших мобов
+    """
+    rng: random.Random
+    turn_interval: int  # steps between direction changes
+    attack_range: float  # pts
+
+    _held_keys: typing.List[int]
+
+    def __init__(self, seed: typing.Optional[int] = None, turn_interval: int = 45, attack_range: float = 0.8) -> None:
+        self.rng = random.Random(seed)
+        self.turn_interval = turn_interval
+        self.attack_range = attack_range
+
+        self._held_keys = []
+
+    def __call__(self, simulation: HeadlessSimulation) -> None:
+        if simulation.step % self.turn_interval == 0:
+            self._turn(simulation)
+
+        scene = simulation.get_gameplay_scene()
+        player = scene.player_entity
+
+        mobs = scene.get_sprite_list('mobs')
+        if not mobs:
+            return
+
+        mob, distance = arcade.get_closest_sprite(player, mobs)  # type: ignore
+        if distance <= pts_to_px(self.attack_range):
+            simulation.click(mob.center_x, mob.center_y)
+
+    def _turn(self, simulation: HeadlessSimulation) -> None:
+        for key in self._held_keys:
+            simulation.release_key(key)
+
+        self._held_keys = self.rng.sample(_MOVEMENT_KEYS, self.rng.randint(0, 2))
+        for key in self._held_keys:
+            simulation.press_key(key)
@@ -0,0 +1,188 @@
+import collections
+import logging
+import random
+import time
+import typing
+
+import arcade
+import attr
+import pyglet
+
+from noname_dungeon_crawler.settings import config
+from noname_dungeon_crawler.util import set_game
+
+
+if typing.TYPE_CHECKING:
+    from noname_dungeon_crawler.scenes import GameplayScene, InteractableScene, SceneType
+
+
+log = logging.getLogger(__name__)
+
+
+Controller = typing.Callable[['HeadlessSimulation'], None]  # called before every step to feed input
+
+
+@attr.s(kw_only=True, auto_attribs=True)
+class SimulationReport:
+    steps: int
+    simulated_time: float  # seconds of game time
+    wall_time: float  # seconds of real time
+    steps_per_second: float
+
+    level: int
+    levels_completed: int
+    player_level: int
+    player_alive: bool
+
+    awake_mobs: int
+    sleeping_mobs: int
+
+    flow_field_rebuilds: int  # on the current level
+    flow_field_max_rebuild_time: float  # seconds
+
+    pending_timers: int
+
+
+class HeadlessSimulation:
+    """
+    Игровой процесс без окна и звука: сцена и таймеры обновляются с фиксированным шагом так быстро, как возможно.
+    Подменяет собой окно игры для get_game(), ввод подаётся скриптом или ботом
+    """
+    delta_time: float
+    controller: typing.Optional[Controller]
+    seed: typing.Optional[int]
+
+    scenes: typing.Dict['SceneType', 'InteractableScene']
+    active_scenes: typing.Deque['InteractableScene']
+
+    step: int
+    game_over: bool
+
+    def __init__(
+        self,
+        delta_time: float = 1 / 60,
+        controller: typing.Optional[Controller] = None,
+        seed: typing.Optional[int] = None,
+    ) -> None:
+        self.delta_time = delta_time
+        self.controller = controller  # type: ignore
+        self.seed = seed
+
+        self.scenes = {}
+        self.active_scenes = collections.deque()
+
+        self.step = 0
+        self.game_over = False
+
+    def setup(self) -> None:
+        from noname_dungeon_crawler.assets import asset_repository
+        from noname_dungeon_crawler.scenes import GameplayScene, SceneType
+
+        config.headless = True
+        pyglet.options['audio'] = ('silent',)  # The driver is picked when the first sound plays, before that
+        set_game(self)
+
+        if not asset_repository.loaded:
+            asset_repository.load_assets()
+
+        if self.seed is not None:
+            random.seed(self.seed)  # Loot and other entity behaviour use the global generator
+
+        self.scenes[SceneType.GAMEPLAY] = GameplayScene(seed=self.seed)
+        self.activate_scene(SceneType.GAMEPLAY)
+
+    def close(self) -> None:
+        scene = self.get_gameplay_scene()
+        scene.pregenerator.shutdown()
+
+        set_game(None)
+
+    def activate_scene(self, scene_type: 'SceneType', clear: bool = False) -> None:
+        from noname_dungeon_crawler.scenes import SceneType
+
+        match scene_type:
+            case SceneType.GAMEPLAY:
+                scene = self.scenes[scene_type]
+                self.active_scenes.append(scene)
+                scene.on_activate()
+
+            case SceneType.MAIN_MENU:  # Only happens when the player dies
+                self.game_over = True
+
+            case _:  # Menus (e.g. pause) do not exist in the simulation
+                pass
+
+    def deactivate_scene(self) -> None:
+        pass
+
+    def get_gameplay_scene(self) -> 'GameplayScene':
+        from noname_dungeon_crawler.scenes import SceneType
+
+        return self.scenes[SceneType.GAMEPLAY]  # type: ignore
+
+    def advance(self) -> None:
+        """
+        Один шаг симуляции с фиксированным delta_time
+        """
+        if self.controller:
+            self.controller(self)
+
+        scene = self.get_gameplay_scene()
+        scene.on_update(self.delta_time)
+        scene.update_animation(self.delta_time)
+
+        self.step += 1
+
+    def run(
+        self, steps: int, until: typing.Optional[typing.Callable[['HeadlessSimulation'], bool]] = None
+    ) -> SimulationReport:
+        scene = self.get_gameplay_scene()
+        start_level = scene.level
+        start_step = self.step
+
+        start = time.perf_counter()
+        while self.step - start_step < steps and not self.game_over:
+            self.advance()
+
+            if until is not None and until(self):
+                break
+        wall_time = time.perf_counter() - start
+
+        steps_done = self.step - start_step
+        mob_activity = scene.chunk_manager.mob_activity
+        log.info(f"Simulated {steps_done} steps in {wall_time:.2f} s")
+
+        return SimulationReport(
+            steps=steps_done,
+            simulated_time=steps_done * self.delta_time,
+            wall_time=wall_time,
+            steps_per_second=steps_done / wall_time if wall_time else 0.0,
+            level=scene.level,
+            levels_completed=scene.level - start_level,
+            player_level=scene.player_entity.level,
+            player_alive=not self.game_over,
+            awake_mobs=mob_activity.awake,
+            sleeping_mobs=mob_activity.sleeping,
+            flow_field_rebuilds=scene.flow_field.metrics.rebuilds,
+            flow_field_max_rebuild_time=scene.flow_field.metrics.max_rebuild_time,
+            pending_timers=len(scene.timers),
+        )
+
+    # Input, same entry points as the window uses
+
+    def press_key(self, symbol: int) -> None:
+        self.get_gameplay_scene().on_key_press(symbol, 0)
+
+    def release_key(self, symbol: int) -> None:
+        self.get_gameplay_scene().on_key_release(symbol, 0)
+
+    def click(self, x: float, y: float) -> None:
+        """
+        Удар оружием в точку уровня (координаты уровня, а не экрана)
+        """
+        scene = self.get_gameplay_scene()
+        cam_x, cam_y = scene._get_cam_coordinates()
+        screen_x, screen_y = int(x - cam_x), int(y - cam_y)
+
+        scene.on_mouse_press(screen_x, screen_y, arcade.MOUSE_BUTTON_LEFT, 0)
+        scene.on_mouse_release(screen_x, screen_y, arcade.MOUSE_BUTTON_LEFT, 0)
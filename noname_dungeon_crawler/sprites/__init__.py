@@ -1,10 +1,12 @@
-from .animations import AnimatedSprite, Animation
-from .entities import Chest, Door, EntityDirection, EntityState, Entity, HostileMob, LivingEntity, Player
+from .animations import AnimatedSprite, Animation, AnimationCursor, update_animations
+from .entities import Chest, Door, EntityDirection, EntityState, Entity, HostileMob, LivingEntity, MobPopulation, Player
+from .pool import PoolMetrics, SpritePool, SpritePools, sprite_pools
 
 
 __all__ = [
     'AnimatedSprite',
     'Animation',
+    'AnimationCursor',
     'Chest',
     'Door',
     'EntityDirection',
@@ -12,5 +14,11 @@ __all__ = [
     'Entity',
     'HostileMob',
     'LivingEntity',
+    'MobPopulation',
     'Player',
+    'PoolMetrics',
+    'SpritePool',
+    'SpritePools',
+    'sprite_pools',
+    'update_animations',
 ]
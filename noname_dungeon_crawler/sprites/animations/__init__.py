@@ -1,4 +1,4 @@
-from .animated_sprite import AnimatedSprite, Animation
+from .animated_sprite import AnimatedSprite, Animation, AnimationCursor, update_animations
 
 
-__all__ = ['AnimatedSprite', 'Animation']
+__all__ = ['AnimatedSprite', 'Animation', 'AnimationCursor', 'update_animations']
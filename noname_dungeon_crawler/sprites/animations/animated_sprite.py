@@ -6,22 +6,47 @@ import attr
 from ..scaled_sprite import ScaledSprite
 
 
-@attr.s(kw_only=True, auto_attribs=True)
+@attr.s(kw_only=True, auto_attribs=True, frozen=True)
 class Animation:
-    frames: typing.List[arcade.Texture]
+    """
+    Неизменяемые данные анимации (кадры и их длительность), общие для всех спрайтов одного типа.
+    Где спрайт находится в анимации, хранит его собственный AnimationCursor
+    """
+    frames: typing.Tuple[arcade.Texture, ...] = attr.ib(converter=tuple)
     rate: float  # in seconds
+
+
+@attr.s(kw_only=True, auto_attribs=True)
+class AnimationCursor:
+    animation: Animation
+    frame: int = 0
     since_last_frame: float = 0  # in seconds
 
-    _current_texture: int = 0
+    def reset(self, animation: Animation) -> None:
+        self.animation = animation
+        self.frame = 0
+        self.since_last_frame = 0
+
+    def advance(self, delta_time: float) -> typing.Optional[arcade.Texture]:
+        """
+        Продвижение на delta_time, возвращает новый кадр или None, если кадр не сменился
+        """
+        self.since_last_frame += delta_time
+        if self.since_last_frame < self.animation.rate:
+            return None
 
-    def get_next_texture(self) -> arcade.Texture:
         self.since_last_frame = 0
-        self._current_texture = self._current_texture + 1 if self._current_texture < len(self.frames) - 1 else 0
-        return self.frames[self._current_texture]
+
+        frames = self.animation.frames
+        if len(frames) < 2:
+            return None
+
+        self.frame = self.frame + 1 if self.frame < len(frames) - 1 else 0
+        return frames[self.frame]
 
 
 class AnimatedSprite(ScaledSprite):
-    animation: Animation
+    cursor: AnimationCursor
 
     def __init__(
         self,
@@ -29,18 +54,38 @@ class AnimatedSprite(ScaledSprite):
         scale: float = 1.0,
         **kwargs: typing.Any,
     ) -> None:
-        self.animation = animation
-        initial_texture = self.animation.frames[0]
+        self.cursor = AnimationCursor(animation=animation)
+        initial_texture = animation.frames[0]
         super().__init__(**kwargs, texture=initial_texture, scale=scale)
 
-    def set_animation(self, animation: Animation) -> None:
-        animation.since_last_frame = 0
-        animation._current_texture = 0
+    @property
+    def animation(self) -> Animation:
+        return self.cursor.animation
 
-        self.animation = animation
+    @property
+    def animated(self) -> bool:
+        """
+        Продвигать ли анимацию спрайта
+        """
+        return True
+
+    def set_animation(self, animation: Animation) -> None:
+        self.cursor.reset(animation)
+        self.texture = animation.frames[0]
 
     def update_animation(self, delta_time: float = 1 / 60) -> None:
-        self.animation.since_last_frame += delta_time
+        update_animations((self,), delta_time)
+
+
+def update_animations(sprites: typing.Iterable[arcade.Sprite], delta_time: float) -> None:
+    """
+    Продвижение анимаций спрайтов за один проход: у каждого спрайта свой курсор, текстура меняется только при
+    смене кадра. Спрайты без анимации пропускаются
+    """
+    for sprite in sprites:
+        if not isinstance(sprite, AnimatedSprite) or not sprite.animated:
+            continue
 
-        if self.animation.since_last_frame >= self.animation.rate:
-            self.texture = self.animation.get_next_texture()
+        texture = sprite.cursor.advance(delta_time)
+        if texture is not None:
+            sprite.texture = texture
@@ -4,7 +4,18 @@ from .entity_states import EntityDirection, EntityState
 from .entity import Entity
 from .hostile_mob import HostileMob
 from .living_entity import LivingEntity
+from .mob_population import MobPopulation
 from .player import Player
 
 
-__all__ = ['Chest', 'Door', 'EntityDirection', 'EntityState', 'Entity', 'HostileMob', 'LivingEntity', 'Player']
+__all__ = [
+    'Chest',
+    'Door',
+    'EntityDirection',
+    'EntityState',
+    'Entity',
+    'HostileMob',
+    'LivingEntity',
+    'MobPopulation',
+    'Player',
+]
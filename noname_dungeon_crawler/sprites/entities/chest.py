@@ -51,4 +51,4 @@ class Chest(Entity):
         TrinketType = random.choice(self._TRINKETS)
 
         self.set_state(EntityState.OPENED)
-        TrinketType(self.position, self.level).spawn()
+        TrinketType.acquire(self.position, self.level).spawn()
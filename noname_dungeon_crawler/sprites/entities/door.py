@@ -30,6 +30,10 @@ class Door(Entity):
 
         super().__init__(animations, scale, level)
 
+    def reset(self, level: int, is_exit: bool = False) -> None:
+        super().reset(level)
+        self.is_exit = is_exit
+
     def open(self) -> None:
         from noname_dungeon_crawler.assets import asset_repository
 
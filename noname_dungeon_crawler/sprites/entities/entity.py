@@ -5,7 +5,7 @@ import typing
 import arcade
 
 from noname_dungeon_crawler.sprites import Animation, AnimatedSprite
-from noname_dungeon_crawler.util import get_gameplay_scene, get_player, pts_to_px
+from noname_dungeon_crawler.util import get_gameplay_scene, pts_to_px
 
 from .entity_states import EntityDirection, EntityState
 
@@ -28,6 +28,8 @@ class Entity(AnimatedSprite):
 
     level: int
 
+    contact_cooldown: float = 0.0  # seconds between handled contacts with the player
+
     def __init__(
         self,
         animations: typing.Dict[EntityState, typing.Dict[EntityDirection, Animation]],
@@ -65,9 +67,36 @@ class Entity(AnimatedSprite):
 
         self.set_animation(self.animations[anim_key][self.direction])
 
+    def reset(self, level: int) -> None:
+        """
+        Возврат в исходное состояние для повторного использования из пула спрайтов
+        """
+        self.level = level
+
+        self.direction = EntityDirection.RIGHT
+        self.state = EntityState.IDLE
+        self.set_animation(self.animations[self.state][self.direction])
+
+        self.color = arcade.color.WHITE
+        self.angle = 0
+        self.change_x = 0
+        self.change_y = 0
+
     def get_copy(self) -> 'Entity':
         return self.__class__(animations=self.animations, scale=self.sprite_scale)
 
+    def on_contact_enter(self, player: 'Player') -> bool:
+        """
+        События контакта с игроком (от ContactTracker), True - контакт обработан
+        """
+        return self.on_contact_stay(player)
+
+    def on_contact_stay(self, player: 'Player') -> bool:
+        return False
+
+    def on_contact_exit(self, player: 'Player') -> None:
+        pass
+
     @classmethod
     def args_from_config(cls, entity_config: dict) -> typing.Tuple[str, dict]:
         from noname_dungeon_crawler.assets import asset_repository
@@ -80,13 +109,11 @@ class Entity(AnimatedSprite):
                 rate=animation_config['rate'],
             )
 
-            try:  # Also try to load flipped texture (if exists)
-                animations[EntityState[animation_config['state']]][EntityDirection.LEFT] = Animation(
-                    frames=asset_repository.get_animated_texture(f"{animation_config['name']}_flipped"),
-                    rate=animation_config['rate'],
-                )
-            except KeyError:
-                pass
+            # Flipped frames are made on request, so every animation has them
+            animations[EntityState[animation_config['state']]][EntityDirection.LEFT] = Animation(
+                frames=asset_repository.get_animated_texture(f"{animation_config['name']}_flipped"),
+                rate=animation_config['rate'],
+            )
 
         return entity_config['name'], {'animations': dict(animations), 'scale': entity_config['sprite_scale']}
 
@@ -98,8 +125,6 @@ class MovingEntity(Entity):
     has_direction: bool
     has_physics: bool
 
-    physics_engine: typing.Optional[arcade.PhysicsEngineSimple]
-
     def __init__(
         self,
         animations: typing.Dict[EntityState, typing.Dict[EntityDirection, Animation]],
@@ -116,6 +141,10 @@ class MovingEntity(Entity):
     def on_update(self, delta_time: float = 1 / 60) -> None:
         self._move(delta_time)
 
+    def reset(self, level: int) -> None:
+        super().reset(level)
+        self.movement_vector = [0, 0]
+
     def _move(self, delta_time: float) -> None:
         self.on_move(delta_time)
 
@@ -142,12 +171,6 @@ class MovingEntity(Entity):
             self.center_x += math.cos(angle) * speed
             self.center_y += math.sin(angle) * speed
 
-        player = get_player()
-        collision = arcade.check_for_collision(self, player)
-
-        if collision:
-            self.on_player_collision(player)
-
     def remove_from_sprite_lists(self) -> None:
         if self.has_physics:
             get_gameplay_scene().remove_physics_engine(self)
@@ -16,10 +16,45 @@ if typing.TYPE_CHECKING:
     from .player import Player
 
 
-_PATHFINDING_RANGE = 3
+PATHFINDING_RANGE = 3
 
 
 class HostileMob(LivingEntity):
+    asleep: bool = False  # set by the room chunk manager, a sleeping mob is neither updated nor animated
+    batched: bool = False  # set by MobPopulation, which moves the mob while it is idle or moving
+
+    def on_update(self, delta_time: float = 1 / 60) -> None:
+        if self.asleep:
+            return
+        if self.batched and self.state in (EntityState.IDLE, EntityState.MOVING):
+            return
+
+        super().on_update(delta_time)
+
+    @property
+    def animated(self) -> bool:
+        return not self.asleep
+
+    def reset(self, level: int) -> None:
+        super().reset(level)
+        self.asleep = False
+
+    @property
+    def contact_cooldown(self) -> float:  # type: ignore
+        return config.constants.ATTACK_TTL
+
+    def on_contact_stay(self, player: 'Player') -> bool:
+        # Attacks start from the same states as before: not while attacking, hurt or dying
+        if self.asleep or self.state not in (EntityState.IDLE, EntityState.MOVING):
+            return False
+
+        self.on_player_collision(player)
+        return True
+
+    def can_sleep(self) -> bool:
+        # Other states are finished by timers or need updates to play out (e.g. dying)
+        return self.state in (EntityState.IDLE, EntityState.MOVING)
+
     def on_move(self, delta_time: float) -> None:
         player = get_player()
 
@@ -27,20 +62,20 @@ class HostileMob(LivingEntity):
         target = typing.cast(typing.Tuple[float, float], player.position)
 
         # Cancel pathfinding when not in range
-        if not point_in_eps(source, target, pts_to_px(_PATHFINDING_RANGE)):
+        if not point_in_eps(source, target, pts_to_px(PATHFINDING_RANGE)):
             self.movement_vector = [0, 0]
             return
 
-        self.movement_vector = [target[0] - source[0], target[1] - source[1]]
+        # Walls are walked around along the flow field, next to the player it is approached directly
+        waypoint = get_gameplay_scene().flow_field.next_point(*source) or target
+        self.movement_vector = [waypoint[0] - source[0], waypoint[1] - source[1]]
 
     def on_player_collision(self, player: 'Player') -> None:
         self.set_state(EntityState.ATTACKING, animation_key=EntityState.IDLE)
         self.change_x = 0
         self.change_y = 0
 
-        get_gameplay_scene().add_timer(
-            Timer(config.constants.ATTACK_TTL, functools.partial(self.set_state, EntityState.IDLE))
-        )
+        self._add_state_timer(Timer(config.constants.ATTACK_TTL, functools.partial(self.set_state, EntityState.IDLE)))
 
         if 'attack' in self.sounds:
             arcade.play_sound(self.sounds['attack'], volume=config.music_volume)
@@ -48,10 +83,10 @@ class HostileMob(LivingEntity):
         player.take_damage(self)
 
     def on_death(self, attacker: 'LivingEntity') -> None:
-        ExpTrinket(self.position, self.level).spawn()
+        ExpTrinket.acquire(self.position, self.level).spawn()
 
         if random.uniform(0, 1) <= config.constants.MOB_HEALING_DROP_CHANCE:
-            HealingTrinket(self.position, self.level).spawn()
+            HealingTrinket.acquire(self.position, self.level).spawn()
 
     def scale_stats(self) -> None:
         self.max_health *= self.level
@@ -19,6 +19,9 @@ class LivingEntity(MovingEntity):
     behavior_meta: typing.Dict[str, typing.Any]
     sounds: typing.Dict[str, arcade.Sound]
 
+    _base_stats: typing.Tuple[float, float, float]  # max health, damage, movement speed before level scaling
+    _state_timers: typing.List[Timer]  # pending timers that change this entity, cancelled when it is reused
+
     def __init__(
         self,
         max_health: float,
@@ -42,6 +45,9 @@ class LivingEntity(MovingEntity):
         self.behavior_meta = {}
         self.sounds = sounds
 
+        self._base_stats = (max_health, damage, movement_speed)
+        self._state_timers = []
+
     def heal(self, health: float) -> None:
         self._health = min(self._health + health, self.max_health)
 
@@ -75,7 +81,21 @@ class LivingEntity(MovingEntity):
         self.set_state(EntityState.ATTACKED, animation_key=EntityState.IDLE)
         self.color = (255, 0, 0)
 
-        get_gameplay_scene().add_timer(Timer(config.constants.DAMAGE_TTL, callback=_restore_state))
+        self._add_state_timer(Timer(config.constants.DAMAGE_TTL, callback=_restore_state))
+
+    def reset(self, level: int) -> None:
+        super().reset(level)
+
+        self.max_health, self.damage, self.movement_speed = self._base_stats
+        self._health = self.max_health
+        self.behavior_meta = {}
+
+        # A pooled sprite must not be changed by timers of its previous life (e.g. removed by its death timer)
+        for timer in self._state_timers:
+            timer.cancel()
+        self._state_timers.clear()
+
+        self.set_level(level)
 
     def set_max_health(self, new_health: float) -> None:
         factor = new_health / self.max_health
@@ -91,7 +111,7 @@ class LivingEntity(MovingEntity):
         self.set_state(EntityState.DYING, animation_key=EntityState.IDLE)
         self.color = (255, 0, 0)
 
-        get_gameplay_scene().add_timer(Timer(config.constants.DEATH_TTL, callback=self.remove_from_sprite_lists))
+        self._add_state_timer(Timer(config.constants.DEATH_TTL, callback=self.remove_from_sprite_lists))
 
     def on_update(self, delta_time: float = 1 / 60) -> None:
         match self.state:
@@ -114,6 +134,10 @@ class LivingEntity(MovingEntity):
         angle = 90 * delta_time / (config.constants.DEATH_TTL * config.constants.SCALE)
         self.turn_right(angle)
 
+    def _add_state_timer(self, timer: Timer) -> None:
+        self._state_timers = [state_timer for state_timer in self._state_timers if not state_timer.finished]
+        self._state_timers.append(get_gameplay_scene().add_timer(timer))
+
     def draw_hp_bar(self) -> None:
         if self.state != EntityState.ATTACKED:
             return
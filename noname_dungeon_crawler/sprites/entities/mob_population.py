@@ -0,0 +1,190 @@
+import array
+import math
+import typing
+
+from noname_dungeon_crawler.util import pts_to_px
+
+from .entity_states import EntityDirection, EntityState
+from .hostile_mob import PATHFINDING_RANGE, HostileMob
+
+
+if typing.TYPE_CHECKING:
+    from noname_dungeon_crawler.physics import FlowField
+
+    from .player import Player
+
+
+_STEERED_STATES = (EntityState.IDLE, EntityState.MOVING)
+_TURN_COS = math.cos(1.6)  # MovingEntity turns right when abs(atan2(y, x)) < 1.6, i.e. when cos(angle) > cos(1.6)
+
+
+class MobPopulation:
+    """
+    Пакетное движение враждебных мобов. Состояние всех мобов хранится в плоских массивах (структура массивов):
+    проверка дистанции до игрока, векторы движения и смещения считаются одним проходом по всей популяции,
+    затем в спрайты записывается только то, что изменилось. Путь в обход стен берётся из общего поля направлений.
+    Контакты с игроком обрабатывает ContactTracker
+    """
+    mobs: typing.List[HostileMob]
+
+    xs: array.array
+    ys: array.array
+    speeds: array.array  # pts / second
+
+    steered: array.array  # 1 when the mob is idle or moving, other states are driven by timers
+    chasing: array.array  # 1 when the player is within the pathfinding range
+    change_xs: array.array
+    change_ys: array.array
+
+    _index: typing.Dict[HostileMob, int]
+
+    def __init__(self) -> None:
+        self.mobs = []
+
+        self.xs = array.array('d')
+        self.ys = array.array('d')
+        self.speeds = array.array('d')
+
+        self.steered = array.array('b')
+        self.chasing = array.array('b')
+        self.change_xs = array.array('d')
+        self.change_ys = array.array('d')
+
+        self._index = {}
+
+    def __len__(self) -> int:
+        return len(self.mobs)
+
+    def __contains__(self, mob: HostileMob) -> bool:
+        return mob in self._index
+
+    def add(self, mob: HostileMob) -> None:
+        if mob in self._index:
+            return
+
+        self._index[mob] = len(self.mobs)
+        self.mobs.append(mob)
+
+        self.xs.append(mob.center_x)
+        self.ys.append(mob.center_y)
+        self.speeds.append(mob.movement_speed)
+
+        self.steered.append(0)
+        self.chasing.append(0)
+        self.change_xs.append(0.0)
+        self.change_ys.append(0.0)
+
+        mob.batched = True
+
+    def remove(self, mob: HostileMob) -> None:
+        idx = self._index.pop(mob, None)
+        if idx is None:
+            return
+
+        mob.batched = False
+
+        # The last mob takes the free slot, so every column stays dense
+        last_idx = len(self.mobs) - 1
+        last_mob = self.mobs.pop()
+
+        for column in self._columns():
+            value = column.pop()
+            if idx != last_idx:
+                column[idx] = value
+
+        if idx != last_idx:
+            self.mobs[idx] = last_mob
+            self._index[last_mob] = idx
+
+    def clear(self) -> None:
+        for mob in self.mobs:
+            mob.batched = False
+
+        self.mobs.clear()
+        self._index.clear()
+
+        for column in self._columns():
+            del column[:]
+
+    def step(self, player: 'Player', delta_time: float, flow_field: typing.Optional['FlowField'] = None) -> None:
+        """
+        Один шаг для всех мобов: вместо MovingEntity._move каждого моба по отдельности
+        """
+        count = len(self.mobs)
+        if not count:
+            return
+
+        # Gather: physics moved the sprites since the last step
+        xs, ys, steered = self.xs, self.ys, self.steered
+        for idx, mob in enumerate(self.mobs):
+            xs[idx], ys[idx] = mob.position
+            steered[idx] = mob.state in _STEERED_STATES
+
+        # Compute: aggro test, steering and displacement over the columns only
+        target_x, target_y = player.position
+        aggro_range = pts_to_px(PATHFINDING_RANGE)
+        px_per_pts = pts_to_px(1) * delta_time
+
+        speeds, chasing, change_xs, change_ys = self.speeds, self.chasing, self.change_xs, self.change_ys
+
+        facing_right = array.array('b', bytes(count))
+
+        for idx in range(count):
+            if not steered[idx]:
+                continue
+
+            dx = target_x - xs[idx]
+            dy = target_y - ys[idx]
+
+            if abs(dx) > aggro_range or abs(dy) > aggro_range or not (dx or dy):
+                chasing[idx] = 0
+                change_xs[idx] = change_ys[idx] = 0.0
+                continue
+
+            # Walls are walked around along the flow field, next to the player it is approached directly
+            waypoint = flow_field.next_point(xs[idx], ys[idx]) if flow_field is not None else None
+            if waypoint is not None:
+                dx = waypoint[0] - xs[idx]
+                dy = waypoint[1] - ys[idx]
+                if not (dx or dy):
+                    dx, dy = target_x - xs[idx], target_y - ys[idx]
+
+            length = math.hypot(dx, dy)
+            factor = speeds[idx] * px_per_pts / length
+
+            chasing[idx] = 1
+            change_xs[idx] = dx * factor
+            change_ys[idx] = dy * factor
+            facing_right[idx] = dx > _TURN_COS * length
+
+        # Write back: idle mobs far from the player are left untouched
+        for idx, mob in enumerate(self.mobs):
+            if not steered[idx]:
+                continue
+
+            if not chasing[idx]:
+                if mob.state != EntityState.IDLE or mob.change_x or mob.change_y:
+                    mob.movement_vector = [0, 0]
+                    mob.set_state(EntityState.IDLE)
+                    mob.change_x = 0
+                    mob.change_y = 0
+                continue
+
+            mob.movement_vector = [change_xs[idx], change_ys[idx]]
+            if mob.state == EntityState.IDLE:
+                mob.set_state(EntityState.MOVING)
+            mob.set_direction(EntityDirection.RIGHT if facing_right[idx] else EntityDirection.LEFT)
+
+            mob.change_x = change_xs[idx]
+            mob.change_y = change_ys[idx]
+
+    def _columns(self) -> typing.Tuple[array.array, ...]:
+        return (
+            self.xs,
+            self.ys,
+            self.speeds,
+            self.steered,
+            self.chasing,
+            self.change_xs,
+            self.change_ys,
+        )
@@ -4,6 +4,7 @@ import typing
 
 import arcade
 
+from noname_dungeon_crawler.physics import sweep
 from noname_dungeon_crawler.settings import config
 from noname_dungeon_crawler.util import Timer, get_angle, get_game, get_gameplay_scene, pts_to_px
 
@@ -11,56 +12,60 @@ from .door import Door
 from .entity_states import EntityState
 from .living_entity import LivingEntity
 
+from ..pool import sprite_pools
 from ..scaled_sprite import ScaledSprite
 
 
 class PlayerWeapon(ScaledSprite):
+    """
+    Взмах оружия: каждый кадр путь клинка с прошлого кадра проверяется одним запросом к пространственному хешу
+    препятствий (мобы, сундуки, двери)
+    """
     player: LivingEntity
     attack_angle: float
+    targets: arcade.SpriteList  # must use a spatial hash
 
     _since_created: float
     _hit_enemies: typing.Set[arcade.Sprite]
+    _swept_to: typing.Optional[arcade.Point]  # blade center at the end of the last checked sweep
 
-    def __init__(
-        self,
-        player: LivingEntity,
-        target_point: typing.Tuple[float, float],
-        enemies: arcade.SpriteList,
-        chests: arcade.SpriteList,
-        doors: arcade.SpriteList,
-        **kwargs: typing.Any,
-    ) -> None:
+    _SCALE = 0.25
+
+    def __init__(self, **kwargs: typing.Any) -> None:
         from noname_dungeon_crawler.assets import asset_repository
 
+        texture = asset_repository.get_static_texture('weapon_regular_sword')
+        super().__init__(**kwargs, texture=texture, scale=self._SCALE)
+
+    @classmethod
+    def acquire(
+        cls, player: LivingEntity, target_point: typing.Tuple[float, float], targets: arcade.SpriteList
+    ) -> 'PlayerWeapon':
+        weapon = sprite_pools.acquire('player_weapon', cls)
+        weapon.reset(player, target_point, targets)
+
+        return weapon
+
+    def reset(self, player: LivingEntity, target_point: typing.Tuple[float, float], targets: arcade.SpriteList) -> None:
         self.player = player
-        self.enemies = enemies
-        self.chests = chests
-        self.doors = doors
+        self.targets = targets
 
         self._since_created = 0
         self._hit_enemies = set()
-
-        texture = asset_repository.get_static_texture('weapon_regular_sword')
-        scale = 0.25
+        self._swept_to = None
 
         self.attack_angle = get_angle(typing.cast(typing.Tuple[float, float], player.position), target_point)
-        center_x = player.center_x + math.cos(self.attack_angle) * scale
-        center_y = player.center_y + math.sin(self.attack_angle) * scale
-
-        super().__init__(
-            **kwargs,
-            texture=texture,
-            scale=scale,
-            angle=math.degrees(self.attack_angle) - 90,
-            center_x=center_x,
-            center_y=center_y,
-        )
+        self.angle = math.degrees(self.attack_angle) - 90
+        self.center_x = player.center_x + math.cos(self.attack_angle) * self._SCALE
+        self.center_y = player.center_y + math.sin(self.attack_angle) * self._SCALE
 
     def on_update(self, delta_time: float = 1 / 60) -> None:
         from .chest import Chest
+        from .hostile_mob import HostileMob
 
         if self._since_created >= config.constants.ATTACK_TTL:
-            self.remove_from_sprite_lists()
+            sprite_pools.release(self)
+            return
 
         speed = pts_to_px(config.constants.PLAYER_WEAPON_SWING_SPEED)
 
@@ -73,24 +78,37 @@ class PlayerWeapon(ScaledSprite):
 
         self._since_created += delta_time
 
-        for enemy in arcade.check_for_collision_with_list(self, self.enemies):
-            enemy = typing.cast(LivingEntity, enemy)
+        for target in self._sweep((HostileMob, Chest, Door)):
+            match target:
+                case HostileMob():
+                    if target in self._hit_enemies:
+                        continue
+                    self._hit_enemies.add(target)
+
+                    target.take_damage(self.player)
+
+                case Chest():
+                    if target.state == EntityState.IDLE:
+                        target.unlock()
 
-            if enemy in self._hit_enemies:
-                continue
-            self._hit_enemies.add(enemy)
+                case Door():
+                    target.open()
 
-            enemy.take_damage(self.player)
+    def _sweep(self, kinds: typing.Tuple[type, ...]) -> typing.List[arcade.Sprite]:
+        """
+        Цели на пути клинка с прошлого кадра: от хвоста клинка в прошлом положении до острия в текущем
+        """
+        swept_from = self._swept_to or self.position
+        self._swept_to = self.position
 
-        for chest in arcade.check_for_collision_with_list(self, self.chests):
-            chest = typing.cast(Chest, chest)
+        # The blade points along the attack direction, its texture is upright before rotation
+        half_length = self.texture.height * self.scale / 2
+        direction_x, direction_y = math.cos(self.attack_angle), math.sin(self.attack_angle)
 
-            if chest.state == EntityState.IDLE:
-                chest.unlock()
+        start = (swept_from[0] - direction_x * half_length, swept_from[1] - direction_y * half_length)
+        end = (self.center_x + direction_x * half_length, self.center_y + direction_y * half_length)
 
-        for door in arcade.check_for_collision_with_list(self, self.doors):
-            door = typing.cast(Door, door)
-            door.open()
+        return sweep(self.targets, start, end, self.texture.width * self.scale / 2, kinds)
 
 
 class Player(LivingEntity):
@@ -111,16 +129,7 @@ class Player(LivingEntity):
 
             arcade.play_sound(asset_repository.get_sound_effect('player_weapon_swing'), volume=config.music_volume)
 
-            scene.add_sprite(
-                'weapon',
-                PlayerWeapon(
-                    self,
-                    (x, y),
-                    scene.get_sprite_list('mobs'),
-                    scene.get_sprite_list('chests'),
-                    scene.get_sprite_list('doors'),
-                ),
-            )
+            scene.add_sprite('weapon', PlayerWeapon.acquire(self, (x, y), scene.get_sprite_list('impassable')))
             self.behavior_meta['attacking'] = True
 
             def _reset_attack_stance() -> None:
@@ -1,6 +1,7 @@
 import functools
 import math
 import random
+import typing
 
 import arcade
 
@@ -8,6 +9,7 @@ from noname_dungeon_crawler.settings import config
 from noname_dungeon_crawler.sprites import Animation
 from noname_dungeon_crawler.util import Timer, get_angle, get_gameplay_scene, get_player, get_vector_from_angle
 
+from ..pool import sprite_pools
 from .entity import MovingEntity
 from .entity_states import EntityDirection, EntityState
 from .player import Player
@@ -17,15 +19,30 @@ class Trinket(MovingEntity):
     origin: arcade.Point
     is_timed: bool
 
+    _pick_up_timer: typing.Optional[Timer]  # pending while dropping, cancelled when the trinket is reused
+
     def __init__(
         self, origin: arcade.Point, level: int, animation: Animation, is_timed: bool = True, scale: float = 0.3
     ) -> None:
         self.origin = origin
         self.is_timed = is_timed
+        self._pick_up_timer = None
 
         animations = {EntityState.IDLE: {EntityDirection.RIGHT: animation}}
         super().__init__(animations, scale, has_direction=False, has_physics=False, level=level)
 
+    @classmethod
+    def acquire(cls, origin: arcade.Point, level: int) -> 'Trinket':
+        trinket = sprite_pools.acquire(cls.__name__, functools.partial(cls, origin, level))
+        trinket.reset(level)
+        trinket.origin = origin
+
+        return trinket
+
+    def reset(self, level: int) -> None:
+        super().reset(level)
+        self._cancel_pick_up()
+
     def spawn(self) -> None:
         self.position = self.origin
 
@@ -44,7 +61,7 @@ class Trinket(MovingEntity):
             self.movement_speed = config.constants.TRINKET_MOVEMENT_SPEED
             self.set_state(EntityState.PICKED_UP)
 
-        scene.add_timer(Timer(scatter_delay, callback=_pick_up))
+        self._pick_up_timer = scene.add_timer(Timer(scatter_delay, callback=_pick_up))
 
     def apply_effect(self, player: Player) -> None:
         from noname_dungeon_crawler.assets import asset_repository
@@ -52,22 +69,39 @@ class Trinket(MovingEntity):
         arcade.play_sound(asset_repository.get_sound_effect('trinket_pickup'))
         if self.is_timed:
             get_gameplay_scene().add_timer(
-                Timer(config.constants.TRINKET_DURATION, functools.partial(self.remove_effect, player))
+                Timer(config.constants.TRINKET_DURATION, functools.partial(self._expire_effect, player))
             )
 
     def remove_effect(self, player: Player) -> None:
         raise NotImplementedError()
 
+    def _expire_effect(self, player: Player) -> None:
+        self.remove_effect(player)
+        sprite_pools.release(self)  # The effect no longer needs the trinket, it can be reused
+
+    def _cancel_pick_up(self) -> None:
+        if self._pick_up_timer is not None:
+            self._pick_up_timer.cancel()
+            self._pick_up_timer = None
+
     def on_move(self, delta_time: float) -> None:
         if self.state == EntityState.PICKED_UP:
             player = get_player()
             angle = get_angle(self.position, player.position)
             self.movement_vector = get_vector_from_angle(angle)
 
+    def on_contact_stay(self, player: Player) -> bool:
+        self.on_player_collision(player)
+        return True
+
     def on_player_collision(self, player: Player) -> None:  # type: ignore
+        self._cancel_pick_up()  # Touched while still dropping
         self.apply_effect(player)
         self.remove_from_sprite_lists()
 
+        if not self.is_timed:
+            sprite_pools.release(self)
+
 
 class SpeedPotion(Trinket):
     def __init__(self, origin: arcade.Point, level: int) -> None:
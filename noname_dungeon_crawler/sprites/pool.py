@@ -0,0 +1,108 @@
+import logging
+import typing
+
+import arcade
+import attr
+
+from noname_dungeon_crawler.settings import config
+
+
+log = logging.getLogger(__name__)
+
+
+SpriteType = typing.TypeVar('SpriteType', bound=arcade.Sprite)
+
+
+@attr.s(kw_only=True, auto_attribs=True)
+class PoolMetrics:
+    hits: int = 0  # sprite was reused
+    misses: int = 0  # pool was empty, a new sprite was created
+    releases: int = 0  # sprite was returned to the pool
+    discards: int = 0  # sprite was returned to a full pool and left to the garbage collector
+
+    free: int = 0  # sprites currently waiting in the pool
+    peak_free: int = 0
+
+
+class SpritePool(typing.Generic[SpriteType]):
+    """
+    Пул спрайтов одного типа: вместо создания нового спрайта переиспользуется ранее возвращённый.
+    Сброс состояния переиспользованного спрайта - на вызывающей стороне
+    """
+    key: str
+    factory: typing.Callable[[], SpriteType]
+    max_size: int
+
+    metrics: PoolMetrics
+
+    _free: typing.List[SpriteType]
+
+    def __init__(self, key: str, factory: typing.Callable[[], SpriteType], max_size: int) -> None:
+        self.key = key
+        self.factory = factory  # type: ignore
+        self.max_size = max_size
+
+        self.metrics = PoolMetrics()
+
+        self._free = []
+
+    def acquire(self) -> SpriteType:
+        if self._free:
+            self.metrics.hits += 1
+            sprite = self._free.pop()
+        else:
+            self.metrics.misses += 1
+            sprite = self.factory()  # type: ignore
+            sprite.pool_key = self.key  # type: ignore
+
+        self.metrics.free = len(self._free)
+        return sprite
+
+    def release(self, sprite: SpriteType) -> None:
+        # Base implementation on purpose: entities also drop their physics engines, the caller takes care of that
+        arcade.Sprite.remove_from_sprite_lists(sprite)
+
+        if len(self._free) >= self.max_size:
+            self.metrics.discards += 1
+            return
+
+        self.metrics.releases += 1
+        self._free.append(sprite)
+
+        self.metrics.free = len(self._free)
+        self.metrics.peak_free = max(self.metrics.peak_free, self.metrics.free)
+
+
+class SpritePools:
+    """
+    Набор пулов спрайтов по ключам (тайлы, мобы по типам, сундуки, двери, оружие, трофеи)
+    """
+    _pools: typing.Dict[str, SpritePool]
+
+    def __init__(self) -> None:
+        self._pools = {}
+
+    def acquire(self, key: str, factory: typing.Callable[[], SpriteType]) -> SpriteType:
+        if key not in self._pools:
+            self._pools[key] = SpritePool(key, factory, config.constants.SPRITE_POOL_MAX_SIZE)
+
+        return self._pools[key].acquire()
+
+    def release(self, sprite: arcade.Sprite) -> None:
+        """
+        Возврат спрайта в пул, из которого он был взят (спрайты не из пула игнорируются)
+        """
+        key = getattr(sprite, 'pool_key', None)
+        if key is not None:
+            self._pools[key].release(sprite)
+
+    @property
+    def metrics(self) -> typing.Dict[str, PoolMetrics]:
+        return {key: pool.metrics for key, pool in self._pools.items()}
+
+    def log_metrics(self) -> None:
+        for key, metrics in self._pools.items():
+            log.debug(f"Sprite pool {key}: {metrics}")
+
+
+sprite_pools = SpritePools()
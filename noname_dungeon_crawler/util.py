@@ -1,4 +1,6 @@
+import heapq
 import math
+import time
 import typing
 
 import arcade
@@ -14,26 +16,175 @@ if typing.TYPE_CHECKING:
 
 
 class Timer:
+    """
+    Отложенный вызов; планируется в TimerScheduler, который и вызывает callback по истечении duration секунд.
+    Запланированный таймер можно отменить
+    """
     duration: float
     callback: typing.Callable[[], None]
+    due_time: typing.Optional[float]  # scheduler time of the call, None until scheduled
 
-    _elapsed: float
+    _fired: bool
+    _cancelled: bool
+    _scheduler: typing.Optional['TimerScheduler']
 
     def __init__(self, duration: float, callback: typing.Callable[[], None]) -> None:
         self.duration = duration
         self.callback = callback  # type: ignore
+        self.due_time = None
 
-        self._elapsed = 0
-
-    def update(self, delta_time: float) -> None:
-        self._elapsed += delta_time
+        self._fired = False
+        self._cancelled = False
+        self._scheduler = None
 
+    def cancel(self) -> None:
         if self.finished:
-            self.callback()  # type: ignore
+            return
+
+        self._cancelled = True
+        if self._scheduler is not None:
+            self._scheduler._on_cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
 
     @property
     def finished(self) -> bool:
-        return self._elapsed >= self.duration
+        return self._fired or self._cancelled
+
+
+class TimerScheduler:
+    """
+    Таймеры в двоичной куче по абсолютному времени срабатывания: за кадр просматриваются только сработавшие,
+    так что стоимость кадра не растёт с числом ожидающих таймеров. Отменённые таймеры удаляются из кучи лениво
+    """
+    time: float  # seconds since the scheduler was created
+
+    _heap: typing.List[typing.Tuple[float, int, Timer]]  # due time, scheduling order (keeps ties in order), timer
+    _sequence: int
+    _cancelled: int  # cancelled timers still in the heap
+
+    def __init__(self) -> None:
+        self.time = 0.0
+
+        self._heap = []
+        self._sequence = 0
+        self._cancelled = 0
+
+    def __len__(self) -> int:
+        """
+        Число ожидающих таймеров
+        """
+        return len(self._heap) - self._cancelled
+
+    def schedule(self, timer: Timer) -> Timer:
+        if timer.finished or timer.due_time is not None:
+            raise ValueError("Timer can only be scheduled once")
+
+        timer.due_time = self.time + timer.duration
+        timer._scheduler = self
+
+        heapq.heappush(self._heap, (timer.due_time, self._sequence, timer))
+        self._sequence += 1
+
+        return timer
+
+    def call_later(self, delay: float, callback: typing.Callable[[], None]) -> Timer:
+        return self.schedule(Timer(delay, callback))
+
+    def update(self, delta_time: float) -> None:
+        self.time += delta_time
+
+        # Timers scheduled by callbacks are fired in the same update when they are already due
+        heap = self._heap
+        while heap and heap[0][0] <= self.time:
+            _, _, timer = heapq.heappop(heap)
+
+            if timer.cancelled:
+                self._cancelled -= 1
+                continue
+
+            timer._fired = True
+            timer.callback()  # type: ignore
+
+    def _on_cancel(self) -> None:
+        self._cancelled += 1
+
+        # Cancelled timers only leave the heap when due, long ones are dropped at once if too many pile up.
+        # The heap is compacted in place, update() may be popping from it while a callback cancels timers
+        if self._cancelled > len(self._heap) // 2:
+            self._heap[:] = [entry for entry in self._heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+
+class FixedTimestep:
+    """
+    Накопитель времени кадров для симуляции с постоянным шагом: за кадр выполняется столько шагов, сколько
+    накопилось, но не больше max_ticks - остаток отбрасывается, и после долгого кадра игра замедляется,
+    а не делает огромный шаг или лавину догоняющих шагов
+    """
+    tick: float  # seconds per simulation step
+    max_ticks: int
+    accumulator: float  # seconds not simulated yet, less than a tick after advance()
+
+    def __init__(self, tick_rate: float, max_ticks: int) -> None:
+        self.tick = 1 / tick_rate
+        self.max_ticks = max_ticks
+        self.accumulator = 0.0
+
+    def advance(self, delta_time: float) -> int:
+        """
+        Число шагов симуляции, которые нужно выполнить за кадр длиной delta_time
+        """
+        self.accumulator += delta_time
+
+        ticks = min(int(self.accumulator / self.tick), self.max_ticks)
+        self.accumulator -= ticks * self.tick
+
+        if ticks == self.max_ticks and self.accumulator >= self.tick:
+            self.accumulator = 0.0
+
+        return ticks
+
+    @property
+    def alpha(self) -> float:
+        """
+        Доля следующего шага, прошедшая к текущему моменту (для отрисовки между двумя шагами)
+        """
+        return self.accumulator / self.tick
+
+
+class StartupProfile:
+    """
+    Разбивка времени запуска по этапам: каждый этап длится от предыдущей отметки до своей
+    """
+    phases: typing.List[typing.Tuple[str, float]]  # phase name, seconds
+
+    _start: float
+    _last_mark: float
+
+    def __init__(self, start: float) -> None:
+        self.phases = []
+
+        self._start = start
+        self._last_mark = start
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last_mark))
+        self._last_mark = now
+
+    @property
+    def total_time(self) -> float:
+        return self._last_mark - self._start
+
+    def format(self) -> str:
+        lines = [f"{phase:<16} {phase_time * 1000:8.1f} ms" for phase, phase_time in self.phases]
+        lines.append(f"{'total':<16} {self.total_time * 1000:8.1f} ms")
+
+        return '\n'.join(lines)
 
 
 def pts_to_px(pts: float) -> float:
@@ -74,9 +225,23 @@ def point_in_eps(
     return abs(source_point[0] - target_point[0]) <= eps and abs(source_point[1] - target_point[1]) <= eps
 
 
+_game_override: typing.Optional[typing.Any] = None
+
+
+def set_game(game: typing.Optional[typing.Any]) -> None:
+    """
+    Подмена окна игры объектом с тем же интерфейсом (например, симуляцией без окна)
+    """
+    global _game_override
+    _game_override = game
+
+
 def get_game() -> 'NonameDungeonCrawler':
     from .game import NonameDungeonCrawler
 
+    if _game_override is not None:
+        return _game_override  # type: ignore
+
     return NonameDungeonCrawler.get_instance()
 
 
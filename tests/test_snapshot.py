@@ -0,0 +1,87 @@
+import pathlib
+
+import pytest
+
+from noname_dungeon_crawler.settings import config
+
+config.headless = True
+
+from noname_dungeon_crawler.assets import asset_repository  # noqa: E402
+from noname_dungeon_crawler.level_generator import (  # noqa: E402
+    LevelBlueprint,
+    LevelGenerator,
+    LevelPregenerator,
+    SnapshotError,
+    load_snapshot,
+    save_snapshot,
+)
+from noname_dungeon_crawler.level_generator.snapshot import SNAPSHOT_VERSION  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def blueprint() -> LevelBlueprint:
+    if not asset_repository.loaded:  # The generator takes textures and entities from the repository
+        asset_repository.load_assets()
+
+    return LevelGenerator(level=2, seed=42).generate_blueprint()
+
+
+@pytest.fixture
+def snapshot_path(blueprint: LevelBlueprint, tmp_path: pathlib.Path) -> pathlib.Path:
+    path = tmp_path / 'level_2.ndcl'
+    save_snapshot(blueprint, path)
+    return path
+
+
+def _patch_header(path: pathlib.Path, offset: int, data: bytes) -> None:
+    with open(path, 'r+b') as f:
+        f.seek(offset)
+        f.write(data)
+
+
+def test_snapshot_round_trip(blueprint: LevelBlueprint, snapshot_path: pathlib.Path) -> None:
+    loaded = load_snapshot(snapshot_path)
+
+    assert loaded.level == blueprint.level
+    assert loaded.starting_coords == blueprint.starting_coords
+    assert list(loaded.floor.cells()) == list(blueprint.floor.cells())
+    assert list(loaded.walls.cells()) == list(blueprint.walls.cells())
+    assert loaded.mobs == blueprint.mobs
+    assert loaded.chests == blueprint.chests
+    assert loaded.doors == blueprint.doors
+
+
+@pytest.mark.parametrize(
+    'offset, data',
+    [
+        (0, b'XXXX'),  # magic
+        (4, (SNAPSHOT_VERSION + 1).to_bytes(2, 'little')),  # version
+    ],
+    ids=['magic', 'version'],
+)
+def test_foreign_snapshot_is_rejected(snapshot_path: pathlib.Path, offset: int, data: bytes) -> None:
+    _patch_header(snapshot_path, offset, data)
+
+    with pytest.raises(SnapshotError):
+        load_snapshot(snapshot_path)
+
+
+def test_pregenerator_generates_level_when_snapshot_is_rejected(
+    snapshot_path: pathlib.Path,
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    _patch_header(snapshot_path, 4, (SNAPSHOT_VERSION + 1).to_bytes(2, 'little'))
+    monkeypatch.setattr(config.constants, 'LEVEL_SNAPSHOT_DIR', tmp_path)
+
+    pregenerator = LevelPregenerator(seed=7)
+    try:
+        blueprint = pregenerator.take(2)
+    finally:
+        pregenerator.shutdown()
+
+    assert 'generating the level instead' in caplog.text
+    assert isinstance(blueprint, LevelBlueprint)
+    assert blueprint.level == 2
+    assert blueprint.mobs
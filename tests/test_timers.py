@@ -0,0 +1,51 @@
+from noname_dungeon_crawler.util import Timer, TimerScheduler
+
+
+def test_timers_fire_once_when_due() -> None:
+    scheduler = TimerScheduler()
+    calls = []
+
+    scheduler.call_later(1.0, lambda: calls.append('first'))
+    scheduler.call_later(2.0, lambda: calls.append('second'))
+
+    scheduler.update(1.5)
+    assert calls == ['first']
+    assert len(scheduler) == 1
+
+    scheduler.update(1.0)
+    scheduler.update(1.0)
+    assert calls == ['first', 'second']
+    assert len(scheduler) == 0
+
+
+def test_cancel_during_update_does_not_fire_timers_twice() -> None:
+    scheduler = TimerScheduler()
+    calls = []
+
+    long_timers = [scheduler.call_later(10.0, lambda: calls.append('long')) for _ in range(4)]
+
+    def cancel_long_timers() -> None:
+        for timer in long_timers:
+            timer.cancel()
+
+    scheduler.call_later(1.0, cancel_long_timers)
+    scheduler.call_later(1.0, lambda: calls.append('sibling'))
+
+    scheduler.update(1.0)
+    scheduler.update(1.0)
+    scheduler.update(10.0)
+
+    assert calls == ['sibling']
+    assert len(scheduler) == 0
+
+
+def test_cancelled_timer_is_not_counted() -> None:
+    scheduler = TimerScheduler()
+
+    timer = scheduler.schedule(Timer(1.0, lambda: None))
+    scheduler.call_later(2.0, lambda: None)
+    timer.cancel()
+    timer.cancel()
+
+    assert timer.cancelled
+    assert len(scheduler) == 1